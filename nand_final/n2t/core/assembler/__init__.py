@@ -1,5 +1,13 @@
-from n2t.core.assembler.facade import Assembler
+from n2t.core.assembler.facade import (
+    Assembler,
+    IncrementalAssembler,
+    StreamingAssembler,
+)
+from n2t.core.assembler.source_map import SourceMap
 
 __all__ = [
     "Assembler",
+    "IncrementalAssembler",
+    "SourceMap",
+    "StreamingAssembler",
 ]
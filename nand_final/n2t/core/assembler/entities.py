@@ -1,8 +1,26 @@
-from typing import Iterable
+from __future__ import annotations
 
+import hashlib
+import struct
+import sys
+from array import array
+from collections import ChainMap
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set
 
-class SymbolsTable:
-    symbols_map = {
+NO_WORD = -1
+
+
+@dataclass(frozen=True)
+class SourceLine:
+    line: int
+    text: str
+    label: Optional[str] = None
+
+
+PREDEFINED_SYMBOLS: Mapping[str, int] = MappingProxyType(
+    {
         "R0": 0,
         "R1": 1,
         "R2": 2,
@@ -27,7 +45,10 @@ class SymbolsTable:
         "THIS": 3,
         "THAT": 4,
     }
+)
+
 
+class SymbolsTable:
     destination_map = {
         "": "000",
         "M": "001",
@@ -92,6 +113,7 @@ class SymbolsTable:
         return self.destination_map.get(dest)
 
     def __init__(self) -> None:
+        self.symbols_map: ChainMap = ChainMap({}, PREDEFINED_SYMBOLS)
         self.free_register = 16
 
     def is_symbol(self, symb: str) -> bool:
@@ -144,3 +166,96 @@ class Validator:
                 validated_instructions += 1
 
         return validated_assembly
+
+    def locate(self, assembly: Iterable[str]) -> Iterator[SourceLine]:
+        label = None
+        for line, instruction in enumerate(assembly, start=1):
+            if self.not_valid(instruction):
+                continue
+            elif self.is_label(instruction):
+                label = instruction[1:-1]
+            else:
+                yield SourceLine(line, instruction, label)
+
+    def labels(self, assembly: Iterable[str]) -> Dict[str, int]:
+        labels = {}
+        validated_instructions = 0
+        for instruction in assembly:
+            if self.not_valid(instruction):
+                continue
+            elif self.is_label(instruction):
+                labels[instruction[1:-1]] = validated_instructions
+            else:
+                validated_instructions += 1
+        return labels
+
+
+@dataclass
+class AssemblyCache:
+    header = struct.Struct("<4sHIIH32s")
+    symbol = struct.Struct("<HBH")
+    magic = b"HASC"
+    version = 1
+
+    lines: List[str] = field(default_factory=list)
+    encodings: array = field(default_factory=lambda: array("i"))
+    symbols: Dict[str, int] = field(default_factory=dict)
+    labels: Set[str] = field(default_factory=set)
+    free_register: int = 16
+    fingerprint: bytes = bytes(32)
+
+    @staticmethod
+    def layout(symbols: Mapping[str, int]) -> bytes:
+        sha = hashlib.sha256()
+        for name, address in sorted(symbols.items()):
+            sha.update(f"{name}\0{address}\0".encode())
+        return sha.digest()
+
+    def words(self) -> array:
+        return array("H", (word for word in self.encodings if word != NO_WORD))
+
+    def to_bytes(self) -> bytes:
+        encodings = array("i", self.encodings)
+        if sys.byteorder == "big":
+            encodings.byteswap()
+        symbols = bytearray()
+        for name, address in self.symbols.items():
+            encoded = name.encode()
+            symbols += self.symbol.pack(address, name in self.labels, len(encoded))
+            symbols += encoded
+        header = self.header.pack(
+            self.magic,
+            self.version,
+            len(self.lines),
+            len(self.symbols),
+            self.free_register,
+            self.fingerprint,
+        )
+        lines = "\n".join(self.lines).encode()
+        return header + encodings.tobytes() + bytes(symbols) + lines
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> AssemblyCache:
+        magic, version, count, symbols, free_register, fingerprint = (
+            cls.header.unpack_from(data)
+        )
+        if magic != cls.magic or version != cls.version:
+            raise Exception("InvalidAssemblyCacheException")
+        offset = cls.header.size
+        cache = cls(free_register=free_register, fingerprint=fingerprint)
+        cache.encodings.frombytes(data[offset : offset + 4 * count])
+        if sys.byteorder == "big":
+            cache.encodings.byteswap()
+        offset += 4 * count
+        for _ in range(symbols):
+            address, label, length = cls.symbol.unpack_from(data, offset)
+            offset += cls.symbol.size
+            name = data[offset : offset + length].decode()
+            offset += length
+            cache.symbols[name] = address
+            if label:
+                cache.labels.add(name)
+        cache.lines = data[offset:].decode().split("\n") if count else []
+        if len(cache.lines) != count or len(cache.encodings) != count:
+            raise Exception("InvalidAssemblyCacheException")
+        return cache
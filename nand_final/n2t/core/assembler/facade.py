@@ -1,15 +1,34 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from array import array
+from dataclasses import dataclass, field
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from n2t.core.assembler.entities import SymbolsTable, Validator
+from n2t.core.assembler.entities import (
+    NO_WORD,
+    PREDEFINED_SYMBOLS,
+    AssemblyCache,
+    SymbolsTable,
+    Validator,
+)
+
+WORD_WIDTH = 16
+PLACEHOLDER = "0" * WORD_WIDTH
 
 
 @dataclass
 class Assembler:
-    validator: Validator = Validator()
-    symb_table: SymbolsTable = SymbolsTable()
+    validator: Validator = field(default_factory=Validator)
+    symb_table: SymbolsTable = field(default_factory=SymbolsTable)
 
     @classmethod
     def create(cls) -> Assembler:
@@ -73,3 +92,176 @@ class Assembler:
         else:
             res += self.symb_table.get_comp(c_instr.split()[0]) + "000000"
         return res
+
+
+@dataclass
+class StreamingAssembler(Assembler):
+    fixups: Dict[str, List[int]] = field(default_factory=dict)
+
+    @classmethod
+    def create(cls) -> StreamingAssembler:
+        return cls()
+
+    def assemble(self, assembly: Iterable[str]) -> Iterator[str]:
+        self.fixups = {}
+        address = 0
+        for instruction in assembly:
+            if self.validator.not_valid(instruction):
+                continue
+            if self.validator.is_label(instruction):
+                self.symb_table.add(instruction[1:-1], address)
+                continue
+            word = self.assemble_streamed(instruction, address)
+            if len(word) != WORD_WIDTH:
+                raise Exception("InvalidSyntaxException")
+            yield word
+            address += 1
+
+    def assemble_streamed(self, instruction: str, address: int) -> str:
+        if instruction[0] != "@":
+            return self.deal_c_instruction(instruction)
+        symbol = instruction[1:].split()[0]
+        if self.symb_table.is_symbol(symbol) or symbol[0].isnumeric():
+            return self.deal_a_instruction(instruction)
+        self.fixups.setdefault(symbol, []).append(address)
+        return PLACEHOLDER
+
+    def resolve(self) -> Iterator[Tuple[int, str]]:
+        for symbol, addresses in self.fixups.items():
+            word = self.deal_a_instruction(f"@{symbol}")
+            for address in addresses:
+                yield address, word
+        self.fixups = {}
+
+    def assemble_words(self, assembly: Iterable[str]) -> array:
+        words = array("H", (int(word, 2) for word in self.assemble(assembly)))
+        for address, word in self.resolve():
+            words[address] = int(word, 2)
+        return words
+
+
+@dataclass
+class IncrementalAssembler(Assembler):
+    cache: AssemblyCache = field(default_factory=AssemblyCache)
+    encoded: int = 0
+    full_pass: bool = False
+    layout_changed: bool = False
+
+    @classmethod
+    def create(cls, cache: Optional[AssemblyCache] = None) -> IncrementalAssembler:
+        return cls(cache=cache or AssemblyCache())
+
+    def assemble(self, assembly: Iterable[str]) -> Iterator[str]:
+        for word in self.assemble_words(assembly):
+            yield f"{word:016b}"
+
+    def assemble_words(self, assembly: Iterable[str]) -> array:
+        lines = list(assembly)
+        previous = self.cache
+        start, old_end, new_end = diff(previous.lines, lines)
+        self.encoded = 0
+        self.full_pass = not previous.lines or self.shape(
+            previous.lines[start:old_end]
+        ) != self.shape(lines[start:new_end])
+        if self.full_pass:
+            self.cache = self.assemble_all(lines)
+        else:
+            self.cache = self.assemble_changed(lines, start, old_end, new_end)
+        self.layout_changed = self.cache.fingerprint != previous.fingerprint
+        return self.cache.words()
+
+    def shape(self, lines: Sequence[str]) -> List[Hashable]:
+        shape: List[Hashable] = []
+        for line in lines:
+            if self.validator.not_valid(line):
+                continue
+            if self.validator.is_label(line):
+                shape.append(line)
+            elif line[0] == "@" and self.is_variable(line[1:].split()[0]):
+                shape.append(line[1:].split()[0])
+            else:
+                shape.append(None)
+        return shape
+
+    def is_variable(self, symbol: str) -> bool:
+        return not (
+            symbol[0].isnumeric()
+            or symbol in PREDEFINED_SYMBOLS
+            or symbol in self.cache.labels
+        )
+
+    def assemble_changed(
+        self, lines: List[str], start: int, old_end: int, new_end: int
+    ) -> AssemblyCache:
+        previous = self.cache
+        self.symb_table = SymbolsTable()
+        self.symb_table.symbols_map.maps[0].update(previous.symbols)
+        self.symb_table.free_register = previous.free_register
+        encodings = previous.encodings[:start]
+        encodings.extend(self.encode(line) for line in lines[start:new_end])
+        encodings.extend(previous.encodings[old_end:])
+        return AssemblyCache(
+            lines,
+            encodings,
+            previous.symbols,
+            previous.labels,
+            previous.free_register,
+            previous.fingerprint,
+        )
+
+    def assemble_all(self, lines: List[str]) -> AssemblyCache:
+        previous = self.cache
+        reusable = {
+            line: word
+            for line, word in zip(previous.lines, previous.encodings)
+            if word != NO_WORD and line[0] != "@"
+        }
+        self.symb_table = SymbolsTable()
+        self.validator.validate(lines, self.symb_table)
+        labels = set(self.symb_table.symbols_map.maps[0])
+        encodings = array("i")
+        for line in lines:
+            if self.validator.not_valid(line) or self.validator.is_label(line):
+                encodings.append(NO_WORD)
+            elif line[0] == "@":
+                encodings.append(self.resolve(line))
+            elif line in reusable:
+                encodings.append(reusable[line])
+            else:
+                encodings.append(self.encode(line))
+        symbols = dict(self.symb_table.symbols_map.maps[0])
+        return AssemblyCache(
+            lines,
+            encodings,
+            symbols,
+            labels,
+            self.symb_table.free_register,
+            AssemblyCache.layout(symbols),
+        )
+
+    def resolve(self, instruction: str) -> int:
+        symbol = instruction[1:].split()[0]
+        if symbol[0].isnumeric() or not self.symb_table.is_symbol(symbol):
+            return self.encode(instruction)
+        return self.symb_table.get(symbol)
+
+    def encode(self, line: str) -> int:
+        if self.validator.not_valid(line) or self.validator.is_label(line):
+            return NO_WORD
+        word = self.assemble_one(line)
+        if len(word) != WORD_WIDTH:
+            raise Exception("InvalidSyntaxException")
+        self.encoded += 1
+        return int(word, 2)
+
+
+def diff(old: Sequence[str], new: Sequence[str]) -> Tuple[int, int, int]:
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from n2t.core.assembler.entities import Validator
+
+SOURCE_MARKER = re.compile(r"\[(?P<file>[^\[\]]+):(?P<line>\d+)\]\s*$")
+
+
+@dataclass
+class SourceMap:
+    header = struct.Struct("<4sHIIII")
+    string = struct.Struct("<IH")
+    origin = struct.Struct("<HHI")
+    label = struct.Struct("<HIH")
+    magic = b"HMAP"
+    version = 1
+
+    files: List[str]
+    lines: array = field(default_factory=lambda: array("I"))
+    origin_starts: array = field(default_factory=lambda: array("H"))
+    origin_files: array = field(default_factory=lambda: array("H"))
+    origin_lines: array = field(default_factory=lambda: array("I"))
+    label_addresses: array = field(default_factory=lambda: array("H"))
+    label_names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_assembly(cls, assembly: Iterable[str], source: str) -> SourceMap:
+        validator = Validator()
+        files = {source: 0}
+        source_map = cls([])
+        origin: Optional[Tuple[int, int]] = None
+        for line, instruction in enumerate(assembly, start=1):
+            if validator.not_valid(instruction):
+                marker = SOURCE_MARKER.search(instruction)
+                if marker is not None and validator.is_comment(instruction):
+                    file = files.setdefault(marker["file"], len(files))
+                    origin = (file, int(marker["line"]))
+                continue
+            address = len(source_map.lines)
+            if validator.is_label(instruction):
+                source_map.label_addresses.append(address)
+                source_map.label_names.append(instruction[1:-1])
+                continue
+            source_map.lines.append(line)
+            if origin is not None and origin != source_map.last_origin():
+                source_map.origin_starts.append(address)
+                source_map.origin_files.append(origin[0])
+                source_map.origin_lines.append(origin[1])
+        source_map.files = list(files)
+        return source_map
+
+    def last_origin(self) -> Optional[Tuple[int, int]]:
+        if not self.origin_starts:
+            return None
+        return self.origin_files[-1], self.origin_lines[-1]
+
+    def line(self, address: int) -> Optional[int]:
+        if 0 <= address < len(self.lines):
+            return self.lines[address]
+        return None
+
+    def source(self, address: int) -> Optional[Tuple[str, int]]:
+        index = bisect_right(self.origin_starts, address) - 1
+        if index < 0 or address >= len(self.lines):
+            return None
+        return self.files[self.origin_files[index]], self.origin_lines[index]
+
+    def enclosing_label(self, address: int) -> Optional[str]:
+        index = bisect_right(self.label_addresses, address) - 1
+        if index < 0:
+            return None
+        return self.label_names[index]
+
+    def labels(self) -> Dict[str, int]:
+        return dict(zip(self.label_names, self.label_addresses))
+
+    def describe(self, address: int) -> str:
+        line = self.line(address)
+        if line is None:
+            return ""
+        text = f"{self.files[0]}:{line}"
+        source = self.source(address)
+        if source is not None:
+            text += f" ({source[0]}:{source[1]})"
+        return text
+
+    def to_bytes(self) -> bytes:
+        pool = bytearray()
+        strings = bytearray()
+        for name in self.files:
+            encoded = name.encode()
+            strings += self.string.pack(len(pool), len(encoded))
+            pool += encoded
+        lines = array("I", self.lines)
+        if sys.byteorder == "big":
+            lines.byteswap()
+        origins = bytearray()
+        for start, file, line in zip(
+            self.origin_starts, self.origin_files, self.origin_lines
+        ):
+            origins += self.origin.pack(start, file, line)
+        labels = bytearray()
+        for address, name in zip(self.label_addresses, self.label_names):
+            encoded = name.encode()
+            labels += self.label.pack(address, len(pool), len(encoded))
+            pool += encoded
+        header = self.header.pack(
+            self.magic,
+            self.version,
+            len(self.lines),
+            len(self.files),
+            len(self.origin_starts),
+            len(self.label_names),
+        )
+        return b"".join(
+            [header, strings, lines.tobytes(), origins, labels, bytes(pool)]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SourceMap:
+        if len(data) < cls.header.size:
+            raise Exception("InvalidSourceMapException")
+        magic, version, addresses, files, origins, labels = cls.header.unpack_from(data)
+        if magic != cls.magic or version != cls.version:
+            raise Exception("InvalidSourceMapException")
+        offset = cls.header.size
+        end = offset + files * cls.string.size
+        strings = list(cls.string.iter_unpack(data[offset:end]))
+        offset = end
+        source_map = cls([])
+        source_map.lines.frombytes(data[offset : offset + 4 * addresses])
+        if sys.byteorder == "big":
+            source_map.lines.byteswap()
+        offset += 4 * addresses
+        end = offset + origins * cls.origin.size
+        for start, file, line in cls.origin.iter_unpack(data[offset:end]):
+            source_map.origin_starts.append(start)
+            source_map.origin_files.append(file)
+            source_map.origin_lines.append(line)
+        offset = end
+        end = offset + labels * cls.label.size
+        records = list(cls.label.iter_unpack(data[offset:end]))
+        pool = bytes(data[end:])
+        if (
+            len(strings) != files
+            or len(source_map.lines) != addresses
+            or len(source_map.origin_starts) != origins
+            or len(records) != labels
+        ):
+            raise Exception("InvalidSourceMapException")
+        source_map.files = [
+            pool[start : start + length].decode() for start, length in strings
+        ]
+        for address, start, length in records:
+            source_map.label_addresses.append(address)
+            source_map.label_names.append(pool[start : start + length].decode())
+        return source_map
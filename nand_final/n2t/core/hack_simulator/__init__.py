@@ -1,4 +1,10 @@
-from n2t.core.hack_simulator.entities import Ram
+from n2t.core.hack_simulator.entities import (
+    Engine,
+    ExitReason,
+    HackObject,
+    Ram,
+    Snapshot,
+)
 from n2t.core.hack_simulator.facade import HackSimulator
 
-__all__ = ["HackSimulator", "Ram"]
+__all__ = ["Engine", "ExitReason", "HackObject", "HackSimulator", "Ram", "Snapshot"]
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    ADDRESS_MASK,
+    COMP_READS_M,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    RAM_SIZE,
+    SIGN_BIT,
+    ExitReason,
+    Program,
+    RamSeed,
+    merge_ranges,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+
+class BatchJumps:
+    jump_map = {
+        0b000: lambda value: np.zeros(value.shape, dtype=bool),
+        0b001: lambda value: (value > 0) & (value < SIGN_BIT),
+        0b010: lambda value: value == 0,
+        0b011: lambda value: value < SIGN_BIT,
+        0b100: lambda value: value >= SIGN_BIT,
+        0b101: lambda value: value != 0,
+        0b110: lambda value: (value == 0) | (value >= SIGN_BIT),
+        0b111: lambda value: np.ones(value.shape, dtype=bool),
+    }
+
+
+@dataclass
+class BatchSimulator:
+    instructions: Union[Iterable[str], Program]
+    cycles: int
+    machines: int
+    seed: Optional[RamSeed] = None
+    seeds: Optional[Sequence[RamSeed]] = None
+
+    @classmethod
+    def create(
+        cls,
+        instructions: Union[Iterable[str], Program],
+        cycles: int,
+        machines: int,
+        seed: Optional[RamSeed] = None,
+        seeds: Optional[Sequence[RamSeed]] = None,
+    ) -> BatchSimulator:
+        if np is None:
+            raise Exception("NumpyRequiredException")
+        if seeds is not None and len(seeds) != machines:
+            raise Exception("InvalidRamSeedException")
+        return cls(instructions, cycles, machines, seed, seeds)
+
+    def execute(self) -> np.ndarray:
+        if isinstance(self.instructions, Program):
+            self.program: Program = self.instructions
+        else:
+            self.program = Program.decode(self.instructions)
+        self.stops: np.ndarray = np.frombuffer(self.program.stops(), dtype=np.uint8)
+        self.a_register: np.ndarray = np.zeros(self.machines, dtype=np.int64)
+        self.d_register: np.ndarray = np.zeros(self.machines, dtype=np.int64)
+        self.pc: np.ndarray = np.zeros(self.machines, dtype=np.int64)
+        self.executed: np.ndarray = np.zeros(self.machines, dtype=np.int64)
+        self.ram: np.ndarray = np.zeros((self.machines, RAM_SIZE), dtype=np.uint16)
+        self.written: np.ndarray = np.zeros((self.machines, RAM_SIZE), dtype=bool)
+        if self.seed is not None:
+            self.apply_seed(self.seed, slice(None))
+        for machine, seed in enumerate(self.seeds or []):
+            self.apply_seed(seed, machine)
+        self.initial_ram: np.ndarray = self.ram.copy()
+
+        budget = self.cycles
+        while self.cycles > 0 and self.step():
+            self.cycles -= 1
+        self.finish(budget)
+        return self.ram
+
+    def apply_seed(self, seed: RamSeed, machines: Union[int, slice]) -> None:
+        for start, words in seed.blocks:
+            end = start + len(words)
+            self.ram[machines, start:end] = np.frombuffer(words, dtype=np.uint16)
+            self.written[machines, start:end] = True
+
+    def finish(self, budget: int) -> None:
+        self.exit_reasons: List[ExitReason] = []
+        for machine in range(self.machines):
+            pc = int(self.pc[machine])
+            if self.executed[machine] >= budget:
+                self.exit_reasons.append(ExitReason.budget)
+            elif pc >= len(self.program):
+                self.exit_reasons.append(ExitReason.pc_out_of_range)
+            elif self.program.is_halt(pc):
+                self.exit_reasons.append(ExitReason.halt)
+                self.a_register[machine] = pc
+            else:
+                self.exit_reasons.append(ExitReason.stopped)
+
+    def step(self) -> bool:
+        active = np.flatnonzero(self.stops[self.pc] == 0)
+        if active.size == 0:
+            return False
+        self.executed[active] += 1
+
+        pcs = self.pc[active]
+        order = np.argsort(pcs, kind="stable")
+        ordered = active[order]
+        boundaries = np.flatnonzero(np.diff(pcs[order])) + 1
+        for group in np.split(ordered, boundaries):
+            self.apply(int(self.pc[group[0]]), group)
+        return True
+
+    def apply(self, pc: int, group: np.ndarray) -> None:
+        program = self.program
+        if program.kinds[pc] == A_INSTRUCTION:
+            self.a_register[group] = program.constants[pc]
+            self.pc[group] = pc + 1
+            return
+
+        comp = program.comps[pc]
+        dest = program.dests[pc]
+        a_register = self.a_register[group]
+        d_register = self.d_register[group]
+        if comp & COMP_READS_M:
+            operand = self.ram[group, a_register & ADDRESS_MASK].astype(np.int64)
+        else:
+            operand = a_register
+        value = np.broadcast_to(
+            np.asarray(Program.compare_table[comp](d_register, operand), np.int64),
+            group.shape,
+        )
+
+        if dest & DEST_M:
+            address = a_register & ADDRESS_MASK
+            self.ram[group, address] = value
+            self.written[group, address] = True
+        if dest & DEST_A:
+            a_register = value
+            self.a_register[group] = value
+        if dest & DEST_D:
+            self.d_register[group] = value
+
+        taken = BatchJumps.jump_map[program.jumps[pc]](value)
+        self.pc[group] = np.where(taken, a_register, pc + 1)
+
+    def select(self, addresses: Sequence[int]) -> np.ndarray:
+        return self.ram[:, list(addresses)]
+
+    def dump(
+        self,
+        machine: int,
+        ranges: Optional[Sequence[Tuple[int, int]]] = None,
+        changed_only: bool = False,
+    ) -> Iterator[Tuple[int, int]]:
+        written = self.written[machine]
+        if changed_only:
+            written = written & (self.ram[machine] != self.initial_ram[machine])
+        for start, end in merge_ranges(ranges or [(0, RAM_SIZE - 1)]):
+            addresses = np.flatnonzero(written[start : end + 1]) + start
+            values = self.ram[machine, addresses]
+            yield from zip(addresses.tolist(), values.tolist())
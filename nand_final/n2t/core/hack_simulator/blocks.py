@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    ADDRESS_MASK,
+    COMP_READS_M,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_NONE,
+    SIGN_BIT,
+    WORD_MASK,
+    Program,
+    Ram,
+)
+
+Block = Callable[[int, int], Tuple[int, int, int]]
+
+
+class BlockCompiler:
+    compare_source = {
+        0b101010: "0",
+        0b111111: "1",
+        0b111010: f"{WORD_MASK}",
+        0b001100: "d",
+        0b110000: "{y}",
+        0b001101: f"~d & {WORD_MASK}",
+        0b110001: f"~{{y}} & {WORD_MASK}",
+        0b001111: f"-d & {WORD_MASK}",
+        0b110011: f"-{{y}} & {WORD_MASK}",
+        0b011111: f"(d + 1) & {WORD_MASK}",
+        0b110111: f"({{y}} + 1) & {WORD_MASK}",
+        0b001110: f"(d - 1) & {WORD_MASK}",
+        0b110010: f"({{y}} - 1) & {WORD_MASK}",
+        0b000010: f"(d + {{y}}) & {WORD_MASK}",
+        0b010011: f"(d - {{y}}) & {WORD_MASK}",
+        0b000111: f"({{y}} - d) & {WORD_MASK}",
+        0b000000: "d & {y}",
+        0b010101: "d | {y}",
+    }
+
+    jump_source = {
+        0b001: f"0 < value < {SIGN_BIT}",
+        0b010: "value == 0",
+        0b011: f"value < {SIGN_BIT}",
+        0b100: f"value >= {SIGN_BIT}",
+        0b101: "value != 0",
+        0b110: f"value == 0 or value >= {SIGN_BIT}",
+        0b111: "True",
+    }
+
+    def __init__(self, program: Program, ram: Ram, leaders: Iterable[int] = ()) -> None:
+        self.program = program
+        self.ram = ram
+        self.leaders: Set[int] = self.find_leaders() | set(leaders)
+        self.blocks: Dict[int, Tuple[Block, int]] = {}
+
+    def find_leaders(self) -> Set[int]:
+        program = self.program
+        leaders = {0}
+        for pc in range(len(program)):
+            if program.kinds[pc] == A_INSTRUCTION or program.jumps[pc] == JUMP_NONE:
+                continue
+            leaders.add(pc + 1)
+            previous = pc - 1
+            if (
+                previous >= 0
+                and program.kinds[previous] == A_INSTRUCTION
+                and not program.dests[pc] & DEST_A
+            ):
+                leaders.add(program.constants[previous])
+        return leaders
+
+    def add_leader(self, pc: int) -> None:
+        if pc not in self.leaders:
+            self.leaders.add(pc)
+            self.blocks.clear()
+
+    def get(self, entry: int) -> Tuple[Block, int]:
+        block = self.blocks.get(entry)
+        if block is None:
+            block = self.blocks[entry] = self.compile(entry)
+        return block
+
+    def compile(self, entry: int) -> Tuple[Block, int]:
+        program = self.program
+        size = len(program)
+        body: List[str] = []
+        pc = entry
+
+        while pc < size:
+            if pc != entry and pc in self.leaders:
+                break
+            if program.kinds[pc] == A_INSTRUCTION:
+                body.append(f"a = {program.constants[pc]}")
+                pc += 1
+                continue
+            body.extend(self.compile_c_instruction(pc))
+            pc += 1
+            if program.jumps[pc - 1] != JUMP_NONE:
+                break
+
+        if not body[-1].startswith("return"):
+            body.append(f"return a, d, {pc}")
+
+        source = "def block(a, d, ram=ram, written=written):\n    "
+        source += "\n    ".join(body)
+        namespace = {"ram": self.ram.registers, "written": self.ram.written}
+        exec(compile(source, f"<block {entry}>", "exec"), namespace)
+        return namespace["block"], pc - entry
+
+    def compile_c_instruction(self, pc: int) -> List[str]:
+        program = self.program
+        comp = program.comps[pc]
+        dest = program.dests[pc]
+        jump = program.jumps[pc]
+
+        if comp & COMP_READS_M:
+            operand = f"ram[a & {ADDRESS_MASK}]"
+        else:
+            operand = "a"
+        if comp in Program.compare_map:
+            template = self.compare_source[comp & ~COMP_READS_M]
+        else:
+            template = f"{WORD_MASK}"
+        expression = template.format(y=operand)
+
+        if jump == JUMP_NONE and dest == DEST_A:
+            return [f"a = {expression}"]
+        if jump == JUMP_NONE and dest == DEST_D:
+            return [f"d = {expression}"]
+        lines = [f"value = {expression}"]
+
+        if dest & DEST_M:
+            lines.append(f"address = a & {ADDRESS_MASK}")
+            lines.append("ram[address] = value")
+            lines.append("written[address] = 1")
+        if dest & DEST_A:
+            lines.append("a = value")
+        if dest & DEST_D:
+            lines.append("d = value")
+
+        if jump != JUMP_NONE:
+            lines.append(f"if {self.jump_source[jump]}:")
+            lines.append("    return a, d, a")
+            lines.append(f"return a, d, {pc + 1}")
+        return lines
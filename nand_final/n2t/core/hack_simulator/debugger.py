@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional, Set, Union
+
+from n2t.core.hack_simulator.entities import (
+    ADDRESS_MASK,
+    RAM_SIZE,
+    WATCH_READ,
+    WATCH_WRITE,
+    PC_SPACE,
+    Engine,
+)
+from n2t.core.hack_simulator.facade import HackSimulator
+
+Location = Union[int, str]
+
+
+class StopReason(Enum):
+    step = "step"
+    breakpoint = "breakpoint"
+    watchpoint = "watchpoint"
+    budget = "budget"
+    halt = "halt"
+    pc_out_of_range = "pc_out_of_range"
+    stopped = "stopped"
+
+
+@dataclass(frozen=True)
+class StopEvent:
+    reason: StopReason
+    pc: int
+    clock: int
+    address: Optional[int] = None
+    access: Optional[str] = None
+
+    def __str__(self) -> str:
+        text = f"{self.reason.value} at pc {self.pc}, cycle {self.clock}"
+        if self.address is not None:
+            text += f" ({self.access} RAM[{self.address}])"
+        return text
+
+
+class Debugger:
+    def __init__(
+        self, simulator: HackSimulator, labels: Optional[Dict[str, int]] = None
+    ) -> None:
+        self.simulator = simulator
+        self.labels = labels or {}
+        self.breakpoints: Set[int] = set()
+        self.watchpoints = bytearray(RAM_SIZE)
+        simulator.start()
+        self.halts = bytes(simulator.stops)
+
+    def resolve(self, location: Location) -> int:
+        if isinstance(location, str):
+            if location in self.labels:
+                location = self.labels[location]
+            else:
+                location = int(location)
+        if not 0 <= location < PC_SPACE:
+            raise ValueError(f"pc {location} is out of range")
+        return location
+
+    def add_breakpoint(self, location: Location) -> int:
+        pc = self.resolve(location)
+        self.breakpoints.add(pc)
+        self.simulator.stops[pc] = 1
+        if self.simulator.engine == Engine.blocks:
+            self.simulator.compiler.add_leader(pc)
+        return pc
+
+    def remove_breakpoint(self, location: Location) -> int:
+        pc = self.resolve(location)
+        self.breakpoints.discard(pc)
+        self.simulator.stops[pc] = self.halts[pc]
+        return pc
+
+    def watch(
+        self,
+        start: int,
+        end: Optional[int] = None,
+        read: bool = False,
+        write: bool = True,
+    ) -> None:
+        flags = (WATCH_READ if read else 0) | (WATCH_WRITE if write else 0)
+        for address in range(start, (start if end is None else end) + 1):
+            self.watchpoints[address & ADDRESS_MASK] |= flags
+        self.arm_watchpoints()
+
+    def unwatch(self, start: int, end: Optional[int] = None) -> None:
+        for address in range(start, (start if end is None else end) + 1):
+            self.watchpoints[address & ADDRESS_MASK] = 0
+        self.arm_watchpoints()
+
+    def arm_watchpoints(self) -> None:
+        if any(self.watchpoints):
+            self.simulator.watched = self.watchpoints
+        else:
+            self.simulator.watched = None
+
+    def step(self, count: int = 1) -> StopEvent:
+        return self.run(count, stepping=True)
+
+    def run_until(self, location: Location, cycles: int) -> StopEvent:
+        pc = self.resolve(location)
+        temporary = pc not in self.breakpoints
+        self.add_breakpoint(pc)
+        try:
+            return self.run(cycles)
+        finally:
+            if temporary:
+                self.remove_breakpoint(pc)
+
+    def run(self, cycles: int, stepping: bool = False) -> StopEvent:
+        simulator = self.simulator
+        resumed = simulator.pc
+        disarmed = resumed in self.breakpoints and not self.halts[resumed]
+        if disarmed:
+            simulator.stops[resumed] = 0
+        simulator.cycles = cycles
+        simulator.watch_hit = None
+        try:
+            simulator.run_engine()
+        finally:
+            if disarmed:
+                simulator.stops[resumed] = 1
+        return self.stop_event(stepping)
+
+    def stop_event(self, stepping: bool) -> StopEvent:
+        simulator = self.simulator
+        pc, clock = simulator.pc, simulator.clock
+        if simulator.watch_hit is not None:
+            address, access = simulator.watch_hit
+            kind = "read" if access == WATCH_READ else "write"
+            return StopEvent(StopReason.watchpoint, pc, clock, address, kind)
+        if simulator.cycles <= 0:
+            reason = StopReason.step if stepping else StopReason.budget
+        elif pc in self.breakpoints:
+            reason = StopReason.breakpoint
+        elif pc >= len(simulator.program):
+            reason = StopReason.pc_out_of_range
+        elif simulator.program.is_halt(pc):
+            reason = StopReason.halt
+        else:
+            reason = StopReason.stopped
+        return StopEvent(reason, pc, clock)
@@ -1,11 +1,408 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+RAM_SIZE = 32768
+ADDRESS_MASK = RAM_SIZE - 1
+WORD_MASK = 0xFFFF
+SIGN_BIT = 0x8000
+PC_SPACE = WORD_MASK + 1
+
+WATCH_READ = 0b01
+WATCH_WRITE = 0b10
+
+RAM_DUMP_MAGIC = b"HRAM"
+RAM_DUMP_HEADER = struct.Struct("<4sI")
+
+A_INSTRUCTION = 0
+C_INSTRUCTION = 1
+
+DEST_M = 0b001
+DEST_D = 0b010
+DEST_A = 0b100
+
+COMP_READS_M = 0b1000000
+
+JUMP_NONE = 0b000
+JUMP_ALWAYS = 0b111
+
+
+class Engine(Enum):
+    interpreter = "interpreter"
+    blocks = "blocks"
+
+
+class ExitReason(Enum):
+    budget = "budget"
+    pc_out_of_range = "pc_out_of_range"
+    halt = "halt"
+    deadline = "deadline"
+    stopped = "stopped"
+
+
+def parse_ranges(text: str) -> List[Tuple[int, int]]:
+    ranges = []
+    for part in text.split(","):
+        start, _, end = part.strip().partition("-")
+        ranges.append((int(start), int(end or start)))
+    return ranges
+
+
+def merge_ranges(ranges: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        start, end = max(start, 0), min(end, RAM_SIZE - 1)
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def build_table(mapping: dict, size: int, default: Any) -> list:
+    return [mapping.get(code, default) for code in range(size)]
+
+
 class Ram:
     def __init__(self) -> None:
-        self.registers: dict = {}
+        self.registers: array = array("H", bytes(2 * RAM_SIZE))
+        self.written: bytearray = bytearray(RAM_SIZE)
 
     def assign(self, address: int, value: int) -> None:
-        self.registers[address] = value
+        address &= ADDRESS_MASK
+        self.registers[address] = value & WORD_MASK
+        self.written[address] = 1
 
     def get(self, address: int) -> int:
-        if address in self.registers:
-            return self.registers[address]
-        return 0
+        return self.registers[address & ADDRESS_MASK]
+
+    def copy(self) -> Ram:
+        ram = Ram()
+        ram.registers = array("H", self.registers)
+        ram.written = bytearray(self.written)
+        return ram
+
+    def overwrite(self, other: Ram) -> None:
+        self.registers[:] = other.registers
+        self.written[:] = other.written
+
+    def to_bytes(self) -> bytes:
+        registers = array("H", self.registers)
+        if sys.byteorder == "big":
+            registers.byteswap()
+        return registers.tobytes() + bytes(self.written)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Ram:
+        ram = cls()
+        words = 2 * RAM_SIZE
+        ram.registers = array("H", data[:words])
+        if sys.byteorder == "big":
+            ram.registers.byteswap()
+        ram.written = bytearray(data[words : words + RAM_SIZE])
+        return ram
+
+    def items(
+        self, ranges: Optional[Sequence[Tuple[int, int]]] = None
+    ) -> Iterator[Tuple[int, int]]:
+        registers = self.registers
+        written = self.written
+        if ranges is None:
+            ranges = [(0, RAM_SIZE - 1)]
+        for start, end in merge_ranges(ranges):
+            for address in range(start, end + 1):
+                if written[address]:
+                    yield address, registers[address]
+
+
+def parse_address(name: str) -> int:
+    name = name.strip()
+    return int(name[1:]) if name.startswith("R") else int(name)
+
+
+class RamSeed:
+    def __init__(self, blocks: Iterable[Tuple[int, array]]) -> None:
+        self.blocks: List[Tuple[int, array]] = sorted(blocks, key=lambda b: b[0])
+        for start, words in self.blocks:
+            if start < 0 or start + len(words) > RAM_SIZE:
+                raise Exception("InvalidRamSeedException")
+
+    @classmethod
+    def from_dict(cls, registers: dict) -> RamSeed:
+        blocks = []
+        for address, value in registers.items():
+            values = value if isinstance(value, list) else [value]
+            words = array("H", (word & WORD_MASK for word in values))
+            blocks.append((parse_address(str(address)), words))
+        return cls(blocks)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[int, int]]) -> RamSeed:
+        blocks: List[Tuple[int, array]] = []
+        for address, value in sorted(items):
+            start, words = blocks[-1] if blocks else (None, None)
+            if start is not None and start + len(words) == address:
+                words.append(value & WORD_MASK)
+            else:
+                blocks.append((address, array("H", [value & WORD_MASK])))
+        return cls(blocks)
+
+    @classmethod
+    def from_binary(cls, data: bytes) -> RamSeed:
+        magic, count = RAM_DUMP_HEADER.unpack_from(data)
+        if magic != RAM_DUMP_MAGIC or len(data) != RAM_DUMP_HEADER.size + 4 * count:
+            raise Exception("InvalidRamSeedException")
+        words = array("H", data[RAM_DUMP_HEADER.size :])
+        if sys.byteorder == "big":
+            words.byteswap()
+        return cls.from_items(zip(words[0::2], words[1::2]))
+
+    def apply(self, ram: Ram) -> None:
+        for start, words in self.blocks:
+            end = start + len(words)
+            ram.registers[start:end] = words
+            ram.written[start:end] = b"\x01" * len(words)
+
+
+class Program:
+    compare_map: dict = {
+        0b0101010: lambda d, y: 0,
+        0b0111111: lambda d, y: 1,
+        0b0111010: lambda d, y: WORD_MASK,
+        0b0001100: lambda d, y: d,
+        0b0110000: lambda d, y: y,
+        0b0001101: lambda d, y: ~d & WORD_MASK,
+        0b0110001: lambda d, y: ~y & WORD_MASK,
+        0b0001111: lambda d, y: -d & WORD_MASK,
+        0b0110011: lambda d, y: -y & WORD_MASK,
+        0b0011111: lambda d, y: (d + 1) & WORD_MASK,
+        0b0110111: lambda d, y: (y + 1) & WORD_MASK,
+        0b0001110: lambda d, y: (d - 1) & WORD_MASK,
+        0b0110010: lambda d, y: (y - 1) & WORD_MASK,
+        0b0000010: lambda d, y: (d + y) & WORD_MASK,
+        0b0010011: lambda d, y: (d - y) & WORD_MASK,
+        0b0000111: lambda d, y: (y - d) & WORD_MASK,
+        0b0000000: lambda d, y: d & y,
+        0b0010101: lambda d, y: d | y,
+        0b1110000: lambda d, y: y,
+        0b1110001: lambda d, y: ~y & WORD_MASK,
+        0b1110011: lambda d, y: -y & WORD_MASK,
+        0b1110111: lambda d, y: (y + 1) & WORD_MASK,
+        0b1110010: lambda d, y: (y - 1) & WORD_MASK,
+        0b1000010: lambda d, y: (d + y) & WORD_MASK,
+        0b1010011: lambda d, y: (d - y) & WORD_MASK,
+        0b1000111: lambda d, y: (y - d) & WORD_MASK,
+        0b1000000: lambda d, y: d & y,
+        0b1010101: lambda d, y: d | y,
+    }
+
+    jump_map: dict = {
+        0b000: lambda value: False,
+        0b001: lambda value: 0 < value < SIGN_BIT,
+        0b010: lambda value: value == 0,
+        0b011: lambda value: value < SIGN_BIT,
+        0b100: lambda value: value >= SIGN_BIT,
+        0b101: lambda value: value != 0,
+        0b110: lambda value: value == 0 or value >= SIGN_BIT,
+        0b111: lambda value: True,
+    }
+
+    compare_table: List[Callable[[int, int], int]] = build_table(
+        compare_map, 128, lambda d, y: WORD_MASK
+    )
+    jump_table: List[Callable[[int], bool]] = build_table(jump_map, 8, None)
+
+    def __init__(self) -> None:
+        self.kinds: array = array("B")
+        self.comps: array = array("B")
+        self.dests: array = array("B")
+        self.jumps: array = array("B")
+        self.constants: array = array("H")
+
+    @classmethod
+    def decode(cls, instructions: Iterable[str]) -> Program:
+        program = cls()
+        for instruction in instructions:
+            program.append(instruction)
+        return program
+
+    @classmethod
+    def from_words(cls, words: Sequence[int]) -> Program:
+        program = cls()
+        program.kinds = array("B", (word >> 15 for word in words))
+        program.comps = array(
+            "B", ((word >> 6) & 0x7F if word & SIGN_BIT else 0 for word in words)
+        )
+        program.dests = array(
+            "B", ((word >> 3) & 0b111 if word & SIGN_BIT else 0 for word in words)
+        )
+        program.jumps = array(
+            "B", (word & 0b111 if word & SIGN_BIT else 0 for word in words)
+        )
+        program.constants = array(
+            "H", (0 if word & SIGN_BIT else word for word in words)
+        )
+        return program
+
+    def append(self, instruction: str) -> None:
+        if instruction[0] == "0":
+            self.kinds.append(A_INSTRUCTION)
+            self.comps.append(0)
+            self.dests.append(0)
+            self.jumps.append(0)
+            self.constants.append(int(instruction[1:], 2))
+        elif instruction[0] == "1":
+            self.kinds.append(C_INSTRUCTION)
+            self.comps.append(int(instruction[3:10], 2))
+            self.dests.append(int(instruction[10:13], 2))
+            self.jumps.append(int(instruction[13:16], 2))
+            self.constants.append(0)
+        else:
+            raise Exception("InvalidInstructionException")
+
+    def is_halt(self, pc: int) -> bool:
+        return (
+            pc + 1 < len(self)
+            and self.kinds[pc] == A_INSTRUCTION
+            and self.constants[pc] == pc
+            and self.kinds[pc + 1] == C_INSTRUCTION
+            and self.dests[pc + 1] == 0
+            and self.jumps[pc + 1] == JUMP_ALWAYS
+        )
+
+    def halts(self) -> List[int]:
+        return [pc for pc in range(len(self)) if self.is_halt(pc)]
+
+    def stops(self, halts: bool = True) -> bytearray:
+        stops = bytearray(len(self)) + b"\x01" * (PC_SPACE - len(self))
+        for pc in self.halts() if halts else []:
+            stops[pc] = 1
+        return stops
+
+    def digest(self) -> bytes:
+        sha = hashlib.sha256()
+        for table in (self.kinds, self.comps, self.dests, self.jumps):
+            sha.update(table.tobytes())
+        constants = array("H", self.constants)
+        if sys.byteorder == "big":
+            constants.byteswap()
+        sha.update(constants.tobytes())
+        return sha.digest()
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+@dataclass
+class Snapshot:
+    header = struct.Struct("<4sHHHHQ32s")
+    magic = b"HSNP"
+    version = 1
+
+    pc: int
+    a_register: int
+    d_register: int
+    clock: int
+    program_digest: bytes
+    ram: Ram
+
+    def to_bytes(self) -> bytes:
+        header = self.header.pack(
+            self.magic,
+            self.version,
+            self.pc,
+            self.a_register,
+            self.d_register,
+            self.clock,
+            self.program_digest,
+        )
+        return header + self.ram.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Snapshot:
+        magic, version, pc, a_register, d_register, clock, digest = (
+            cls.header.unpack_from(data)
+        )
+        expected_size = cls.header.size + 3 * RAM_SIZE
+        if magic != cls.magic or version != cls.version or len(data) != expected_size:
+            raise Exception("InvalidSnapshotException")
+        ram = Ram.from_bytes(data[cls.header.size :])
+        return cls(pc, a_register, d_register, clock, digest, ram)
+
+
+@dataclass
+class HackObject:
+    header = struct.Struct("<4sHIII")
+    symbol = struct.Struct("<HH")
+    magic = b"HOBJ"
+    version = 1
+
+    words: array
+    symbols: Dict[str, int] = field(default_factory=dict)
+    source_map: bytes = b""
+
+    @classmethod
+    def from_text(cls, instructions: Iterable[str]) -> HackObject:
+        return cls(array("H", (int(word, 2) for word in instructions if word)))
+
+    def to_text(self) -> Iterator[str]:
+        for word in self.words:
+            yield f"{word:016b}"
+
+    def to_bytes(self) -> bytes:
+        words = array("H", self.words)
+        if sys.byteorder == "big":
+            words.byteswap()
+        symbols = bytearray()
+        for name, address in self.symbols.items():
+            encoded = name.encode()
+            symbols += self.symbol.pack(address & WORD_MASK, len(encoded)) + encoded
+        header = self.header.pack(
+            self.magic, self.version, len(words), len(symbols), len(self.source_map)
+        )
+        return header + words.tobytes() + bytes(symbols) + self.source_map
+
+    @classmethod
+    def from_bytes(cls, data: Sequence[int]) -> HackObject:
+        if len(data) < cls.header.size:
+            raise Exception("InvalidHackObjectException")
+        magic, version, count, symbols_size, map_size = cls.header.unpack_from(data)
+        start = cls.header.size
+        symbols_start = start + 2 * count
+        map_start = symbols_start + symbols_size
+        end = map_start + map_size
+        if magic != cls.magic or version != cls.version or len(data) != end:
+            raise Exception("InvalidHackObjectException")
+        words = array("H")
+        words.frombytes(data[start:symbols_start])
+        if sys.byteorder == "big":
+            words.byteswap()
+        symbols = {}
+        offset = symbols_start
+        while offset < map_start:
+            address, length = cls.symbol.unpack_from(data, offset)
+            offset += cls.symbol.size
+            symbols[bytes(data[offset : offset + length]).decode()] = address
+            offset += length
+        return cls(words, symbols, bytes(data[map_start:end]))
+
+    def program(self) -> Program:
+        return Program.from_words(self.words)
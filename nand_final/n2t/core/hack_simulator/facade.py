@@ -1,175 +1,717 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
-from typing import Iterable
+import sys
+import time
+from array import array
+from dataclasses import dataclass, replace
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from n2t.core.hack_simulator.entities import Ram
+from n2t.core.hack_simulator.blocks import BlockCompiler
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    ADDRESS_MASK,
+    COMP_READS_M,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_ALWAYS,
+    JUMP_NONE,
+    RAM_DUMP_HEADER,
+    RAM_DUMP_MAGIC,
+    WATCH_READ,
+    WATCH_WRITE,
+    Engine,
+    ExitReason,
+    Program,
+    Ram,
+    RamSeed,
+    Snapshot,
+)
+from n2t.core.hack_simulator.hypercalls import Intercepts
+from n2t.core.hack_simulator.keyboard import KBD, KeyboardSchedule, PollingLoops
+from n2t.core.hack_simulator.profiler import Profile
+from n2t.core.hack_simulator.screen import Framebuffer
+from n2t.core.hack_simulator.shared import PUBLISH_EVERY, SharedRam
+from n2t.core.hack_simulator.trace import Trace
 
-
-def to_positive(number: int) -> int:
-    positive_binary = bin(abs(number))[2:].zfill(16)
-    flip_table = positive_binary.maketrans("01", "10")
-    flipped_string = positive_binary.translate(flip_table)
-    to_binary = bin(int(flipped_string, 2) + 1)
-    return int(to_binary[2:], 2)
+DEADLINE_CHECK_EVERY = 1 << 16
 
 
 @dataclass
 class HackSimulator:
-    instructions: Iterable[str]
+    instructions: Union[Iterable[str], Program]
     cycles: int
+    engine: Engine = Engine.interpreter
+    resume: Optional[Snapshot] = None
+    checkpoint_every: int = 0
+    on_checkpoint: Optional[Callable[[Snapshot], None]] = None
+    profile: bool = False
+    capture_every: int = 0
+    on_frame: Optional[Callable[[int, Framebuffer], None]] = None
+    keyboard: Optional[KeyboardSchedule] = None
+    trace: Optional[Trace] = None
+    seed: Optional[RamSeed] = None
+    intercepts: Optional[Intercepts] = None
+    deadline: Optional[float] = None
+    shared_memory: Optional[str] = None
 
     @classmethod
-    def create(cls, instructions, cycles) -> HackSimulator:
-        return cls(instructions, cycles)
+    def create(
+        cls,
+        instructions,
+        cycles,
+        engine: Engine = Engine.interpreter,
+        resume: Optional[Snapshot] = None,
+        checkpoint_every: int = 0,
+        on_checkpoint: Optional[Callable[[Snapshot], None]] = None,
+        profile: bool = False,
+        capture_every: int = 0,
+        on_frame: Optional[Callable[[int, Framebuffer], None]] = None,
+        keyboard: Optional[KeyboardSchedule] = None,
+        trace: Optional[Trace] = None,
+        seed: Optional[RamSeed] = None,
+        intercepts: Optional[Intercepts] = None,
+        deadline: Optional[float] = None,
+        shared_memory: Optional[str] = None,
+    ) -> HackSimulator:
+        return cls(
+            instructions,
+            cycles,
+            engine,
+            resume,
+            checkpoint_every,
+            on_checkpoint,
+            profile,
+            capture_every,
+            on_frame,
+            keyboard,
+            trace,
+            seed,
+            intercepts,
+            deadline,
+            shared_memory,
+        )
 
     def execute(self) -> Iterable[str]:
-        self.ram_states: Ram = Ram()
-        instr_list = list(self.instructions)
-        instr_size = len(instr_list)
-        self.a_register: int = 0
-        self.d_register: int = 0
-        self.pc: int = 0
-
-        while self.cycles > 0:
-            if self.pc >= instr_size:
-                break
-            instruction = instr_list[self.pc]
-            if instruction[0] == "0":
-                self.deal_a_instruction(instruction)
-            elif instruction[0] == "1":
-                self.deal_c_instruction(instruction)
-            self.cycles -= 1
-        return self.to_json(self.ram_states)
-
-    def deal_c_instruction(self, instruction: str) -> None:
-        comp = instruction[3:10]
-        dest = instruction[10:13]
-        jump = instruction[13:]
-
-        value: int = self.deal_compare(comp)
-        self.deal_destination(dest, value)
-        self.deal_jump(jump, value)
-
-    def deal_compare(self, comp: str) -> int:
-        if comp == "0101010":
-            return 0
-        elif comp == "0111111":
-            return 1
-        elif comp == "0111010":
-            return -1
-        elif comp == "0001100":
-            return self.d_register
-        elif comp == "0110000":
-            return self.a_register
-        elif comp == "0001101":
-            return ~self.d_register
-        elif comp == "0110001":
-            return ~self.a_register
-        elif comp == "0001111":
-            return -self.d_register
-        elif comp == "0110011":
-            return -self.a_register
-        elif comp == "0011111":
-            return self.d_register + 1
-        elif comp == "0110111":
-            return self.a_register + 1
-        elif comp == "0001110":
-            return self.d_register - 1
-        elif comp == "0110010":
-            return self.a_register - 1
-        elif comp == "0000010":
-            return self.d_register + self.a_register
-        elif comp == "0010011":
-            return self.d_register - self.a_register
-        elif comp == "0000111":
-            return self.a_register - self.d_register
-        elif comp == "0000000":
-            return self.d_register & self.a_register
-        elif comp == "0010101":
-            return self.d_register | self.a_register
-        elif comp == "1110000":
-            return self.ram_states.get(self.a_register)
-        elif comp == "1110001":
-            return ~self.ram_states.get(self.a_register)
-        elif comp == "1110011":
-            return -self.ram_states.get(self.a_register)
-        elif comp == "1110111":
-            return self.ram_states.get(self.a_register) + 1
-        elif comp == "1110010":
-            return self.ram_states.get(self.a_register) - 1
-        elif comp == "1000010":
-            return self.d_register + self.ram_states.get(self.a_register)
-        elif comp == "1010011":
-            return self.d_register - self.ram_states.get(self.a_register)
-        elif comp == "1000111":
-            return self.ram_states.get(self.a_register) - self.d_register
-        elif comp == "1000000":
-            return self.d_register & self.ram_states.get(self.a_register)
-        elif comp == "1010101":
-            return self.d_register | self.ram_states.get(self.a_register)
-        return -1
-
-    def deal_destination(self, dest: str, value: int) -> None:
-        if dest == "001":
-            self.ram_states.assign(self.a_register, value)
-        elif dest == "010":
-            self.d_register = value
-        elif dest == "011":
-            self.ram_states.assign(self.a_register, value)
-            self.d_register = value
-        elif dest == "100":
-            self.a_register = value
-        elif dest == "101":
-            self.ram_states.assign(self.a_register, value)
-            self.a_register = value
-        elif dest == "110":
-            self.a_register = value
-            self.d_register = value
-        elif dest == "111":
-            self.ram_states.assign(self.a_register, value)
-            self.a_register = value
-            self.d_register = value
-
-    def deal_jump(self, jump: str, value: int) -> None:
-        if jump == "001":
-            self.make_jump(value > 0)
-        elif jump == "010":
-            self.make_jump(value == 0)
-        elif jump == "011":
-            self.make_jump(value >= 0)
-        elif jump == "100":
-            self.make_jump(value < 0)
-        elif jump == "101":
-            self.make_jump(value != 0)
-        elif jump == "110":
-            self.make_jump(value <= 0)
-        elif jump == "111":
-            self.pc = self.a_register
-            self.make_jump(True)
-        elif jump == "000":
-            self.pc += 1
-
-    def make_jump(self, condition: bool) -> None:
-        if condition:
-            self.pc = self.a_register
+        self.start()
+        budget = self.cycles
+        started = time.perf_counter()
+        if self.deadline is not None:
+            self.expires_at = started + self.deadline
+        tasks = self.periodic_tasks()
+        if tasks:
+            self.run_periodic(tasks)
+        else:
+            self.run_engine()
+        self.seconds = time.perf_counter() - started
+        self.finish(budget)
+        if isinstance(self.ram_states, SharedRam):
+            self.publish(running=False)
+        return self.to_json(self.dump())
+
+    def start(self) -> None:
+        self.check_options()
+        if isinstance(self.instructions, Program):
+            self.program: Program = self.instructions
+        else:
+            self.program = Program.decode(self.instructions)
+        self.stops: bytearray = self.program.stops()
+        if self.intercepts is not None:
+            self.intercepts.arm(self.stops)
+        if self.resume is None:
+            self.ram_states: Ram = Ram()
+            self.a_register: int = 0
+            self.d_register: int = 0
+            self.pc: int = 0
+            self.clock: int = 0
         else:
-            self.pc += 1
+            self.restore(self.resume)
+        if self.seed is not None:
+            self.seed.apply(self.ram_states)
+        if self.shared_memory is not None:
+            shared = SharedRam.create(self.shared_memory)
+            shared.overwrite(self.ram_states)
+            self.ram_states = shared
+        self.initial_registers: array = array("H", self.ram_states.registers)
+        if self.keyboard is not None:
+            self.polling = PollingLoops(self.program)
+        if self.engine == Engine.blocks:
+            self.compiler = BlockCompiler(
+                self.program, self.ram_states, self.event_pcs()
+            )
+        if self.profile:
+            self.profiler = Profile(len(self.program))
+        self.framebuffer = Framebuffer(self.ram_states)
+        self.watched: Optional[bytearray] = None
+        self.watch_hit: Optional[Tuple[int, int]] = None
+        self.expires_at: float = float("inf")
+        self.expired: bool = False
+        self.seconds: float = 0.0
+
+    def check_options(self) -> None:
+        if self.profile and self.trace is not None:
+            raise Exception("ProfileWithTraceException")
+        if self.engine == Engine.blocks and (self.profile or self.trace is not None):
+            raise Exception("InterpreterOnlyOptionException")
+
+    def finish(self, budget: int) -> None:
+        self.executed: int = budget - self.cycles
+        self.halted_at: Optional[int] = None
+        if self.cycles <= 0:
+            self.exit_reason = ExitReason.budget
+        elif self.expired:
+            self.exit_reason = ExitReason.deadline
+        elif self.pc >= len(self.program):
+            self.exit_reason = ExitReason.pc_out_of_range
+        elif self.program.is_halt(self.pc):
+            self.exit_reason = ExitReason.halt
+            self.halted_at = self.clock
+            self.a_register = self.pc
+        else:
+            self.exit_reason = ExitReason.stopped
+
+    def run_engine(self) -> None:
+        if self.keyboard is not None:
+            self.run_keyboard()
+            return
+        budget = self.cycles
+        self.run_selected()
+        self.clock += budget - self.cycles
+
+    def run_selected(self) -> None:
+        if self.intercepts is not None:
+            self.run_intercepted()
+        else:
+            self.run_dispatch()
+
+    def run_dispatch(self) -> None:
+        if self.watched is not None:
+            self.run_watched()
+        elif self.trace is not None:
+            self.run_traced()
+        elif self.profile:
+            self.run_profiled()
+        elif self.engine == Engine.blocks:
+            self.run_blocks()
+        else:
+            self.run()
+
+    def run_intercepted(self) -> None:
+        intercepts = self.intercepts
+        stops = self.stops
+        remaining = self.cycles
+        while remaining > 0:
+            self.cycles = remaining
+            self.run_dispatch()
+            intercepts.cycles += remaining - self.cycles
+            remaining = self.cycles
+            pc = self.pc
+            if remaining == 0 or not stops[pc] or not intercepts.dispatch(self):
+                break
+            if self.pc != pc:
+                intercepts.cycles += 1
+                remaining -= 1
+                continue
+            if intercepts.base[pc]:
+                break
+            stops[pc] = 0
+            self.cycles = 1
+            self.run_dispatch()
+            stops[pc] = intercepts.armed(pc)
+            intercepts.cycles += 1 - self.cycles
+            remaining -= 1 - self.cycles
+        self.cycles = remaining
+
+    def event_pcs(self) -> List[int]:
+        pcs = list(self.intercepts.entries) if self.intercepts is not None else []
+        if self.keyboard is None:
+            return pcs
+        return pcs + [
+            event.pc for event in self.keyboard.events if event.pc is not None
+        ]
+
+    def run_keyboard(self) -> None:
+        keyboard = self.keyboard
+        loops = self.polling.loops
+        registers = self.ram_states.registers
+        stops = self.stops
+        remaining = self.cycles
+
+        while remaining > 0:
+            event = keyboard.head
+            if event is not None and (
+                event.pc == self.pc
+                or (event.cycle is not None and event.cycle <= self.clock)
+            ):
+                registers[KBD] = keyboard.pop().key
+                if self.trace is not None:
+                    self.trace.keyframe(self.snapshot())
+                continue
+
+            until = remaining
+            if event is not None and event.cycle is not None:
+                until = min(until, event.cycle - self.clock)
+
+            length = loops.get(self.pc)
+            inside = (
+                length is not None
+                and event is not None
+                and event.pc is not None
+                and self.pc <= event.pc < self.pc + length
+            )
+            if (
+                length is not None
+                and until >= length
+                and not inside
+                and self.trace is None
+            ):
+                a_register, d_register, taken = self.polling.iterate(
+                    self.pc, registers[KBD]
+                )
+                if taken:
+                    skipped = until // length * length
+                    self.a_register, self.d_register = a_register, d_register
+                    self.clock += skipped
+                    remaining -= skipped
+                    continue
+
+            armed = set(loops)
+            if event is not None and event.pc is not None:
+                armed.add(event.pc)
+            armed.discard(self.pc)
+            armed = {pc for pc in armed if not stops[pc]}
+            for pc in armed:
+                stops[pc] = 1
+            self.cycles = until
+            self.run_selected()
+            for pc in armed:
+                stops[pc] = 0
+
+            self.clock += until - self.cycles
+            remaining -= until - self.cycles
+            if self.cycles > 0 and self.pc not in armed:
+                break
+        self.cycles = remaining
+
+    def periodic_tasks(self) -> List[Tuple[int, Callable[[], None]]]:
+        tasks = []
+        if self.checkpoint_every > 0:
+            tasks.append((self.checkpoint_every, self.checkpoint))
+        if self.capture_every > 0:
+            tasks.append((self.capture_every, self.capture))
+        if self.deadline is not None:
+            tasks.append((DEADLINE_CHECK_EVERY, self.check_deadline))
+        if self.shared_memory is not None:
+            tasks.append((PUBLISH_EVERY, self.publish))
+        return tasks
+
+    def run_periodic(self, tasks: List[Tuple[int, Callable[[], None]]]) -> None:
+        remaining = self.cycles
+        elapsed = 0
+        due = [every for every, _ in tasks]
+        while remaining > 0:
+            self.cycles = min(min(due) - elapsed, remaining)
+            chunk = self.cycles
+            self.run_engine()
+            elapsed += chunk - self.cycles
+            remaining -= chunk - self.cycles
+            if self.cycles > 0:
+                break
+            for index, (every, task) in enumerate(tasks):
+                if due[index] == elapsed:
+                    task()
+                    due[index] += every
+            if self.expired:
+                break
+        self.cycles = remaining
+
+    def publish(self, running: bool = True) -> None:
+        self.ram_states.publish(
+            self.pc, self.a_register, self.d_register, self.clock, running
+        )
+
+    def close(self) -> None:
+        if isinstance(getattr(self, "ram_states", None), SharedRam):
+            self.framebuffer.release()
+            self.ram_states.close()
+
+    def check_deadline(self) -> None:
+        self.expired = time.perf_counter() >= self.expires_at
+
+    @property
+    def instructions_per_second(self) -> float:
+        return self.executed / self.seconds if self.seconds > 0 else 0.0
+
+    def checkpoint(self) -> None:
+        if self.on_checkpoint is not None:
+            self.on_checkpoint(self.snapshot())
+
+    def capture(self) -> None:
+        if self.framebuffer.refresh() and self.on_frame is not None:
+            self.on_frame(self.clock, self.framebuffer)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(
+            self.pc,
+            self.a_register,
+            self.d_register,
+            self.clock,
+            self.program.digest(),
+            self.ram_states.copy(),
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        if snapshot.program_digest != self.program.digest():
+            raise Exception("SnapshotProgramMismatchException")
+        self.ram_states = snapshot.ram.copy()
+        self.a_register = snapshot.a_register
+        self.d_register = snapshot.d_register
+        self.pc = snapshot.pc
+        self.clock = snapshot.clock
+
+    def run(self) -> None:
+        kinds = self.program.kinds
+        comps = self.program.comps
+        dests = self.program.dests
+        jumps = self.program.jumps
+        constants = self.program.constants
+        compare_table = Program.compare_table
+        jump_table = Program.jump_table
+        registers = self.ram_states.registers
+        written = self.ram_states.written
+        stops = self.stops
+
+        a_register = self.a_register
+        d_register = self.d_register
+        pc = self.pc
+        cycles = self.cycles
 
-    def deal_a_instruction(self, instruction: str) -> None:
-        binary_string = instruction[1:]
-        decimal_value = int(binary_string, 2)
-        self.a_register = decimal_value
-        self.pc += 1
+        while cycles > 0:
+            if stops[pc]:
+                break
+            cycles -= 1
+            if kinds[pc] == A_INSTRUCTION:
+                a_register = constants[pc]
+                pc += 1
+                continue
+
+            comp = comps[pc]
+            if comp & COMP_READS_M:
+                value = compare_table[comp](
+                    d_register, registers[a_register & ADDRESS_MASK]
+                )
+            else:
+                value = compare_table[comp](d_register, a_register)
+
+            dest = dests[pc]
+            if dest & DEST_M:
+                address = a_register & ADDRESS_MASK
+                registers[address] = value
+                written[address] = 1
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
+
+            jump = jumps[pc]
+            if jump == JUMP_NONE:
+                pc += 1
+            elif jump == JUMP_ALWAYS or jump_table[jump](value):
+                pc = a_register
+            else:
+                pc += 1
+
+        self.a_register = a_register
+        self.d_register = d_register
+        self.pc = pc
+        self.cycles = cycles
+
+    def run_profiled(self) -> None:
+        kinds = self.program.kinds
+        comps = self.program.comps
+        dests = self.program.dests
+        jumps = self.program.jumps
+        constants = self.program.constants
+        compare_table = Program.compare_table
+        jump_table = Program.jump_table
+        registers = self.ram_states.registers
+        written = self.ram_states.written
+        stops = self.stops
+        hits = self.profiler.hits
+        taken = self.profiler.taken
+        not_taken = self.profiler.not_taken
+
+        a_register = self.a_register
+        d_register = self.d_register
+        pc = self.pc
+        cycles = self.cycles
+
+        while cycles > 0:
+            if stops[pc]:
+                break
+            cycles -= 1
+            hits[pc] += 1
+            if kinds[pc] == A_INSTRUCTION:
+                a_register = constants[pc]
+                pc += 1
+                continue
+
+            comp = comps[pc]
+            if comp & COMP_READS_M:
+                value = compare_table[comp](
+                    d_register, registers[a_register & ADDRESS_MASK]
+                )
+            else:
+                value = compare_table[comp](d_register, a_register)
+
+            dest = dests[pc]
+            if dest & DEST_M:
+                address = a_register & ADDRESS_MASK
+                registers[address] = value
+                written[address] = 1
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
+
+            jump = jumps[pc]
+            if jump == JUMP_NONE:
+                pc += 1
+            elif jump == JUMP_ALWAYS or jump_table[jump](value):
+                taken[pc] += 1
+                pc = a_register
+            else:
+                not_taken[pc] += 1
+                pc += 1
+
+        self.a_register = a_register
+        self.d_register = d_register
+        self.pc = pc
+        self.cycles = cycles
+
+    def run_watched(self) -> None:
+        kinds = self.program.kinds
+        comps = self.program.comps
+        dests = self.program.dests
+        jumps = self.program.jumps
+        constants = self.program.constants
+        compare_table = Program.compare_table
+        jump_table = Program.jump_table
+        registers = self.ram_states.registers
+        written = self.ram_states.written
+        stops = self.stops
+        watched = self.watched
+        hit = None
+
+        a_register = self.a_register
+        d_register = self.d_register
+        pc = self.pc
+        cycles = self.cycles
+
+        while cycles > 0:
+            if stops[pc]:
+                break
+            cycles -= 1
+            if kinds[pc] == A_INSTRUCTION:
+                a_register = constants[pc]
+                pc += 1
+                continue
+
+            comp = comps[pc]
+            if comp & COMP_READS_M:
+                address = a_register & ADDRESS_MASK
+                if watched[address] & WATCH_READ:
+                    hit = (address, WATCH_READ)
+                value = compare_table[comp](d_register, registers[address])
+            else:
+                value = compare_table[comp](d_register, a_register)
+
+            dest = dests[pc]
+            if dest & DEST_M:
+                address = a_register & ADDRESS_MASK
+                if watched[address] & WATCH_WRITE:
+                    hit = (address, WATCH_WRITE)
+                registers[address] = value
+                written[address] = 1
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
 
-    def to_json(self, ram_states: Ram) -> Iterable[str]:
-        registers: dict = ram_states.registers
+            jump = jumps[pc]
+            if jump == JUMP_NONE:
+                pc += 1
+            elif jump == JUMP_ALWAYS or jump_table[jump](value):
+                pc = a_register
+            else:
+                pc += 1
+            if hit is not None:
+                break
+
+        self.a_register = a_register
+        self.d_register = d_register
+        self.pc = pc
+        self.cycles = cycles
+        self.watch_hit = hit
+
+    def run_traced(self) -> None:
+        trace = self.trace
+        clock = self.clock
+        remaining = self.cycles
+        while remaining > 0:
+            if trace.due():
+                trace.keyframe(replace(self.snapshot(), clock=clock))
+            self.cycles = min(remaining, trace.until_boundary())
+            chunk = self.cycles
+            self.run_recorded(clock)
+            executed = chunk - self.cycles
+            trace.count += executed
+            clock += executed
+            remaining -= executed
+            if self.cycles > 0:
+                break
+        self.cycles = remaining
+
+    def run_recorded(self, clock: int) -> None:
+        kinds = self.program.kinds
+        comps = self.program.comps
+        dests = self.program.dests
+        jumps = self.program.jumps
+        constants = self.program.constants
+        compare_table = Program.compare_table
+        jump_table = Program.jump_table
+        registers = self.ram_states.registers
+        written = self.ram_states.written
+        stops = self.stops
+        buffer = self.trace.buffer
+        offset = self.trace.offset
+        pack_into = Trace.record.pack_into
+        size = Trace.record.size
+        no_write = Trace.no_write
+
+        a_register = self.a_register
+        d_register = self.d_register
+        pc = self.pc
+        cycles = self.cycles
+
+        while cycles > 0:
+            if stops[pc]:
+                break
+            cycles -= 1
+            clock += 1
+            if kinds[pc] == A_INSTRUCTION:
+                a_register = constants[pc]
+                pc += 1
+                pack_into(
+                    buffer, offset, clock, pc, a_register, d_register, no_write, 0
+                )
+                offset += size
+                continue
+
+            comp = comps[pc]
+            if comp & COMP_READS_M:
+                value = compare_table[comp](
+                    d_register, registers[a_register & ADDRESS_MASK]
+                )
+            else:
+                value = compare_table[comp](d_register, a_register)
+
+            address = no_write
+            dest = dests[pc]
+            if dest & DEST_M:
+                address = a_register & ADDRESS_MASK
+                registers[address] = value
+                written[address] = 1
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
 
-        sorted_registers = {k: registers[k] for k in sorted(registers.keys())}
-        for key in sorted_registers:
-            if sorted_registers[key] < 0:
-                sorted_registers[key] = to_positive(sorted_registers[key])
+            jump = jumps[pc]
+            if jump == JUMP_NONE:
+                pc += 1
+            elif jump == JUMP_ALWAYS or jump_table[jump](value):
+                pc = a_register
+            else:
+                pc += 1
+            pack_into(buffer, offset, clock, pc, a_register, d_register, address, value)
+            offset += size
+
+        self.a_register = a_register
+        self.d_register = d_register
+        self.pc = pc
+        self.cycles = cycles
+
+    def run_blocks(self) -> None:
+        get_block = self.compiler.get
+        stops = self.stops
+
+        a_register = self.a_register
+        d_register = self.d_register
+        pc = self.pc
+        cycles = self.cycles
+
+        while cycles > 0 and not stops[pc]:
+            block, length = get_block(pc)
+            if length > cycles:
+                break
+            a_register, d_register, pc = block(a_register, d_register)
+            cycles -= length
+
+        self.a_register = a_register
+        self.d_register = d_register
+        self.pc = pc
+        self.cycles = cycles
+        self.run()
+
+    def dump(
+        self,
+        ranges: Optional[Sequence[Tuple[int, int]]] = None,
+        changed_only: bool = False,
+    ) -> Iterator[Tuple[int, int]]:
+        entries = self.ram_states.items(ranges)
+        if changed_only:
+            initial = self.initial_registers
+            entries = (
+                (address, value)
+                for address, value in entries
+                if value != initial[address]
+            )
+        return entries
+
+    @staticmethod
+    def to_json(entries: Iterable[Tuple[int, int]]) -> Iterator[str]:
+        entries = iter(entries)
+        first = next(entries, None)
+        yield "{"
+        if first is None:
+            yield '   "RAM": {}'
+        else:
+            yield '   "RAM": {'
+            line = f'      "{first[0]}": {first[1]}'
+            for address, value in entries:
+                yield line + ","
+                line = f'      "{address}": {value}'
+            yield line
+            yield "   }"
+        yield "}"
 
-        json_str = json.dumps({"RAM": sorted_registers}, indent=3)
-        return [json_str]
+    @staticmethod
+    def to_binary(entries: Iterable[Tuple[int, int]]) -> bytes:
+        words = array("H")
+        for address, value in entries:
+            words.append(address)
+            words.append(value)
+        if sys.byteorder == "big":
+            words.byteswap()
+        header = RAM_DUMP_HEADER.pack(RAM_DUMP_MAGIC, len(words) // 2)
+        return header + words.tobytes()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence
+
+from n2t.core.hack_simulator.entities import SIGN_BIT, WORD_MASK, Ram
+
+if TYPE_CHECKING:  # pragma: no cover
+    from n2t.core.hack_simulator.facade import HackSimulator
+
+SP = 0
+LCL = 1
+ARG = 2
+THIS = 3
+THAT = 4
+
+MIN_INT = -SIGN_BIT
+HEAP_END = 16383
+SCREEN_WIDTH = 512
+SCREEN_HEIGHT = 256
+
+Native = Callable[[Ram, List[int], Dict[str, int]], Optional[int]]
+
+
+def signed(value: int) -> int:
+    return value - (value & SIGN_BIT) * 2
+
+
+def multiply(ram: Ram, args: List[int], statics: Dict[str, int]) -> Optional[int]:
+    x, y = signed(args[0]), signed(args[1])
+    if MIN_INT in (x, y):
+        return None
+    return x * y & WORD_MASK
+
+
+def divide(ram: Ram, args: List[int], statics: Dict[str, int]) -> Optional[int]:
+    x, y = signed(args[0]), signed(args[1])
+    if y == 0 or MIN_INT in (x, y):
+        return None
+    quotient = abs(x) // abs(y)
+    if (x < 0) != (y < 0):
+        quotient = -quotient
+    return quotient & WORD_MASK
+
+
+def alloc(ram: Ram, args: List[int], statics: Dict[str, int]) -> Optional[int]:
+    base = ram.get(statics["memory.0"])
+
+    def peek(address: int) -> int:
+        return signed(ram.get(base + address))
+
+    def poke(address: int, value: int) -> None:
+        ram.assign(base + address, value)
+
+    size = signed(args[0])
+    if size < 0:
+        return None
+    size = max(size, 1)
+    segment = 2048
+    for _ in range(HEAP_END):
+        if segment >= HEAP_END or peek(segment) >= size:
+            break
+        following = peek(segment + 1)
+        if peek(segment) == 0 or following > HEAP_END - 1 or peek(following) == 0:
+            segment = following
+            continue
+        poke(segment, following - segment + peek(following))
+        if peek(following + 1) == following + 2:
+            poke(segment + 1, segment + 2)
+        else:
+            poke(segment + 1, peek(following + 1))
+    else:
+        return None
+    if segment + size > HEAP_END - 4:
+        return None
+    if peek(segment) > size + 2:
+        poke(segment + size + 2, peek(segment) - size - 2)
+        if peek(segment + 1) == segment + 2:
+            poke(segment + size + 3, segment + size + 4)
+        else:
+            poke(segment + size + 3, peek(segment + 1))
+        poke(segment + 1, segment + size + 2)
+    poke(segment, 0)
+    return (segment + 2) & WORD_MASK
+
+
+def draw_line(ram: Ram, args: List[int], statics: Dict[str, int]) -> Optional[int]:
+    x1, y1, x2, y2 = (signed(arg) for arg in args)
+    if not all(0 <= x < SCREEN_WIDTH for x in (x1, x2)) or not all(
+        0 <= y < SCREEN_HEIGHT for y in (y1, y2)
+    ):
+        return None
+    screen = ram.get(statics["screen.1"])
+    color = ram.get(statics["screen.2"])
+
+    def draw(x: int, y: int) -> None:
+        address = screen + y * 32 + x // 16
+        mask = 1 << x % 16
+        if color:
+            ram.assign(address, ram.get(address) | mask)
+        else:
+            ram.assign(address, ram.get(address) & ~mask)
+
+    dx, dy = abs(x2 - x1), abs(y2 - y1)
+    steep = dx < dy
+    if (steep and y2 < y1) or (not steep and x2 < x1):
+        x1, y1, x2, y2 = x2, y2, x1, y1
+    if steep:
+        dx, dy = dy, dx
+        a, b, end, decreasing = y1, x1, y2, x1 > x2
+    else:
+        a, b, end, decreasing = x1, y1, x2, y1 > y2
+    error = 2 * dy - dx
+    straight, diagonal = 2 * dy, 2 * (dy - dx)
+    draw(*((b, a) if steep else (a, b)))
+    while a < end:
+        if error < 0:
+            error += straight
+        else:
+            error += diagonal
+            b += -1 if decreasing else 1
+        a += 1
+        draw(*((b, a) if steep else (a, b)))
+    return 0
+
+
+@dataclass(frozen=True)
+class Hypercall:
+    name: str
+    arity: int
+    native: Native
+    statics: Sequence[str] = ()
+
+
+HYPERCALLS = [
+    Hypercall("math.multiply", 2, multiply),
+    Hypercall("math.divide", 2, divide),
+    Hypercall("memory.alloc", 1, alloc, ("memory.0",)),
+    Hypercall("screen.drawline", 4, draw_line, ("screen.1", "screen.2")),
+]
+
+
+@dataclass
+class HypercallStats:
+    calls: int = 0
+    declined: int = 0
+    cycles: int = 0
+    saved: int = 0
+    mismatches: int = 0
+
+
+@dataclass(frozen=True)
+class PendingCall:
+    hypercall: Hypercall
+    return_address: int
+    stack_pointer: int
+    started: int
+    expected: Optional[int]
+
+
+@dataclass
+class Intercepts:
+    entries: Dict[int, Hypercall]
+    statics: Dict[str, int]
+    accounting: bool = False
+    stats: Dict[str, HypercallStats] = field(default_factory=dict)
+    pending: List[PendingCall] = field(default_factory=list)
+    cycles: int = 0
+
+    @classmethod
+    def from_symbols(
+        cls, symbols: Dict[str, int], accounting: bool = False
+    ) -> Intercepts:
+        lowered = {name.lower(): address for name, address in symbols.items()}
+        entries: Dict[int, Hypercall] = {}
+        statics: Dict[str, int] = {}
+        for hypercall in HYPERCALLS:
+            names = [hypercall.name, *hypercall.statics]
+            if any(name not in lowered for name in names):
+                continue
+            entries[lowered[hypercall.name]] = hypercall
+            statics.update((name, lowered[name]) for name in hypercall.statics)
+        return cls(entries, statics, accounting)
+
+    def arm(self, stops: bytearray) -> None:
+        self.base = bytes(stops)
+        for pc in self.entries:
+            stops[pc] = 1
+
+    def armed(self, pc: int) -> int:
+        returns = (call.return_address for call in self.pending)
+        return int(self.base[pc] or pc in self.entries or pc in returns)
+
+    def dispatch(self, simulator: HackSimulator) -> bool:
+        pc = simulator.pc
+        ram = simulator.ram_states
+        if self.pending and self.pending[-1].return_address == pc:
+            if self.pending[-1].stack_pointer == ram.get(SP):
+                self.complete(simulator)
+            return True
+        hypercall = self.entries.get(pc)
+        if hypercall is None:
+            return any(call.return_address == pc for call in self.pending)
+        stats = self.stats.setdefault(hypercall.name, HypercallStats())
+        frame = ram.get(LCL)
+        arguments = ram.get(ARG)
+        args = [ram.get(arguments + index) for index in range(hypercall.arity)]
+        if self.accounting:
+            stats.calls += 1
+            self.pending.append(
+                PendingCall(
+                    hypercall,
+                    ram.get(frame - 5),
+                    (arguments + 1) & WORD_MASK,
+                    self.cycles,
+                    hypercall.native(ram.copy(), args, self.statics),
+                )
+            )
+            simulator.stops[self.pending[-1].return_address] = 1
+            return True
+        value = hypercall.native(ram, args, self.statics)
+        if value is None:
+            stats.declined += 1
+            return True
+        stats.calls += 1
+        ram.assign(arguments, value)
+        ram.assign(SP, arguments + 1)
+        ram.assign(THAT, ram.get(frame - 1))
+        ram.assign(THIS, ram.get(frame - 2))
+        ram.assign(ARG, ram.get(frame - 3))
+        ram.assign(LCL, ram.get(frame - 4))
+        simulator.pc = simulator.a_register = ram.get(frame - 5)
+        return True
+
+    def complete(self, simulator: HackSimulator) -> None:
+        call = self.pending.pop()
+        stats = self.stats[call.hypercall.name]
+        cycles = self.cycles - call.started
+        stats.cycles += cycles
+        if not self.pending:
+            stats.saved += cycles - 1
+        ram = simulator.ram_states
+        if call.expected is None:
+            stats.declined += 1
+        elif ram.get(ram.get(SP) - 1) != call.expected:
+            stats.mismatches += 1
+        simulator.stops[call.return_address] = self.armed(call.return_address)
+
+    def report(self) -> Iterable[str]:
+        mode = "accounting" if self.accounting else "native"
+        yield f"Hypercalls ({mode})"
+        yield (
+            "function              calls  declined      cycles       saved  mismatches"
+        )
+        for name, stats in sorted(self.stats.items()):
+            yield (
+                f"{name:20s} {stats.calls:6d} {stats.declined:9d} "
+                f"{stats.cycles:11d} {stats.saved:11d} {stats.mismatches:11d}"
+            )
+        if self.accounting:
+            saved = sum(stats.saved for stats in self.stats.values())
+            yield ""
+            yield f"Cycles saved: {saved} of {self.cycles}"
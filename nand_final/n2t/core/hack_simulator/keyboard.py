@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    COMP_READS_M,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_NONE,
+    Program,
+)
+
+KBD = 24576
+
+COMP_ZERO_X = 0b0100000
+COMP_ZERO_Y = 0b0001000
+
+
+@dataclass(frozen=True)
+class KeyEvent:
+    key: int
+    cycle: Optional[int] = None
+    pc: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, event: dict) -> KeyEvent:
+        key = event["key"]
+        if isinstance(key, str):
+            key = ord(key)
+        if ("cycle" in event) == ("pc" in event):
+            raise Exception("InvalidKeyEventException")
+        return cls(key, event.get("cycle"), event.get("pc"))
+
+
+class KeyboardSchedule:
+    def __init__(self, events: Iterable[KeyEvent]) -> None:
+        self.events: Deque[KeyEvent] = deque(events)
+
+    @classmethod
+    def from_list(cls, events: Iterable[dict]) -> KeyboardSchedule:
+        return cls(KeyEvent.from_dict(event) for event in events)
+
+    @property
+    def head(self) -> Optional[KeyEvent]:
+        return self.events[0] if self.events else None
+
+    def next_cycle(self) -> Optional[int]:
+        head = self.head
+        return None if head is None else head.cycle
+
+    def next_pc(self) -> Optional[int]:
+        head = self.head
+        return None if head is None else head.pc
+
+    def pop(self) -> KeyEvent:
+        return self.events.popleft()
+
+
+class PollingLoops:
+    def __init__(self, program: Program) -> None:
+        self.program = program
+        self.loops: Dict[int, int] = {}
+        for end in range(1, len(program)):
+            start = self.back_edge(end)
+            if start is not None and self.is_polling(start, end):
+                self.loops[start] = end - start + 1
+
+    def back_edge(self, end: int) -> Optional[int]:
+        program = self.program
+        if (
+            program.kinds[end] == A_INSTRUCTION
+            or program.jumps[end] == JUMP_NONE
+            or program.dests[end] & DEST_A
+            or program.kinds[end - 1] != A_INSTRUCTION
+            or program.constants[end - 1] > end
+        ):
+            return None
+        return program.constants[end - 1]
+
+    def is_polling(self, start: int, end: int) -> bool:
+        program = self.program
+        a_defined = d_defined = reads_kbd = False
+        a_constant: Optional[int] = None
+        for pc in range(start, end + 1):
+            if program.kinds[pc] == A_INSTRUCTION:
+                a_defined, a_constant = True, program.constants[pc]
+                continue
+            comp = program.comps[pc]
+            dest = program.dests[pc]
+            if comp not in Program.compare_map or dest & DEST_M:
+                return False
+            if pc != end and program.jumps[pc] != JUMP_NONE:
+                return False
+            if not comp & COMP_ZERO_X and not d_defined:
+                return False
+            if not comp & COMP_ZERO_Y:
+                if comp & COMP_READS_M:
+                    if a_constant != KBD:
+                        return False
+                    reads_kbd = True
+                elif not a_defined:
+                    return False
+            if dest & DEST_A:
+                a_defined, a_constant = True, None
+            if dest & DEST_D:
+                d_defined = True
+        return reads_kbd
+
+    def iterate(self, start: int, key: int) -> Tuple[int, int, bool]:
+        program = self.program
+        a_register = d_register = value = 0
+        end = start + self.loops[start] - 1
+        for pc in range(start, end + 1):
+            if program.kinds[pc] == A_INSTRUCTION:
+                a_register = program.constants[pc]
+                continue
+            comp = program.comps[pc]
+            operand = key if comp & COMP_READS_M else a_register
+            value = Program.compare_table[comp](d_register, operand)
+            dest = program.dests[pc]
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
+        taken = Program.jump_table[program.jumps[end]](value)
+        return a_register, d_register, taken
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from n2t.core.assembler.entities import SourceLine
+from n2t.core.assembler.source_map import SourceMap
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    DEST_A,
+    JUMP_NONE,
+    Program,
+)
+
+
+@dataclass(frozen=True)
+class Loop:
+    start: int
+    end: int
+    iterations: int
+    cycles: int
+
+
+class Profile:
+    def __init__(self, size: int) -> None:
+        self.hits: array = array("Q", bytes(8 * size))
+        self.taken: array = array("Q", bytes(8 * size))
+        self.not_taken: array = array("Q", bytes(8 * size))
+
+    @property
+    def total(self) -> int:
+        return sum(self.hits)
+
+    def hotspots(self, top: int) -> List[int]:
+        executed = [pc for pc, hits in enumerate(self.hits) if hits]
+        executed.sort(key=lambda pc: (-self.hits[pc], pc))
+        return executed[:top]
+
+    def loops(self, program: Program) -> List[Loop]:
+        loops = []
+        for end in range(1, len(program)):
+            start = self.jump_target(program, end)
+            if start is None or start > end or not self.taken[end]:
+                continue
+            body = self.hits[start : end + 1]
+            if 2 * sum(1 for hits in body if hits) < len(body):
+                continue
+            cycles = sum(body)
+            loops.append(Loop(start, end, self.taken[end], cycles))
+        loops.sort(key=lambda loop: (-loop.cycles, loop.start))
+        return loops
+
+    def sources(self, source_map: SourceMap) -> List[Tuple[Tuple[str, int], int]]:
+        totals: Dict[Tuple[str, int], int] = {}
+        for pc, hits in enumerate(self.hits):
+            source = source_map.source(pc) if hits else None
+            if source is not None:
+                totals[source] = totals.get(source, 0) + hits
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+    @staticmethod
+    def jump_target(program: Program, pc: int) -> Optional[int]:
+        if (
+            program.kinds[pc] == A_INSTRUCTION
+            or program.jumps[pc] == JUMP_NONE
+            or program.dests[pc] & DEST_A
+            or program.kinds[pc - 1] != A_INSTRUCTION
+        ):
+            return None
+        return program.constants[pc - 1]
+
+    def report(
+        self,
+        program: Program,
+        sources: Optional[Sequence[SourceLine]] = None,
+        top: int = 20,
+        source_map: Optional[SourceMap] = None,
+    ) -> Iterable[str]:
+        total = self.total or 1
+        yield f"Total cycles: {self.total}"
+        yield ""
+        yield "Hot instructions"
+        yield "address      hits   share    taken  not-taken  source"
+        for pc in self.hotspots(top):
+            share = 100 * self.hits[pc] / total
+            yield (
+                f"{pc:7d} {self.hits[pc]:9d} {share:6.2f}% "
+                f"{self.taken[pc]:8d} {self.not_taken[pc]:10d}  "
+                f"{self.describe(pc, sources)}"
+            )
+        yield ""
+        yield "Hot loops"
+        yield "  start     end  iterations     cycles   share  source"
+        for loop in self.loops(program)[:top]:
+            share = 100 * loop.cycles / total
+            yield (
+                f"{loop.start:7d} {loop.end:7d} {loop.iterations:11d} "
+                f"{loop.cycles:10d} {share:6.2f}%  "
+                f"{self.describe(loop.start, sources)}"
+            )
+        if source_map is None or not source_map.origin_starts:
+            return
+        yield ""
+        yield "Hot source lines"
+        yield "     hits   share  source"
+        for (file, line), hits in self.sources(source_map)[:top]:
+            share = 100 * hits / total
+            yield f"{hits:9d} {share:6.2f}%  {file}:{line}"
+
+    @staticmethod
+    def describe(pc: int, sources: Optional[Sequence[SourceLine]]) -> str:
+        if sources is None or pc >= len(sources):
+            return ""
+        source = sources[pc]
+        label = f"({source.label}) " if source.label else ""
+        return f"{label}line {source.line}: {source.text}"
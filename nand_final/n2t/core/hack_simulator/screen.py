@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import List
+
+from n2t.core.hack_simulator.entities import Ram
+
+SCREEN = 16384
+SCREEN_WIDTH = 512
+SCREEN_HEIGHT = 256
+ROW_WORDS = SCREEN_WIDTH // 16
+SCREEN_WORDS = ROW_WORDS * SCREEN_HEIGHT
+ROW_BYTES = 2 * ROW_WORDS
+
+REVERSED_BITS = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+
+class Framebuffer:
+    def __init__(self, ram: Ram) -> None:
+        self.view: memoryview = memoryview(ram.registers)[
+            SCREEN : SCREEN + SCREEN_WORDS
+        ]
+        self.rendered: array = array("H", bytes(2 * SCREEN_WORDS))
+        self.bitmap: bytearray = bytearray(2 * SCREEN_WORDS)
+
+    def row(self, index: int) -> memoryview:
+        return self.view[index * ROW_WORDS : (index + 1) * ROW_WORDS]
+
+    def dirty_rows(self) -> List[int]:
+        rendered = memoryview(self.rendered)
+        return [
+            index
+            for index in range(SCREEN_HEIGHT)
+            if self.row(index) != rendered[index * ROW_WORDS : (index + 1) * ROW_WORDS]
+        ]
+
+    def refresh(self) -> List[int]:
+        dirty = self.dirty_rows()
+        for index in dirty:
+            words = array("H", self.row(index))
+            start = index * ROW_WORDS
+            self.rendered[start : start + ROW_WORDS] = words
+            if sys.byteorder == "big":
+                words.byteswap()
+            pixels = words.tobytes().translate(REVERSED_BITS)
+            self.bitmap[index * ROW_BYTES : (index + 1) * ROW_BYTES] = pixels
+        return dirty
+
+    def to_pbm(self) -> bytes:
+        header = f"P4\n{SCREEN_WIDTH} {SCREEN_HEIGHT}\n".encode()
+        return header + bytes(self.bitmap)
+
+    def release(self) -> None:
+        self.view.release()
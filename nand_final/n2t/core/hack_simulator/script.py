@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from n2t.core.hack_simulator.entities import PC_SPACE, SIGN_BIT, WORD_MASK
+from n2t.core.hack_simulator.facade import HackSimulator
+
+TOKENS = re.compile(r'"[^"]*"|[{},;!]|[^\s{},;!"]+')
+COMMENTS = re.compile(r"/\*.*?\*/|//[^\n]*", re.DOTALL)
+VARIABLE = re.compile(r"(\w+)(?:\[(\d*)\])?$")
+
+CLOCK_COMMANDS = {"tick", "tock", "ticktock"}
+IGNORED_COMMANDS = {
+    "echo",
+    "clear-echo",
+    "breakpoint",
+    "clear-breakpoints",
+    "output-file",
+    "compare-to",
+}
+MEMORIES = {"RAM", "RAM16K"}
+REGISTERS = {
+    "A": "a_register",
+    "ARegister": "a_register",
+    "D": "d_register",
+    "DRegister": "d_register",
+    "PC": "pc",
+}
+
+
+@dataclass(frozen=True)
+class Command:
+    name: str
+    args: List[str]
+    body: Optional[List[Command]] = None
+
+
+@dataclass(frozen=True)
+class OutputColumn:
+    variable: str
+    base: str = "B"
+    left: int = 1
+    width: int = 16
+    right: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> OutputColumn:
+        variable, _, fmt = spec.partition("%")
+        if not fmt:
+            return cls(variable)
+        left, width, right = (int(part) for part in fmt[1:].split("."))
+        return cls(variable, fmt[0], left, width, right)
+
+    def header(self) -> str:
+        size = self.left + self.width + self.right
+        name = self.variable[:size]
+        left = (size - len(name)) // 2
+        return " " * left + name + " " * (size - len(name) - left)
+
+    def format(self, value: str) -> str:
+        if self.base == "S":
+            text = value.ljust(self.width)[: self.width]
+        else:
+            text = value.rjust(self.width)[-self.width :]
+        return " " * self.left + text + " " * self.right
+
+
+@dataclass
+class TestScript:
+    commands: List[Command]
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> TestScript:
+        text = COMMENTS.sub("", "\n".join(lines))
+        return cls(parse_commands(iter(TOKENS.findall(text))))
+
+    def setting(self, name: str) -> Optional[str]:
+        for command in self.commands:
+            if command.name == name and command.args:
+                return command.args[0]
+        return None
+
+
+def parse_commands(tokens: Iterator[str]) -> List[Command]:
+    commands: List[Command] = []
+    words: List[str] = []
+    for token in tokens:
+        if token in (",", ";", "!"):
+            if words:
+                commands.append(Command(words[0], words[1:]))
+            words = []
+        elif token == "{":
+            if not words:
+                raise Exception("InvalidScriptException")
+            commands.append(Command(words[0], words[1:], parse_commands(tokens)))
+            words = []
+        elif token == "}":
+            break
+        else:
+            words.append(token)
+    if words:
+        commands.append(Command(words[0], words[1:]))
+    return commands
+
+
+def parse_value(text: str) -> int:
+    if text.startswith("%"):
+        base = {"B": 2, "X": 16, "D": 10}[text[1].upper()]
+        return int(text[2:], base) & WORD_MASK
+    return int(text) & WORD_MASK
+
+
+@dataclass
+class ScriptRunner:
+    script: TestScript
+    load: Callable[[str], Iterable[str]]
+    columns: List[OutputColumn] = field(default_factory=list)
+    simulator: Optional[HackSimulator] = None
+    time: int = 0
+    ticked: bool = False
+    reset: int = 0
+
+    def run(self) -> Iterator[str]:
+        yield from self.run_commands(self.script.commands)
+
+    def run_commands(self, commands: List[Command]) -> Iterator[str]:
+        for command in commands:
+            yield from self.run_command(command)
+
+    def run_command(self, command: Command) -> Iterator[str]:
+        name, args = command.name, command.args
+        if command.body is not None:
+            yield from self.repeat(command)
+        elif name == "load":
+            self.load_program(args[0] if args else "")
+        elif name == "ROM32K" and args[:1] == ["load"]:
+            self.load_program(args[1])
+        elif name == "output-list":
+            self.columns = [OutputColumn.parse(spec) for spec in args]
+            yield "|" + "|".join(column.header() for column in self.columns) + "|"
+        elif name == "output":
+            yield "|" + "|".join(self.output(column) for column in self.columns) + "|"
+        elif name == "set":
+            self.assign(args[0], parse_value(args[1]))
+        elif name == "tick":
+            self.ticked = True
+        elif name == "tock":
+            self.ticked = False
+            self.advance(1)
+        elif name == "ticktock":
+            self.advance(1)
+        elif name not in IGNORED_COMMANDS:
+            raise Exception("UnsupportedScriptException")
+
+    def repeat(self, command: Command) -> Iterator[str]:
+        if command.name != "repeat" or not command.args:
+            raise Exception("UnsupportedScriptException")
+        count = int(command.args[0])
+        cycles = self.clock_only(command.body)
+        if cycles is not None:
+            self.advance(count * cycles)
+            return
+        for _ in range(count):
+            yield from self.run_commands(command.body)
+
+    @staticmethod
+    def clock_only(body: List[Command]) -> Optional[int]:
+        names = [command.name for command in body]
+        if any(name not in CLOCK_COMMANDS for name in names):
+            return None
+        if names.count("tick") != names.count("tock"):
+            return None
+        return names.count("ticktock") + names.count("tock")
+
+    def load_program(self, name: str) -> None:
+        if name == "Computer.hdl":
+            return
+        if not name.endswith((".asm", ".hack")):
+            raise Exception("UnsupportedScriptException")
+        simulator = HackSimulator.create(self.load(name), 0)
+        simulator.start()
+        simulator.stops = simulator.program.stops(halts=False)
+        self.simulator = simulator
+
+    def advance(self, cycles: int) -> None:
+        self.time += cycles
+        if self.reset:
+            for _ in range(cycles):
+                self.execute(1)
+                self.machine.pc = 0
+        else:
+            self.execute(cycles)
+
+    def execute(self, cycles: int) -> None:
+        simulator = self.machine
+        while cycles > 0:
+            simulator.cycles = cycles
+            simulator.run_engine()
+            cycles = simulator.cycles
+            if cycles > 0:
+                steps = min(cycles, PC_SPACE - simulator.pc)
+                simulator.a_register = 0
+                simulator.pc = (simulator.pc + steps) & WORD_MASK
+                cycles -= steps
+
+    @property
+    def machine(self) -> HackSimulator:
+        if self.simulator is None:
+            raise Exception("ProgramNotLoadedException")
+        return self.simulator
+
+    def locate(self, variable: str) -> Tuple[str, Optional[int]]:
+        match = VARIABLE.match(variable)
+        if match is None:
+            raise Exception("UnsupportedScriptException")
+        name, index = match.groups()
+        if name in MEMORIES:
+            if not index:
+                raise Exception("UnsupportedScriptException")
+            return name, int(index)
+        if name in REGISTERS or name in ("reset", "time"):
+            return name, None
+        raise Exception("UnsupportedScriptException")
+
+    def assign(self, variable: str, value: int) -> None:
+        name, index = self.locate(variable)
+        if index is not None:
+            self.machine.ram_states.assign(index, value)
+        elif name == "reset":
+            self.reset = value
+        elif name in REGISTERS:
+            setattr(self.machine, REGISTERS[name], value)
+        else:
+            raise Exception("UnsupportedScriptException")
+
+    def value(self, variable: str) -> int:
+        name, index = self.locate(variable)
+        if index is not None:
+            return self.machine.ram_states.get(index)
+        if name == "reset":
+            return self.reset
+        return getattr(self.machine, REGISTERS[name])
+
+    def output(self, column: OutputColumn) -> str:
+        if column.variable == "time":
+            return column.format(f"{self.time}{'+' if self.ticked else ''}")
+        value = self.value(column.variable) & WORD_MASK
+        if column.base == "D":
+            text = str(value - (value & SIGN_BIT) * 2)
+        elif column.base == "X":
+            text = f"{value:04X}"
+        else:
+            text = f"{value:016b}"
+        return column.format(text)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from n2t.core.hack_simulator.entities import RAM_SIZE, Ram
+
+SHARED_HEADER = struct.Struct("<4sHHHHQQ")
+SHARED_MAGIC = b"HSHM"
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = SHARED_HEADER.size - SEQUENCE.size
+SHARED_SIZE = SHARED_HEADER.size + 2 * RAM_SIZE
+PUBLISH_EVERY = 1 << 14
+
+STATE_FINISHED = 0
+STATE_RUNNING = 1
+
+
+@dataclass(frozen=True)
+class SharedState:
+    pc: int
+    a_register: int
+    d_register: int
+    running: bool
+    clock: int
+    sequence: int
+
+
+class SharedRam(Ram):
+    def __init__(self, memory: SharedMemory, owner: bool = False) -> None:
+        self.memory = memory
+        self.owner = owner
+        self.registers = memory.buf[SHARED_HEADER.size : SHARED_SIZE].cast("H")
+        self.written = bytearray(RAM_SIZE)
+        self.sequence = 0
+
+    @classmethod
+    def create(cls, name: Optional[str] = None) -> SharedRam:
+        ram = cls(SharedMemory(name, create=True, size=SHARED_SIZE), owner=True)
+        ram.publish(0, 0, 0, 0)
+        return ram
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def publish(
+        self, pc: int, a_register: int, d_register: int, clock: int, running=True
+    ) -> None:
+        buffer = self.memory.buf
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, self.sequence + 1)
+        state = STATE_RUNNING if running else STATE_FINISHED
+        self.sequence += 2
+        SHARED_HEADER.pack_into(
+            buffer,
+            0,
+            SHARED_MAGIC,
+            pc,
+            a_register,
+            d_register,
+            state,
+            clock,
+            self.sequence,
+        )
+
+    def close(self) -> None:
+        self.registers.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class SharedRamReader:
+    def __init__(self, name: str) -> None:
+        self.memory = SharedMemory(name)
+        # Attaching registers the segment with this process's resource tracker,
+        # which would unlink it on exit even though the simulator owns it.
+        resource_tracker.unregister(self.memory._name, "shared_memory")  # type: ignore
+        self.view = self.memory.buf.toreadonly()
+        self.header = self.view[: SHARED_HEADER.size]
+        self.registers = self.view[SHARED_HEADER.size : SHARED_SIZE].cast("H")
+        if bytes(self.header[:4]) != SHARED_MAGIC:
+            self.close()
+            raise Exception("InvalidSharedRamException")
+
+    def state(self) -> SharedState:
+        while True:
+            (before,) = SEQUENCE.unpack_from(self.header, SEQUENCE_OFFSET)
+            _, pc, a_register, d_register, state, clock, _ = SHARED_HEADER.unpack_from(
+                self.header
+            )
+            (after,) = SEQUENCE.unpack_from(self.header, SEQUENCE_OFFSET)
+            if before % 2 == 0 and before == after:
+                running = state == STATE_RUNNING
+                return SharedState(pc, a_register, d_register, running, clock, after)
+
+    def get(self, address: int) -> int:
+        return self.registers[address % RAM_SIZE]
+
+    def close(self) -> None:
+        self.registers.release()
+        self.header.release()
+        self.view.release()
+        self.memory.close()
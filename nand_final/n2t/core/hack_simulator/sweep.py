@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from n2t.core.hack_simulator.entities import ExitReason, RamSeed
+from n2t.core.hack_simulator.facade import HackSimulator
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    index: int
+    cycles: int
+    exit_reason: ExitReason
+    entries: List[Tuple[int, int]]
+
+
+class Sweep:
+    def __init__(self, simulator: HackSimulator) -> None:
+        self.simulator = simulator
+        self.budget = simulator.cycles
+        simulator.start()
+        self.base = simulator.ram_states.copy()
+        self.state = (
+            simulator.pc,
+            simulator.a_register,
+            simulator.d_register,
+            simulator.clock,
+        )
+
+    def run(
+        self,
+        seeds: Iterable[RamSeed],
+        ranges: Optional[Sequence[Tuple[int, int]]] = None,
+        changed_only: bool = False,
+    ) -> Iterator[SweepResult]:
+        simulator = self.simulator
+        ram = simulator.ram_states
+        for index, seed in enumerate(seeds):
+            ram.overwrite(self.base)
+            seed.apply(ram)
+            simulator.initial_registers[:] = ram.registers
+            (
+                simulator.pc,
+                simulator.a_register,
+                simulator.d_register,
+                simulator.clock,
+            ) = self.state
+            simulator.cycles = self.budget
+            simulator.run_engine()
+            simulator.finish(self.budget)
+            yield SweepResult(
+                index,
+                simulator.executed,
+                simulator.exit_reason,
+                list(simulator.dump(ranges, changed_only)),
+            )
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import struct
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from n2t.core.hack_simulator.entities import Snapshot
+
+TraceRecord = Tuple[int, int, int, int, int, int]
+
+DELTA_CLOCK = 0b00001
+DELTA_PC = 0b00010
+DELTA_A = 0b00100
+DELTA_D = 0b01000
+DELTA_WRITE = 0b10000
+
+
+class Trace:
+    header = struct.Struct("<4sH")
+    segment = struct.Struct("<III")
+    record = struct.Struct("<QHHHHH")
+    magic = b"HTRC"
+    version = 1
+    no_write = 0xFFFF
+
+    def __init__(
+        self,
+        capacity: int = 1 << 16,
+        on_spill: Optional[Callable[[bytes], None]] = None,
+    ) -> None:
+        if capacity < 2 or capacity % 2:
+            raise Exception("InvalidTraceCapacityException")
+        self.capacity = capacity
+        self.half = capacity // 2
+        self.buffer = bytearray(capacity * self.record.size)
+        self.count = 0
+        self.keyframes: Deque[Tuple[int, Snapshot]] = deque(maxlen=2)
+        self.on_spill = on_spill
+
+    @property
+    def offset(self) -> int:
+        return self.count % self.capacity * self.record.size
+
+    def due(self) -> bool:
+        if self.count % self.half:
+            return False
+        return not self.keyframes or self.keyframes[-1][0] != self.count
+
+    def until_boundary(self) -> int:
+        return self.half - self.count % self.half
+
+    def keyframe(self, snapshot: Snapshot) -> None:
+        self.flush()
+        self.keyframes.append((self.count, snapshot))
+
+    def flush(self) -> None:
+        if self.on_spill is not None and self.keyframes:
+            self.on_spill(self.spill(self.keyframes[-1]))
+
+    def records(self, start: int, end: Optional[int] = None) -> Iterator[TraceRecord]:
+        if start < self.count - self.capacity:
+            raise Exception("TraceOverwrittenException")
+        size = self.record.size
+        for index in range(start, self.count if end is None else end):
+            yield self.record.unpack_from(self.buffer, index % self.capacity * size)
+
+    def spill(self, keyframe: Tuple[int, Snapshot], end: Optional[int] = None) -> bytes:
+        start, snapshot = keyframe
+        end = self.count if end is None else end
+        state = snapshot.to_bytes()
+        deltas = self.encode(snapshot, self.records(start, end))
+        return self.segment.pack(len(state), end - start, len(deltas)) + state + deltas
+
+    def to_bytes(self) -> bytes:
+        # Keyframes also mark state changes outside the records, such as
+        # keystrokes, so each one starts its own segment.
+        keyframes = list(self.keyframes)
+        ends = [start for start, _ in keyframes[1:]] + [self.count]
+        segments = (self.spill(keyframe, end) for keyframe, end in zip(keyframes, ends))
+        return self.file_header() + b"".join(segments)
+
+    @classmethod
+    def file_header(cls) -> bytes:
+        return cls.header.pack(cls.magic, cls.version)
+
+    @classmethod
+    def encode(cls, snapshot: Snapshot, records: Iterator[TraceRecord]) -> bytes:
+        word = struct.Struct("<H")
+        clock = struct.Struct("<Q")
+        data = bytearray()
+        last = (snapshot.clock, snapshot.pc, snapshot.a_register, snapshot.d_register)
+        for cycle, pc, a_register, d_register, address, value in records:
+            flags = 0
+            fields = bytearray()
+            if cycle != last[0] + 1:
+                flags |= DELTA_CLOCK
+                fields += clock.pack(cycle)
+            if pc != last[1] + 1:
+                flags |= DELTA_PC
+                fields += word.pack(pc)
+            if a_register != last[2]:
+                flags |= DELTA_A
+                fields += word.pack(a_register)
+            if d_register != last[3]:
+                flags |= DELTA_D
+                fields += word.pack(d_register)
+            if address != cls.no_write:
+                flags |= DELTA_WRITE
+                fields += word.pack(address) + word.pack(value)
+            data.append(flags)
+            data += fields
+            last = (cycle, pc, a_register, d_register)
+        return bytes(data)
+
+
+class TraceReplay:
+    def __init__(self, data: bytes) -> None:
+        magic, version = Trace.header.unpack_from(data)
+        if magic != Trace.magic or version != Trace.version:
+            raise Exception("InvalidTraceException")
+        self.segments: List[Tuple[Snapshot, int, bytes]] = []
+        offset = Trace.header.size
+        while offset < len(data):
+            state_size, count, deltas_size = Trace.segment.unpack_from(data, offset)
+            offset += Trace.segment.size
+            snapshot = Snapshot.from_bytes(data[offset : offset + state_size])
+            offset += state_size
+            self.segments.append((snapshot, count, data[offset : offset + deltas_size]))
+            offset += deltas_size
+
+    @property
+    def first_cycle(self) -> int:
+        return self.segments[0][0].clock
+
+    @property
+    def last_cycle(self) -> int:
+        last = self.segments[-1][0].clock
+        for record in self.decode(*self.segments[-1]):
+            last = record[0]
+        return last
+
+    def state_at(self, cycle: int) -> Snapshot:
+        # A segment starting exactly at cycle may already include an input
+        # applied after that cycle, so prefer the segment that ends there.
+        candidates = [
+            segment for segment in self.segments if segment[0].clock < cycle
+        ] or [segment for segment in self.segments if segment[0].clock == cycle][:1]
+        if not candidates:
+            raise Exception("TraceCycleOutOfRangeException")
+        snapshot, count, deltas = candidates[-1]
+        ram = snapshot.ram.copy()
+        state = (snapshot.clock, snapshot.pc, snapshot.a_register, snapshot.d_register)
+        for clock, pc, a_register, d_register, address, value in self.decode(
+            snapshot, count, deltas
+        ):
+            if clock > cycle:
+                break
+            if address != Trace.no_write:
+                ram.assign(address, value)
+            state = (clock, pc, a_register, d_register)
+        if state[0] != cycle:
+            raise Exception("TraceCycleOutOfRangeException")
+        clock, pc, a_register, d_register = state
+        return Snapshot(pc, a_register, d_register, clock, snapshot.program_digest, ram)
+
+    @staticmethod
+    def decode(snapshot: Snapshot, count: int, deltas: bytes) -> Iterator[TraceRecord]:
+        word = struct.Struct("<H")
+        clock_field = struct.Struct("<Q")
+        clock, pc = snapshot.clock, snapshot.pc
+        a_register, d_register = snapshot.a_register, snapshot.d_register
+        offset = 0
+        for _ in range(count):
+            flags = deltas[offset]
+            offset += 1
+            clock += 1
+            pc += 1
+            address, value = Trace.no_write, 0
+            if flags & DELTA_CLOCK:
+                (clock,) = clock_field.unpack_from(deltas, offset)
+                offset += clock_field.size
+            if flags & DELTA_PC:
+                (pc,) = word.unpack_from(deltas, offset)
+                offset += word.size
+            if flags & DELTA_A:
+                (a_register,) = word.unpack_from(deltas, offset)
+                offset += word.size
+            if flags & DELTA_D:
+                (d_register,) = word.unpack_from(deltas, offset)
+                offset += word.size
+            if flags & DELTA_WRITE:
+                address, value = struct.unpack_from("<HH", deltas, offset)
+                offset += 2 * word.size
+            yield clock, pc, a_register, d_register, address, value
@@ -1,5 +1,18 @@
-from n2t.infra.asm import AsmProgram
-from n2t.infra.hack import HackProgram
+from n2t.infra.asm import AsmBatch, AsmProgram
+from n2t.infra.binary import HackBinary
+from n2t.infra.hack import DumpFormat, HackBatch, HackProgram, HackTrace
 from n2t.infra.io import FileFormat
+from n2t.infra.script import HackScript, ScriptBatch
 
-__all__ = ["FileFormat", "HackProgram", "AsmProgram"]
+__all__ = [
+    "DumpFormat",
+    "FileFormat",
+    "HackBatch",
+    "HackBinary",
+    "HackProgram",
+    "HackTrace",
+    "HackScript",
+    "ScriptBatch",
+    "AsmBatch",
+    "AsmProgram",
+]
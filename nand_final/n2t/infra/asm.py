@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol
 
 from n2t.core import Assembler as DefaultAssembler
+from n2t.core.assembler import IncrementalAssembler, SourceMap, StreamingAssembler
+from n2t.core.assembler.entities import AssemblyCache, SymbolsTable
+from n2t.core.assembler.facade import WORD_WIDTH
+from n2t.core.hack_simulator import HackObject
+from n2t.infra.binary import HackBinary
 from n2t.infra.io import File, FileFormat
 
 
@@ -12,22 +19,120 @@ from n2t.infra.io import File, FileFormat
 class AsmProgram:
     path: Path
     assembler: Assembler = field(default_factory=DefaultAssembler.create)
+    binary: bool = False
+    source_map: bool = False
 
     @classmethod
-    def load_from(cls, file_name: str) -> AsmProgram:
-        return cls(Path(file_name))
+    def load_from(
+        cls,
+        file_name: str,
+        streaming: bool = False,
+        binary: bool = False,
+        source_map: bool = False,
+        incremental: bool = False,
+    ) -> AsmProgram:
+        if incremental:
+            assembler = IncrementalAssembler.create(load_cache(Path(file_name)))
+            return cls(Path(file_name), assembler, binary, source_map)
+        if streaming:
+            return cls(Path(file_name), StreamingAssembler.create(), binary, source_map)
+        return cls(Path(file_name), binary=binary, source_map=source_map)
 
     def __post_init__(self) -> None:
         FileFormat.asm.validate(self.path)
 
     def assemble(self) -> None:
+        source_map = b""
+        if self.source_map:
+            source_map = SourceMap.from_assembly(self, self.path.name).to_bytes()
+            File(FileFormat.source_map.convert(self.path)).save_bytes(source_map)
+        if self.binary:
+            binary = HackBinary(FileFormat.hackbin.convert(self.path))
+            words = self.assemble_words()
+            binary.save(HackObject(words, self.symbols(), source_map))
+        else:
+            self.save_text()
+        if isinstance(self.assembler, IncrementalAssembler):
+            cache_file = File(FileFormat.assembly_cache.convert(self.path))
+            cache_file.save_bytes(self.assembler.cache.to_bytes())
+
+    def save_text(self) -> None:
         hack_file = File(FileFormat.hack.convert(self.path))
         hack_file.save(self.assembler.assemble(self))
+        if isinstance(self.assembler, StreamingAssembler):
+            line = WORD_WIDTH + 1
+            hack_file.patch(
+                (address * line, word.encode())
+                for address, word in self.assembler.resolve()
+            )
+
+    def assemble_words(self) -> array:
+        if isinstance(self.assembler, (StreamingAssembler, IncrementalAssembler)):
+            return self.assembler.assemble_words(self)
+        return array("H", (int(word, 2) for word in self.assembler.assemble(self)))
+
+    def symbols(self) -> Dict[str, int]:
+        return dict(self.assembler.symb_table.symbols_map.maps[0])
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()
 
 
+@dataclass(frozen=True)
+class AssemblyResult:
+    path: Path
+    error: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.error or 'assembled'}"
+
+
+@dataclass
+class AsmBatch:
+    programs: List[AsmProgram]
+    jobs: Optional[int] = None
+
+    @classmethod
+    def load_from(
+        cls,
+        root: str,
+        jobs: Optional[int] = None,
+        streaming: bool = False,
+        binary: bool = False,
+        source_map: bool = False,
+        incremental: bool = False,
+    ) -> AsmBatch:
+        paths = sorted(Path(root).rglob(f"*{FileFormat.asm.value}"))
+        programs = [
+            AsmProgram.load_from(str(path), streaming, binary, source_map, incremental)
+            for path in paths
+        ]
+        return cls(programs, jobs)
+
+    def assemble(self) -> List[AssemblyResult]:
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(assemble_program, self.programs))
+
+
+def load_cache(path: Path) -> Optional[AssemblyCache]:
+    try:
+        return AssemblyCache.from_bytes(
+            File(FileFormat.assembly_cache.convert(path)).load_bytes()
+        )
+    except Exception:
+        return None
+
+
+def assemble_program(program: AsmProgram) -> AssemblyResult:
+    try:
+        program.assemble()
+    except Exception as error:
+        return AssemblyResult(program.path, str(error) or type(error).__name__)
+    return AssemblyResult(program.path)
+
+
 class Assembler(Protocol):  # pragma: no cover
+    symb_table: SymbolsTable
+
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
         pass
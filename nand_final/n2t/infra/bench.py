@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine
+from n2t.core.hack_simulator.entities import Program
+from n2t.infra.hack import HackProgram, collect_programs
+from n2t.infra.io import File, FileFormat
+from n2t.infra.synthetic import SYNTHETIC
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+PROJECT_PROGRAMS = ["05/Add.hack", "05/Max.hack", "05/Rect.hack"]
+PROJECT_PATTERNS = ["06/*/*", "09/**/*", "10/**/*", "11/**/*"]
+
+DEFAULT_THRESHOLD = 0.1
+STARTUP_TOLERANCE = 0.001
+RSS_TOLERANCE = 1024
+MIN_THROUGHPUT_CYCLES = 10000
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    cycles: int
+    cycles_per_second: float
+    startup_seconds: float
+    peak_rss_kb: int
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'benchmark':40s} {'cycles/s':>14s} {'startup ms':>10s} {'RSS KB':>10s}"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:40s} {self.cycles_per_second:14.0f} "
+            f"{1000 * self.startup_seconds:10.2f} {self.peak_rss_kb:10d}"
+        )
+
+    @classmethod
+    def from_dict(cls, name: str, result: dict) -> BenchmarkResult:
+        return cls(
+            name,
+            result["cycles"],
+            result["cycles_per_second"],
+            result["startup_seconds"],
+            result["peak_rss_kb"],
+        )
+
+    def regressions(self, baseline: BenchmarkResult, threshold: float) -> List[str]:
+        regressions = []
+        if (
+            baseline.cycles >= MIN_THROUGHPUT_CYCLES
+            and self.cycles_per_second < baseline.cycles_per_second * (1 - threshold)
+        ):
+            regressions.append(
+                f"{self.name}: {self.cycles_per_second:.0f} cycles/s, "
+                f"baseline {baseline.cycles_per_second:.0f}"
+            )
+        limit = baseline.startup_seconds * (1 + threshold) + STARTUP_TOLERANCE
+        if self.startup_seconds > limit:
+            regressions.append(
+                f"{self.name}: {1000 * self.startup_seconds:.2f}ms startup, "
+                f"baseline {1000 * baseline.startup_seconds:.2f}ms"
+            )
+        if self.peak_rss_kb > baseline.peak_rss_kb * (1 + threshold) + RSS_TOLERANCE:
+            regressions.append(
+                f"{self.name}: {self.peak_rss_kb}KB peak RSS, "
+                f"baseline {baseline.peak_rss_kb}KB"
+            )
+        return regressions
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    path: Optional[Path] = None
+
+    def load(self) -> List[str]:
+        if self.path is not None:
+            return list(HackProgram(self.path, 0).load())
+        return list(Assembler.create().assemble(SYNTHETIC[self.name]()))
+
+    def measure(self, cycles: int, engine: Engine, repeat: int) -> BenchmarkResult:
+        startup = float("inf")
+        throughput = 0.0
+        executed = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            sim = HackSimulator.create(Program.decode(self.load()), cycles, engine)
+            sim.start()
+            startup = min(startup, time.perf_counter() - started)
+            sim.execute()
+            throughput = max(throughput, sim.instructions_per_second)
+            executed = sim.executed
+        return BenchmarkResult(self.name, executed, throughput, startup, peak_rss())
+
+
+def peak_rss() -> int:
+    if resource is None:  # pragma: no cover
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@dataclass
+class BenchmarkSuite:
+    cases: List[BenchmarkCase]
+    cycles: int = 1000000
+    engine: Engine = Engine.interpreter
+    repeat: int = 3
+
+    @classmethod
+    def load_from(
+        cls,
+        projects: str,
+        cycles: int = 1000000,
+        engine: Engine = Engine.interpreter,
+        repeat: int = 3,
+    ) -> BenchmarkSuite:
+        root = Path(projects)
+        paths = [root / name for name in PROJECT_PROGRAMS]
+        for pattern in PROJECT_PATTERNS:
+            paths.extend(collect_programs(str(root / pattern)))
+        cases = [
+            BenchmarkCase(path.relative_to(root).as_posix(), path)
+            for path in paths
+            if path.is_file()
+        ]
+        cases.extend(BenchmarkCase(name) for name in SYNTHETIC)
+        return cls(cases, cycles, engine, repeat)
+
+    def run(self) -> Iterable[BenchmarkResult]:
+        for case in self.cases:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                yield pool.submit(
+                    case.measure, self.cycles, self.engine, self.repeat
+                ).result()
+
+    @staticmethod
+    def load_baseline(path: Path) -> Dict[str, BenchmarkResult]:
+        FileFormat.json.validate(path)
+        with path.open() as file:
+            cases = json.load(file)["cases"]
+        return {
+            name: BenchmarkResult.from_dict(name, result)
+            for name, result in cases.items()
+        }
+
+    @staticmethod
+    def save_baseline(path: Path, results: Iterable[BenchmarkResult]) -> None:
+        cases = {}
+        for result in results:
+            fields = asdict(result)
+            del fields["name"]
+            cases[result.name] = fields
+        File(path).save([json.dumps({"cases": cases}, indent=3)])
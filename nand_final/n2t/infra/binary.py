@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from n2t.core.hack_simulator import HackObject
+from n2t.infra.io import File, FileFormat
+
+
+@dataclass
+class HackBinary:
+    path: Path
+
+    @classmethod
+    def load_from(cls, file_name: str) -> HackBinary:
+        return cls(Path(file_name))
+
+    def __post_init__(self) -> None:
+        FileFormat.hackbin.validate(self.path)
+
+    def load(self) -> HackObject:
+        with File(self.path).mapped() as data:
+            return HackObject.from_bytes(data)
+
+    def save(self, hack_object: HackObject) -> None:
+        File(self.path).save_bytes(hack_object.to_bytes())
+
+    def to_text(self) -> Path:
+        hack_path = FileFormat.hack.convert(self.path)
+        File(hack_path).save(self.load().to_text())
+        return hack_path
+
+    @classmethod
+    def from_text(cls, file_name: str) -> HackBinary:
+        hack_path = Path(file_name)
+        FileFormat.hack.validate(hack_path)
+        binary = cls(FileFormat.hackbin.convert(hack_path))
+        binary.save(HackObject.from_text(File(hack_path).load()))
+        return binary
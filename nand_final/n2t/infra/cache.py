@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from n2t.core.hack_simulator import ExitReason
+from n2t.infra.io import File, FileFormat
+
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    header = struct.Struct("<4sBQdI")
+    magic = b"HRS2"
+
+    cycles: int
+    exit_reason: ExitReason
+    seconds: float
+    payload: bytes
+
+    def to_bytes(self) -> bytes:
+        reason = list(ExitReason).index(self.exit_reason)
+        header = self.header.pack(
+            self.magic, reason, self.cycles, self.seconds, len(self.payload)
+        )
+        return header + self.payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CachedResult:
+        magic, reason, cycles, seconds, size = cls.header.unpack_from(data)
+        if magic != cls.magic or len(data) != cls.header.size + size:
+            raise Exception("InvalidCacheEntryException")
+        exit_reason = list(ExitReason)[reason]
+        return cls(cycles, exit_reason, seconds, data[cls.header.size :])
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    size: int
+
+    def __str__(self) -> str:
+        return f"{self.entries} entries, {self.size} bytes"
+
+
+@dataclass(frozen=True)
+class ResultCache:
+    root: Path
+    max_size: int = DEFAULT_CACHE_SIZE
+
+    @staticmethod
+    def key(parts: Iterable[bytes]) -> str:
+        sha = hashlib.sha256()
+        for part in parts:
+            sha.update(struct.pack("<Q", len(part)))
+            sha.update(part)
+        return sha.hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return FileFormat.result.convert(self.root / key)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        path = self.entry(key)
+        try:
+            result = CachedResult.from_bytes(File(path).load_bytes())
+            os.utime(path)
+        except Exception:
+            return None
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        File(self.entry(key)).save_bytes(result.to_bytes())
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob(f"*{FileFormat.result.value}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self) -> None:
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+    def stats(self) -> CacheStats:
+        entries = self.entries()
+        return CacheStats(len(entries), sum(size for _, size, _ in entries))
+
+    def clear(self) -> None:
+        for _, _, path in self.entries():
+            path.unlink(missing_ok=True)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, List
+
+from n2t.core import HackSimulator
+from n2t.core.hack_simulator.debugger import Debugger
+from n2t.core.hack_simulator.entities import parse_ranges
+from n2t.infra.hack import HackProgram
+
+HELP = [
+    "break <pc|label>           stop before executing the instruction",
+    "delete <pc|label>          remove a breakpoint",
+    "watch <addr[-addr]> [r|w|rw]  stop after an access to RAM",
+    "unwatch <addr[-addr]>      remove watchpoints",
+    "step [n]                   execute n instructions",
+    "continue [cycles]          run until a stop or the cycle budget",
+    "until <pc|label> [cycles]  run to a location",
+    "regs                       show PC, A, D and the cycle count",
+    "ram <ranges>               show RAM, e.g. ram 0-15,256",
+    "quit                       leave the debugger",
+]
+
+
+@dataclass
+class DebugSession:
+    program: HackProgram
+    prompt: Callable[[str], str] = input
+    echo: Callable[[str], None] = print
+
+    def __post_init__(self) -> None:
+        simulator = HackSimulator.create(
+            self.program.load(), self.program.cycles, self.program.engine
+        )
+        self.debugger = Debugger(simulator, self.program.labels())
+
+    def run(self) -> None:
+        while True:
+            try:
+                line = self.prompt("(hack) ").split()
+            except EOFError:
+                return
+            if not line:
+                continue
+            if line[0] in ("quit", "q"):
+                return
+            try:
+                for output in self.dispatch(line[0], line[1:]):
+                    self.echo(output)
+            except (ValueError, IndexError, KeyError) as error:
+                self.echo(f"error: {error}")
+
+    def dispatch(self, command: str, args: List[str]) -> Iterable[str]:
+        debugger = self.debugger
+        cycles = self.program.cycles
+        if command in ("break", "b"):
+            yield f"breakpoint at pc {debugger.add_breakpoint(args[0])}"
+        elif command in ("delete", "d"):
+            yield f"deleted breakpoint at pc {debugger.remove_breakpoint(args[0])}"
+        elif command in ("watch", "w"):
+            access = args[1] if len(args) > 1 else "w"
+            for start, end in parse_ranges(args[0]):
+                debugger.watch(start, end, "r" in access, "w" in access)
+            yield f"watching {args[0]} for {access}"
+        elif command == "unwatch":
+            for start, end in parse_ranges(args[0]):
+                debugger.unwatch(start, end)
+            yield f"unwatched {args[0]}"
+        elif command in ("step", "s"):
+            yield str(debugger.step(int(args[0]) if args else 1))
+        elif command in ("continue", "c"):
+            yield str(debugger.run(int(args[0]) if args else cycles))
+        elif command in ("until", "u"):
+            budget = int(args[1]) if len(args) > 1 else cycles
+            yield str(debugger.run_until(args[0], budget))
+        elif command in ("regs", "r"):
+            simulator = debugger.simulator
+            yield (
+                f"PC={simulator.pc} A={simulator.a_register} "
+                f"D={simulator.d_register} cycle={simulator.clock}"
+            )
+        elif command == "ram":
+            ram = debugger.simulator.ram_states
+            for start, end in parse_ranges(args[0]):
+                for address in range(start, end + 1):
+                    yield f"RAM[{address}] = {ram.get(address)}"
+        else:
+            yield from HELP
@@ -1,30 +1,550 @@
 from __future__ import annotations
 
+import csv
+import glob
+import json
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from n2t.core import Assembler, HackSimulator
+from n2t.core.assembler import SourceMap
+from n2t.core.assembler.entities import SourceLine, Validator
+from n2t.core.hack_simulator import Engine, ExitReason, HackObject, Snapshot
+from n2t.core.hack_simulator.batch import BatchSimulator
+from n2t.core.hack_simulator.entities import (
+    Program,
+    RamSeed,
+    parse_address,
+    parse_ranges,
+)
+from n2t.core.hack_simulator.hypercalls import Intercepts
+from n2t.core.hack_simulator.keyboard import KeyboardSchedule
+from n2t.core.hack_simulator.screen import Framebuffer
+from n2t.core.hack_simulator.sweep import Sweep, SweepResult
+from n2t.core.hack_simulator.trace import Trace, TraceReplay
+from n2t.infra.binary import HackBinary
+from n2t.infra.cache import CachedResult, ResultCache
 from n2t.infra.io import File, FileFormat
 
 
+@dataclass(frozen=True)
+class ExecutionSummary:
+    path: Path
+    cycles: int
+    seconds: float
+    exit_reason: str
+    cached: bool = False
+    error: str = ""
+
+    def __str__(self) -> str:
+        if self.error:
+            return f"{self.path}: {self.exit_reason} ({self.error})"
+        text = (
+            f"{self.path}: {self.cycles} cycles, "
+            f"{self.seconds:.3f}s, {self.exit_reason}"
+        )
+        return text + ", cached" if self.cached else text
+
+
+class DumpFormat(Enum):
+    json = "json"
+    binary = "binary"
+
+
 @dataclass
 class HackProgram:
     path: Path
     cycles: int
+    engine: Engine = Engine.interpreter
+    resume: Optional[Path] = None
+    checkpoint_every: int = 0
+    profile: bool = False
+    ranges: Optional[List[Tuple[int, int]]] = None
+    changed_only: bool = False
+    dump_format: DumpFormat = DumpFormat.json
+    screen: bool = False
+    capture_every: int = 0
+    keyboard: Optional[Path] = None
+    trace: int = 0
+    trace_all: bool = False
+    cache: Optional[ResultCache] = None
+    seed: Optional[Path] = None
+    sweep: Optional[Path] = None
+    intercept: bool = False
+    intercept_accounting: bool = False
+    deadline: Optional[float] = None
+    shared_memory: Optional[str] = None
+    lockstep: bool = False
 
     @classmethod
-    def load_from(cls, file_name: str, cycles: int) -> HackProgram:
-        return cls(Path(file_name), cycles)
+    def load_from(
+        cls,
+        file_name: str,
+        cycles: int,
+        engine: Engine = Engine.interpreter,
+        resume: Optional[str] = None,
+        checkpoint_every: int = 0,
+        profile: bool = False,
+        ranges: Optional[str] = None,
+        changed_only: bool = False,
+        dump_format: DumpFormat = DumpFormat.json,
+        screen: bool = False,
+        capture_every: int = 0,
+        keyboard: Optional[str] = None,
+        trace: int = 0,
+        trace_all: bool = False,
+        cache: Optional[ResultCache] = None,
+        seed: Optional[str] = None,
+        sweep: Optional[str] = None,
+        intercept: bool = False,
+        intercept_accounting: bool = False,
+        deadline: Optional[float] = None,
+        shared_memory: Optional[str] = None,
+        lockstep: bool = False,
+    ) -> HackProgram:
+        return cls(
+            Path(file_name),
+            cycles,
+            engine,
+            Path(resume) if resume else None,
+            checkpoint_every,
+            profile,
+            parse_ranges(ranges) if ranges else None,
+            changed_only,
+            dump_format,
+            screen,
+            capture_every,
+            Path(keyboard) if keyboard else None,
+            trace,
+            trace_all,
+            cache,
+            Path(seed) if seed else None,
+            Path(sweep) if sweep else None,
+            intercept,
+            intercept_accounting,
+            deadline,
+            shared_memory,
+            lockstep,
+        )
 
-    def execute(self) -> None:
+    def is_binary(self) -> bool:
+        return self.path.suffix == FileFormat.hackbin.value
+
+    def is_assembly(self) -> bool:
+        if self.is_binary():
+            return False
         try:
             FileFormat.hack.validate(self.path)
-            instructions: Iterable[str] = File(self.path).load()
         except AssertionError:
             FileFormat.asm.validate(self.path)
-            assembly = File(self.path).load()
-            instructions = Assembler.create().assemble(assembly)
-        sim: HackSimulator = HackSimulator.create(instructions, self.cycles)
-        json_file = File(FileFormat.json.convert(self.path))
-        json_file.save(sim.execute())
+            return True
+        return False
+
+    def load(self) -> Iterable[str]:
+        if self.is_binary():
+            return self.load_object().to_text()
+        if self.is_assembly():
+            return Assembler.create().assemble(File(self.path).load())
+        return File(self.path).load()
+
+    def load_object(self) -> HackObject:
+        return HackBinary(self.path).load()
+
+    def load_program(self) -> Program:
+        if self.is_binary():
+            return self.load_object().program()
+        return Program.decode(self.load())
+
+    def sources(self) -> Optional[List[SourceLine]]:
+        if self.is_assembly():
+            return list(Validator().locate(File(self.path).load()))
+        return None
+
+    def labels(self) -> Dict[str, int]:
+        if self.is_assembly():
+            return Validator().labels(File(self.path).load())
+        source_map = self.load_source_map()
+        return source_map.labels() if source_map is not None else {}
+
+    def load_source_map(self) -> Optional[SourceMap]:
+        if self.is_assembly():
+            return SourceMap.from_assembly(File(self.path).load(), self.path.name)
+        map_path = FileFormat.source_map.convert(self.path)
+        if map_path.is_file():
+            with File(map_path).mapped() as data:
+                return SourceMap.from_bytes(data)
+        if self.is_binary():
+            source_map = self.load_object().source_map
+            return SourceMap.from_bytes(source_map) if source_map else None
+        return None
+
+    def symbols(self) -> Dict[str, int]:
+        if self.is_binary():
+            return self.load_object().symbols
+        if not self.is_assembly():
+            return {}
+        assembler = Assembler.create()
+        for _ in assembler.assemble(File(self.path).load()):
+            pass
+        return dict(assembler.symb_table.symbols_map)
+
+    def execute(self) -> ExecutionSummary:
+        start = time.perf_counter()
+        program = self.load_program()
+        if self.sweep is not None:
+            return self.execute_sweep(program, start)
+        key = self.cache_key(program) if self.is_cacheable() else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                File(self.dump_path()).save_bytes(cached.payload)
+                self.save_stats(
+                    cached.cycles, cached.seconds, cached.exit_reason, cached=True
+                )
+                return ExecutionSummary(
+                    self.path,
+                    cached.cycles,
+                    time.perf_counter() - start,
+                    cached.exit_reason.value,
+                    cached=True,
+                )
+        sim: HackSimulator = HackSimulator.create(
+            program,
+            self.cycles,
+            self.engine,
+            self.load_snapshot(),
+            self.checkpoint_every,
+            self.save_snapshot,
+            self.profile,
+            self.capture_every,
+            self.save_frame,
+            self.load_keyboard(),
+            self.create_trace(),
+            self.load_seed(),
+            self.load_intercepts(),
+            self.deadline,
+            self.shared_memory,
+        )
+        try:
+            sim.execute()
+            self.save_outputs(sim, key)
+        finally:
+            sim.close()
+        return ExecutionSummary(
+            self.path,
+            sim.executed,
+            time.perf_counter() - start,
+            sim.exit_reason.value,
+        )
+
+    def save_outputs(self, sim: HackSimulator, key: Optional[str]) -> None:
+        self.save_dump(sim)
+        self.save_stats(sim.executed, sim.seconds, sim.exit_reason)
+        if key is not None:
+            payload = File(self.dump_path()).load_bytes()
+            self.cache.put(
+                key,
+                CachedResult(sim.executed, sim.exit_reason, sim.seconds, payload),
+            )
+        if sim.trace is not None:
+            self.save_trace(sim.trace)
+        if self.screen or self.capture_every > 0:
+            sim.framebuffer.refresh()
+            screen_file = File(FileFormat.pbm.convert(self.path))
+            screen_file.save_bytes(sim.framebuffer.to_pbm())
+        if self.checkpoint_every > 0:
+            self.save_snapshot(sim.snapshot())
+        if self.profile:
+            report = sim.profiler.report(
+                sim.program, self.sources(), source_map=self.load_source_map()
+            )
+            File(FileFormat.profile.convert(self.path)).save(report)
+        if sim.intercepts is not None:
+            hypercalls_file = File(FileFormat.hypercalls.convert(self.path))
+            hypercalls_file.save(sim.intercepts.report())
+
+    def is_cacheable(self) -> bool:
+        return self.cache is not None and not (
+            self.checkpoint_every > 0
+            or self.profile
+            or self.screen
+            or self.capture_every > 0
+            or self.trace > 0
+            or self.sweep is not None
+            or self.intercept
+            or self.intercept_accounting
+            or self.deadline is not None
+            or self.shared_memory is not None
+        )
+
+    def cache_key(self, program: Program) -> str:
+        options = (
+            self.cycles,
+            self.ranges,
+            self.changed_only,
+            self.dump_format.value,
+        )
+        return ResultCache.key(
+            [
+                program.digest(),
+                repr(options).encode(),
+                File(self.resume).load_bytes() if self.resume else b"",
+                File(self.keyboard).load_bytes() if self.keyboard else b"",
+                File(self.seed).load_bytes() if self.seed else b"",
+            ]
+        )
+
+    def execute_sweep(self, program: Program, start: float) -> ExecutionSummary:
+        if self.sweep_conflicts():
+            raise Exception("SweepOptionUnsupportedException")
+        vectors = self.load_sweep()
+        if self.lockstep:
+            results = self.run_lockstep(program, vectors)
+        else:
+            sweep = Sweep(
+                HackSimulator.create(
+                    program,
+                    self.cycles,
+                    self.engine,
+                    self.load_snapshot(),
+                    seed=self.load_seed(),
+                )
+            )
+            results = list(sweep.run(vectors, self.ranges, self.changed_only))
+        report = [
+            {
+                "cycles": result.cycles,
+                "exit_reason": result.exit_reason.value,
+                "RAM": {address: value for address, value in result.entries},
+            }
+            for result in results
+        ]
+        sweep_file = File(FileFormat.json.convert(self.sibling("sweep")))
+        sweep_file.save([json.dumps(report, indent=3)])
+        return ExecutionSummary(
+            self.path,
+            sum(result.cycles for result in results),
+            time.perf_counter() - start,
+            f"sweep of {len(results)} inputs",
+        )
+
+    def run_lockstep(
+        self, program: Program, vectors: List[RamSeed]
+    ) -> List[SweepResult]:
+        batch = BatchSimulator.create(
+            program, self.cycles, len(vectors), self.load_seed(), vectors
+        )
+        batch.execute()
+        machines = self.sibling("machines")
+        machines.mkdir(exist_ok=True)
+        results = []
+        for index, exit_reason in enumerate(batch.exit_reasons):
+            entries = list(batch.dump(index, self.ranges, self.changed_only))
+            dump_file = File(FileFormat.json.convert(machines / str(index)))
+            dump_file.save(HackSimulator.to_json(entries))
+            cycles = int(batch.executed[index])
+            results.append(SweepResult(index, cycles, exit_reason, entries))
+        return results
+
+    def sweep_conflicts(self) -> List[str]:
+        options = {
+            "keyboard": self.keyboard is not None,
+            "intercept": self.intercept,
+            "intercept_accounting": self.intercept_accounting,
+            "profile": self.profile,
+            "trace": self.trace > 0,
+            "deadline": self.deadline is not None,
+            "checkpoint_every": self.checkpoint_every > 0,
+            "screen": self.screen,
+            "capture_every": self.capture_every > 0,
+            "shared_memory": self.shared_memory is not None,
+            "dump_format": self.dump_format != DumpFormat.json,
+            "resume": self.lockstep and self.resume is not None,
+            "engine": self.lockstep and self.engine != Engine.interpreter,
+        }
+        return [option for option, used in options.items() if used]
+
+    def load_snapshot(self) -> Optional[Snapshot]:
+        if self.resume is None:
+            return None
+        FileFormat.snapshot.validate(self.resume)
+        return Snapshot.from_bytes(File(self.resume).load_bytes())
+
+    def load_intercepts(self) -> Optional[Intercepts]:
+        if not (self.intercept or self.intercept_accounting):
+            return None
+        return Intercepts.from_symbols(self.symbols(), self.intercept_accounting)
+
+    def load_seed(self) -> Optional[RamSeed]:
+        if self.seed is None:
+            return None
+        if self.seed.suffix == FileFormat.ram.value:
+            return RamSeed.from_binary(File(self.seed).load_bytes())
+        FileFormat.json.validate(self.seed)
+        with self.seed.open() as file:
+            registers = json.load(file)
+        return RamSeed.from_dict(registers.get("RAM", registers))
+
+    def load_sweep(self) -> List[RamSeed]:
+        with self.sweep.open(newline="") as file:
+            if self.sweep.suffix == FileFormat.csv.value:
+                rows = csv.reader(file)
+                addresses = [parse_address(name) for name in next(rows)]
+                return [
+                    RamSeed.from_items(zip(addresses, map(int, row)))
+                    for row in rows
+                    if row
+                ]
+            FileFormat.json.validate(self.sweep)
+            return [RamSeed.from_dict(vector) for vector in json.load(file)]
+
+    def sibling(self, name: str) -> Path:
+        return self.path.with_name(f"{self.path.stem}_{name}")
+
+    def dump_path(self) -> Path:
+        if self.dump_format == DumpFormat.binary:
+            return FileFormat.ram.convert(self.path)
+        return FileFormat.json.convert(self.path)
+
+    def load_keyboard(self) -> Optional[KeyboardSchedule]:
+        if self.keyboard is None:
+            return None
+        with self.keyboard.open() as file:
+            return KeyboardSchedule.from_list(json.load(file))
+
+    def create_trace(self) -> Optional[Trace]:
+        if self.trace <= 0:
+            return None
+        if not self.trace_all:
+            return Trace(self.trace)
+        trace_file = File(FileFormat.trace.convert(self.path))
+        trace_file.save_bytes(Trace.file_header())
+        return Trace(self.trace, trace_file.append_bytes)
+
+    def save_trace(self, trace: Trace) -> None:
+        if self.trace_all:
+            trace.flush()
+        else:
+            File(FileFormat.trace.convert(self.path)).save_bytes(trace.to_bytes())
+
+    def save_dump(self, sim: HackSimulator) -> None:
+        entries = sim.dump(self.ranges, self.changed_only)
+        if self.dump_format == DumpFormat.binary:
+            File(self.dump_path()).save_bytes(sim.to_binary(entries))
+        else:
+            File(self.dump_path()).save(sim.to_json(entries))
+
+    def save_stats(
+        self, cycles: int, seconds: float, exit_reason: ExitReason, cached: bool = False
+    ) -> None:
+        stats = {
+            "cycles": cycles,
+            "seconds": seconds,
+            "instructions_per_second": cycles / seconds if seconds > 0 else 0.0,
+            "exit_reason": exit_reason.value,
+            "budget": self.cycles,
+            "deadline": self.deadline,
+            "engine": self.engine.value,
+            "cached": cached,
+        }
+        stats_file = File(FileFormat.json.convert(self.sibling("stats")))
+        stats_file.save([json.dumps(stats, indent=3)])
+
+    def save_frame(self, clock: int, framebuffer: Framebuffer) -> None:
+        frames = self.sibling("frames")
+        frames.mkdir(exist_ok=True)
+        frame_file = File(FileFormat.pbm.convert(frames / f"{clock:010d}"))
+        frame_file.save_bytes(framebuffer.to_pbm())
+
+    def save_snapshot(self, snapshot: Snapshot) -> None:
+        File(FileFormat.snapshot.convert(self.path)).save_bytes(snapshot.to_bytes())
+
+
+@dataclass
+class HackTrace:
+    path: Path
+
+    @classmethod
+    def load_from(cls, file_name: str) -> HackTrace:
+        return cls(Path(file_name))
+
+    def replay(self, cycle: int) -> Snapshot:
+        FileFormat.trace.validate(self.path)
+        snapshot = TraceReplay(File(self.path).load_bytes()).state_at(cycle)
+        snapshot_path = self.path.with_name(f"{self.path.stem}_{cycle}")
+        snapshot_file = File(FileFormat.snapshot.convert(snapshot_path))
+        snapshot_file.save_bytes(snapshot.to_bytes())
+        return snapshot
+
+
+@dataclass
+class HackBatch:
+    programs: List[HackProgram]
+    jobs: Optional[int] = None
+
+    @classmethod
+    def load_from(
+        cls,
+        pattern: str,
+        cycles: int,
+        engine: Engine = Engine.interpreter,
+        jobs: Optional[int] = None,
+        budgets: Optional[Dict[str, int]] = None,
+        cache: Optional[ResultCache] = None,
+        deadline: Optional[float] = None,
+    ) -> HackBatch:
+        budgets = budgets or {}
+        programs = [
+            HackProgram(
+                path,
+                budgets.get(path.name, cycles),
+                engine,
+                cache=cache,
+                deadline=deadline,
+            )
+            for path in collect_programs(pattern)
+        ]
+        return cls(programs, jobs)
+
+    @staticmethod
+    def load_budgets(file_name: str) -> Dict[str, int]:
+        with open(file_name) as file:
+            return {name: int(cycles) for name, cycles in json.load(file).items()}
+
+    def execute(self) -> List[ExecutionSummary]:
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [
+                pool.submit(HackProgram.execute, program) for program in self.programs
+            ]
+            return [
+                collect_summary(program, future)
+                for program, future in zip(self.programs, futures)
+            ]
+
+
+def collect_summary(program: HackProgram, future: Future) -> ExecutionSummary:
+    try:
+        return future.result()
+    except Exception as error:
+        message = str(error) or type(error).__name__
+        return ExecutionSummary(program.path, 0, 0.0, "error", error=message)
+
+
+def collect_programs(pattern: str) -> List[Path]:
+    root = Path(pattern)
+    if root.is_dir():
+        candidates = sorted(root.iterdir())
+    else:
+        candidates = sorted(Path(name) for name in glob.glob(pattern, recursive=True))
+
+    programs: Dict[Path, Path] = {}
+    for path in candidates:
+        if path.suffix in (FileFormat.hack.value, FileFormat.hackbin.value):
+            programs[path.with_suffix("")] = path
+        elif path.suffix == FileFormat.asm.value:
+            programs.setdefault(path.with_suffix(""), path)
+    return sorted(programs.values())
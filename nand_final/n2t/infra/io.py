@@ -1,18 +1,33 @@
 from __future__ import annotations
 
 import glob
+import mmap
 import os
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Tuple
 
 
 class FileFormat(Enum):
     hack = ".hack"
+    hackbin = ".hackbin"
     asm = ".asm"
     vm = ".vm"
     json = ".json"
+    snapshot = ".snap"
+    profile = ".profile"
+    ram = ".ram"
+    pbm = ".pbm"
+    trace = ".trace"
+    tst = ".tst"
+    result = ".result"
+    csv = ".csv"
+    hypercalls = ".hypercalls"
+    source_map = ".map"
+    assembly_cache = ".asmcache"
 
     def validate(self, path: Path) -> None:
         assert path.suffix == self.value
@@ -34,6 +49,31 @@ class File:
             for line in lines:
                 file.write(f"{line}\n")
 
+    def load_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    @contextmanager
+    def mapped(self) -> Iterator[mmap.mmap]:
+        with self.path.open("rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    def save_bytes(self, data: bytes) -> None:
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        temporary = self.path.with_name(self.path.name + suffix)
+        temporary.write_bytes(data)
+        os.replace(temporary, self.path)
+
+    def patch(self, records: Iterable[Tuple[int, bytes]]) -> None:
+        with self.path.open("r+b") as file:
+            for offset, data in records:
+                file.seek(offset)
+                file.write(data)
+
+    def append_bytes(self, data: bytes) -> None:
+        with self.path.open("ab") as file:
+            file.write(data)
+
 
 def remove_files(pattern: str) -> None:
     for file in glob.glob(pattern):
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from n2t.core.hack_simulator.script import ScriptRunner, TestScript
+from n2t.infra.hack import HackProgram
+from n2t.infra.io import File, FileFormat
+
+
+class ScriptStatus(Enum):
+    passed = "passed"
+    failed = "failed"
+    unsupported = "unsupported"
+    error = "error"
+
+
+@dataclass(frozen=True)
+class ScriptResult:
+    path: Path
+    status: ScriptStatus
+    message: str = ""
+
+    def __str__(self) -> str:
+        text = f"{self.path}: {self.status.value}"
+        return f"{text} ({self.message})" if self.message else text
+
+
+@dataclass
+class HackScript:
+    path: Path
+
+    @classmethod
+    def load_from(cls, file_name: str) -> HackScript:
+        return cls(Path(file_name))
+
+    def execute(self) -> ScriptResult:
+        FileFormat.tst.validate(self.path)
+        try:
+            script = TestScript.parse(File(self.path).load())
+            lines = ScriptRunner(script, self.load_program).run()
+            message = self.compare(script, lines)
+        except Exception as error:
+            if str(error) == "UnsupportedScriptException":
+                return ScriptResult(self.path, ScriptStatus.unsupported)
+            return ScriptResult(self.path, ScriptStatus.error, str(error))
+        if message is not None:
+            return ScriptResult(self.path, ScriptStatus.failed, message)
+        return ScriptResult(self.path, ScriptStatus.passed)
+
+    def load_program(self, name: str) -> Iterable[str]:
+        return HackProgram(self.path.with_name(name), 0).load()
+
+    def compare(self, script: TestScript, lines: Iterator[str]) -> Optional[str]:
+        output_name = script.setting("output-file")
+        compare_name = script.setting("compare-to")
+        mismatch: List[str] = []
+        expected = None
+        if compare_name is not None:
+            expected = iter(File(self.path.with_name(compare_name)).load())
+
+        def checked() -> Iterator[str]:
+            for number, line in enumerate(lines, start=1):
+                yield line
+                if expected is None:
+                    continue
+                wanted = next(expected, None)
+                if wanted is None or not matches(line, wanted):
+                    mismatch.append(f"comparison failure at line {number}")
+                    return
+            if expected is not None and any(expected):
+                mismatch.append("output ended before the comparison file")
+
+        if output_name is not None:
+            File(self.path.with_name(output_name)).save(checked())
+        else:
+            for _ in checked():
+                pass
+        return mismatch[0] if mismatch else None
+
+
+def matches(line: str, expected: str) -> bool:
+    return len(line) == len(expected) and all(
+        want in ("*", got) for got, want in zip(line, expected)
+    )
+
+
+@dataclass
+class ScriptBatch:
+    scripts: List[HackScript]
+    jobs: Optional[int] = None
+
+    @classmethod
+    def load_from(cls, root: str, jobs: Optional[int] = None) -> ScriptBatch:
+        paths = sorted(Path(root).rglob(f"*{FileFormat.tst.value}"))
+        return cls([HackScript(path) for path in paths], jobs)
+
+    def execute(self) -> List[ScriptResult]:
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(HackScript.execute, self.scripts))
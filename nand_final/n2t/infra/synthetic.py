@@ -0,0 +1,91 @@
+from typing import Callable, Dict, List
+
+
+def tight_loop() -> List[str]:
+    return [
+        "(TIGHT_LOOP)",
+        "@R0",
+        "M=M+1",
+        "@TIGHT_LOOP",
+        "0;JMP",
+    ]
+
+
+def memory_copy(source: int = 1024, target: int = 8192, words: int = 4096) -> List[str]:
+    return [
+        "(COPY_START)",
+        "@R0",
+        "M=0",
+        "(COPY_LOOP)",
+        "@R0",
+        "D=M",
+        f"@{source}",
+        "A=D+A",
+        "D=M",
+        "@R1",
+        "M=D",
+        "@R0",
+        "D=M",
+        f"@{target}",
+        "D=D+A",
+        "@R2",
+        "M=D",
+        "@R1",
+        "D=M",
+        "@R2",
+        "A=M",
+        "M=D",
+        "@R0",
+        "MD=M+1",
+        f"@{words}",
+        "D=D-A",
+        "@COPY_LOOP",
+        "D;JLT",
+        "@COPY_START",
+        "0;JMP",
+    ]
+
+
+def branch_mix() -> List[str]:
+    return [
+        "(BRANCH_LOOP)",
+        "@R0",
+        "M=M+1",
+        "D=M",
+        "@3",
+        "D=D&A",
+        "@BRANCH_ZERO",
+        "D;JEQ",
+        "@R1",
+        "M=M+1",
+        "@BRANCH_SIGN",
+        "0;JMP",
+        "(BRANCH_ZERO)",
+        "@R2",
+        "M=M-1",
+        "(BRANCH_SIGN)",
+        "@R0",
+        "D=M",
+        "@BRANCH_BITS",
+        "D;JLT",
+        "@R3",
+        "M=M+1",
+        "(BRANCH_BITS)",
+        "@R0",
+        "D=M",
+        "@12",
+        "D=D&A",
+        "@BRANCH_LOOP",
+        "D;JNE",
+        "@R4",
+        "M=!M",
+        "@BRANCH_LOOP",
+        "0;JMP",
+    ]
+
+
+SYNTHETIC: Dict[str, Callable[[], List[str]]] = {
+    "tight_loop": tight_loop,
+    "memory_copy": memory_copy,
+    "branch_mix": branch_mix,
+}
@@ -1,6 +1,28 @@
-from typer import Typer, echo
+from pathlib import Path
+from typing import Optional
 
-from n2t.infra import AsmProgram, HackProgram
+from typer import BadParameter, Exit, Typer, echo
+
+from n2t.core.assembler import IncrementalAssembler
+from n2t.core.hack_simulator import Engine
+from n2t.infra import (
+    AsmBatch,
+    AsmProgram,
+    DumpFormat,
+    FileFormat,
+    HackBatch,
+    HackBinary,
+    HackProgram,
+    HackScript,
+    HackTrace,
+    ScriptBatch,
+)
+from n2t.infra.bench import DEFAULT_THRESHOLD, BenchmarkResult, BenchmarkSuite
+from n2t.infra.cache import DEFAULT_CACHE_SIZE, ResultCache
+from n2t.infra.debug import DebugSession
+from n2t.infra.script import ScriptStatus
+
+DEFAULT_CACHE_DIR = str(Path.home() / ".cache" / "n2t")
 
 cli = Typer(
     name="Nand 2 Tetris Software",
@@ -10,14 +32,224 @@ cli = Typer(
 
 
 @cli.command("assemble", no_args_is_help=True)
-def run_assembler(assembly_file: str) -> None:
+def run_assembler(
+    assembly_file: str,
+    streaming: bool = False,
+    binary: bool = False,
+    source_map: bool = False,
+    incremental: bool = False,
+    jobs: Optional[int] = None,
+) -> None:
+    if Path(assembly_file).is_dir():
+        batch = AsmBatch.load_from(
+            assembly_file, jobs, streaming, binary, source_map, incremental
+        )
+        echo(f"Assembling {len(batch.programs)} programs from {assembly_file}")
+        results = batch.assemble()
+        for result in results:
+            echo(str(result))
+        if any(result.error for result in results):
+            raise Exit(1)
+        echo("Done!")
+        return
     echo(f"Assembling {assembly_file}")
-    AsmProgram.load_from(assembly_file).assemble()
+    program = AsmProgram.load_from(
+        assembly_file, streaming, binary, source_map, incremental
+    )
+    program.assemble()
+    if isinstance(program.assembler, IncrementalAssembler):
+        echo(describe_reassembly(program.assembler))
     echo("Done!")
 
 
+def describe_reassembly(assembler: IncrementalAssembler) -> str:
+    if not assembler.full_pass:
+        return f"Re-encoded {assembler.encoded} changed instructions"
+    reason = "layout changed" if assembler.layout_changed else "layout unchanged"
+    return f"Full pass ({reason}), encoded {assembler.encoded} instructions"
+
+
+@cli.command("convert", no_args_is_help=True)
+def run_converter(hack_file: str) -> None:
+    if Path(hack_file).suffix == FileFormat.hackbin.value:
+        converted = HackBinary.load_from(hack_file).to_text()
+    else:
+        converted = HackBinary.from_text(hack_file).path
+    echo(f"Converted {hack_file} to {converted}")
+
+
 @cli.command("execute", no_args_is_help=True)
-def run_simulator(hack_file: str, cycles: int = 10000) -> None:
-    echo(f"Executing {hack_file} with {cycles} cycles")
-    HackProgram.load_from(hack_file, cycles).execute()
+def run_simulator(
+    hack_file: str,
+    cycles: int = 10000,
+    engine: Engine = Engine.interpreter,
+    jobs: Optional[int] = None,
+    budgets: Optional[str] = None,
+    resume: Optional[str] = None,
+    checkpoint_every: int = 0,
+    profile: bool = False,
+    ranges: Optional[str] = None,
+    changed_only: bool = False,
+    dump_format: DumpFormat = DumpFormat.json,
+    screen: bool = False,
+    capture_every: int = 0,
+    keyboard: Optional[str] = None,
+    trace: int = 0,
+    trace_all: bool = False,
+    cache: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_size: int = DEFAULT_CACHE_SIZE // 2**20,
+    seed: Optional[str] = None,
+    sweep: Optional[str] = None,
+    intercept: bool = False,
+    intercept_accounting: bool = False,
+    deadline: Optional[float] = None,
+    shared_memory: Optional[str] = None,
+    lockstep: bool = False,
+) -> None:
+    if lockstep and sweep is None:
+        raise BadParameter("--lockstep needs --sweep")
+    if profile and trace > 0:
+        raise BadParameter("--profile cannot be combined with --trace")
+    if engine == Engine.blocks and (profile or trace > 0):
+        raise BadParameter("--profile and --trace need --engine interpreter")
+    result_cache = None
+    if cache or cache_dir is not None:
+        result_cache = ResultCache(
+            Path(cache_dir or DEFAULT_CACHE_DIR), cache_size * 2**20
+        )
+    if Path(hack_file).is_file():
+        program = HackProgram.load_from(
+            hack_file,
+            cycles,
+            engine=engine,
+            resume=resume,
+            checkpoint_every=checkpoint_every,
+            profile=profile,
+            ranges=ranges,
+            changed_only=changed_only,
+            dump_format=dump_format,
+            screen=screen,
+            capture_every=capture_every,
+            keyboard=keyboard,
+            trace=trace,
+            trace_all=trace_all,
+            cache=result_cache,
+            seed=seed,
+            sweep=sweep,
+            intercept=intercept,
+            intercept_accounting=intercept_accounting,
+            deadline=deadline,
+            shared_memory=shared_memory,
+            lockstep=lockstep,
+        )
+        conflicts = program.sweep_conflicts() if sweep is not None else []
+        if conflicts:
+            options = ", ".join("--" + name.replace("_", "-") for name in conflicts)
+            mode = "--sweep --lockstep" if lockstep else "--sweep"
+            raise BadParameter(f"{options} cannot be combined with {mode}")
+        echo(f"Executing {hack_file} with {cycles} cycles")
+        summary = program.execute()
+        echo(str(summary))
+        echo("Done!")
+        return
+
+    per_file = HackBatch.load_budgets(budgets) if budgets else None
+    batch = HackBatch.load_from(
+        hack_file, cycles, engine, jobs, per_file, result_cache, deadline
+    )
+    echo(f"Executing {len(batch.programs)} programs from {hack_file}")
+    summaries = batch.execute()
+    for summary in summaries:
+        echo(str(summary))
+    if result_cache is not None:
+        hits = sum(summary.cached for summary in summaries)
+        echo(f"Cache: {hits} hits, {len(summaries) - hits} misses")
+    if any(summary.error for summary in summaries):
+        raise Exit(1)
+    echo("Done!")
+
+
+@cli.command("cache")
+def run_cache(cache_dir: str = DEFAULT_CACHE_DIR, clear: bool = False) -> None:
+    cache = ResultCache(Path(cache_dir))
+    if clear:
+        cache.clear()
+    echo(f"{cache_dir}: {cache.stats()}")
+
+
+@cli.command("test", no_args_is_help=True)
+def run_scripts(script: str, jobs: Optional[int] = None) -> None:
+    if Path(script).is_file():
+        results = [HackScript.load_from(script).execute()]
+    else:
+        batch = ScriptBatch.load_from(script, jobs)
+        echo(f"Running {len(batch.scripts)} test scripts from {script}")
+        results = batch.execute()
+    for result in results:
+        echo(str(result))
+    if any(
+        result.status in (ScriptStatus.failed, ScriptStatus.error) for result in results
+    ):
+        raise Exit(1)
+    echo("Done!")
+
+
+@cli.command("replay", no_args_is_help=True)
+def run_replay(trace_file: str, cycle: int) -> None:
+    echo(f"Replaying {trace_file} to cycle {cycle}")
+    snapshot = HackTrace.load_from(trace_file).replay(cycle)
+    echo(
+        f"PC={snapshot.pc} A={snapshot.a_register} "
+        f"D={snapshot.d_register} cycle={snapshot.clock}"
+    )
+    echo("Done!")
+
+
+@cli.command("debug", no_args_is_help=True)
+def run_debugger(
+    hack_file: str,
+    cycles: int = 10000,
+    engine: Engine = Engine.interpreter,
+) -> None:
+    echo(f"Debugging {hack_file}, type help for commands")
+    DebugSession(
+        HackProgram.load_from(hack_file, cycles, engine=engine), echo=echo
+    ).run()
+
+
+@cli.command("bench", no_args_is_help=True)
+def run_benchmarks(
+    projects: str,
+    baseline: str = "bench.json",
+    update: bool = False,
+    threshold: float = DEFAULT_THRESHOLD,
+    cycles: int = 1000000,
+    repeat: int = 3,
+    engine: Engine = Engine.interpreter,
+) -> None:
+    suite = BenchmarkSuite.load_from(projects, cycles, engine, repeat)
+    echo(f"Running {len(suite.cases)} benchmarks from {projects}")
+    echo(BenchmarkResult.header())
+    results = []
+    for result in suite.run():
+        echo(str(result))
+        results.append(result)
+    baseline_path = Path(baseline)
+    if update or not baseline_path.exists():
+        BenchmarkSuite.save_baseline(baseline_path, results)
+        echo(f"Saved baseline to {baseline}")
+        echo("Done!")
+        return
+    previous = BenchmarkSuite.load_baseline(baseline_path)
+    regressions = [
+        regression
+        for result in results
+        if result.name in previous
+        for regression in result.regressions(previous[result.name], threshold)
+    ]
+    for regression in regressions:
+        echo(f"Regression: {regression}")
+    if regressions:
+        raise Exit(1)
     echo("Done!")
@@ -0,0 +1,77 @@
+import shutil
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from n2t.core import Assembler
+from n2t.infra import AsmBatch, AsmProgram
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "programs"
+    shutil.copytree(PROGRAMS, root)
+    return root
+
+
+def two_pass(root: Path) -> Dict[str, str]:
+    return {
+        str(path.relative_to(root)): "".join(
+            f"{word}\n" for word in Assembler.create().assemble(File(path).load())
+        )
+        for path in sorted(root.rglob("*.asm"))
+    }
+
+
+def outputs(root: Path) -> Dict[str, str]:
+    return {
+        str(path.relative_to(root).with_suffix(".asm")): path.read_text()
+        for path in sorted(root.rglob("*.hack"))
+    }
+
+
+def test_symbol_tables_are_not_shared() -> None:
+    labelled = Assembler.create()
+    list(labelled.assemble(File(PROGRAMS / "max" / "Max.asm").load()))
+    fresh = Assembler.create()
+
+    assert labelled.symb_table.is_symbol("OUTPUT_FIRST")
+    assert not fresh.symb_table.is_symbol("OUTPUT_FIRST")
+    assert fresh.symb_table.symbols_map.maps[0] == {}
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_batch_matches_the_two_pass_assembler(
+    tree: Path, jobs: int, streaming: bool
+) -> None:
+    expected = two_pass(tree)
+    results = AsmBatch.load_from(str(tree), jobs, streaming).assemble()
+
+    assert [result.error for result in results] == [""] * len(expected)
+    assert outputs(tree) == expected
+
+
+def test_concurrent_runs_match_sequential_ones(tree: Path) -> None:
+    for path in sorted(tree.rglob("*.asm")):
+        AsmProgram.load_from(str(path)).assemble()
+    sequential = outputs(tree)
+    for path in tree.rglob("*.hack"):
+        path.unlink()
+
+    for _ in range(3):
+        AsmBatch.load_from(str(tree), jobs=8).assemble()
+        assert outputs(tree) == sequential
+
+
+def test_one_bad_program_does_not_stop_the_batch(tree: Path) -> None:
+    (tree / "add" / "Add.asm").write_text("@1\nD=Q\n")
+    results = AsmBatch.load_from(str(tree), jobs=4).assemble()
+
+    failed = [result for result in results if result.error]
+    assert [result.path.name for result in failed] == ["Add.asm"]
+    assert outputs(tree)["max/Max.asm"] == two_pass(PROGRAMS)["max/Max.asm"]
@@ -0,0 +1,102 @@
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator.batch import BatchSimulator
+from n2t.core.hack_simulator.entities import Program, RamSeed
+from n2t.infra import HackProgram
+from n2t.infra.io import File
+
+pytest.importorskip("numpy")
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+CASES = ["max/Max.asm", "max/MaxL.asm", "rect/RectL.asm", "pong/PongL.asm"]
+
+BUDGETS = [0, 1, 17, 200, 5000]
+
+MACHINES = 64
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+def random_seeds(count: int) -> List[RamSeed]:
+    generator = random.Random(count)
+    return [
+        RamSeed.from_dict(
+            {
+                "R0": generator.randrange(-0x8000, 0x10000),
+                "R1": generator.randrange(0, 0x10000),
+                "R2": generator.randrange(0, 0x10000),
+            }
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("cycles", BUDGETS)
+def test_lockstep_matches_hack_simulator(name: str, cycles: int) -> None:
+    program = Program.decode(assemble(name))
+    seeds = random_seeds(MACHINES)
+    base = RamSeed.from_dict({"R3": 5, "16": 2})
+    batch = BatchSimulator.create(program, cycles, MACHINES, base, seeds)
+    batch.execute()
+
+    for machine, seed in enumerate(seeds):
+        expected = HackSimulator.create(program, cycles, seed=base)
+        expected.start()
+        seed.apply(expected.ram_states)
+        expected.initial_registers[:] = expected.ram_states.registers
+        expected.run_engine()
+        expected.finish(cycles)
+
+        assert batch.executed[machine] == expected.executed
+        assert batch.exit_reasons[machine] == expected.exit_reason
+        assert batch.pc[machine] == expected.pc
+        assert batch.a_register[machine] == expected.a_register
+        assert batch.d_register[machine] == expected.d_register
+        assert list(batch.dump(machine)) == list(expected.dump())
+        ranges = [(0, 20), (16384, 16400)]
+        assert list(batch.dump(machine, ranges, changed_only=True)) == list(
+            expected.dump(ranges, changed_only=True)
+        )
+
+
+def test_select_returns_a_register_matrix() -> None:
+    seeds = random_seeds(8)
+    batch = BatchSimulator.create(assemble("max/MaxL.asm"), 100, 8, seeds=seeds)
+    batch.execute()
+
+    matrix = batch.select([0, 1, 2])
+    assert matrix.shape == (8, 3)
+    for row in matrix.tolist():
+        assert row[2] == max(row[0], row[1]) or row[0] >= 0x8000 or row[1] >= 0x8000
+
+
+def test_seed_count_must_match_machines() -> None:
+    with pytest.raises(Exception, match="InvalidRamSeedException"):
+        BatchSimulator.create(assemble("add/Add.asm"), 10, 3, seeds=random_seeds(2))
+
+
+def test_lockstep_sweep_writes_per_machine_dumps(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "max" / "MaxL.asm", tmp_path)
+    vectors = tmp_path / "vectors.json"
+    vectors.write_text(json.dumps([{"R0": 3, "R1": 9}, {"R0": 12, "R1": 4}]))
+    path = str(tmp_path / "MaxL.asm")
+
+    HackProgram.load_from(path, 100, sweep=str(vectors)).execute()
+    expected = (tmp_path / "MaxL_sweep.json").read_text()
+    HackProgram.load_from(path, 100, sweep=str(vectors), lockstep=True).execute()
+
+    assert (tmp_path / "MaxL_sweep.json").read_text() == expected
+    machines = tmp_path / "MaxL_machines"
+    assert json.loads((machines / "0.json").read_text())["RAM"]["2"] == 9
+    assert json.loads((machines / "1.json").read_text())["RAM"]["2"] == 12
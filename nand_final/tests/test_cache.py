@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from n2t.core.hack_simulator import ExitReason
+from n2t.infra import HackBatch, HackProgram
+from n2t.infra.cache import CachedResult, ResultCache
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResultCache:
+    return ResultCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def program(tmp_path: Path) -> Path:
+    shutil.copy(PROGRAMS / "pong" / "Pong.asm", tmp_path)
+    return tmp_path / "Pong.asm"
+
+
+def result(size: int) -> CachedResult:
+    return CachedResult(10, ExitReason.budget, 0.5, bytes(size))
+
+
+def test_cached_result_round_trip() -> None:
+    cached = CachedResult(123, ExitReason.halt, 0.25, b"payload")
+
+    assert CachedResult.from_bytes(cached.to_bytes()) == cached
+    with pytest.raises(Exception, match="InvalidCacheEntryException"):
+        CachedResult.from_bytes(cached.to_bytes()[:-1])
+
+
+def test_corrupt_entries_are_misses(cache: ResultCache) -> None:
+    cache.put("key", result(4))
+    cache.entry("key").write_bytes(b"garbage" * 10)
+
+    assert cache.get("key") is None
+
+
+def test_second_run_is_served_from_the_cache(cache: ResultCache, program: Path) -> None:
+    first = HackProgram.load_from(str(program), 5000, cache=cache).execute()
+    dump = program.with_suffix(".json").read_text()
+    program.with_suffix(".json").unlink()
+    second = HackProgram.load_from(str(program), 5000, cache=cache).execute()
+
+    assert not first.cached
+    assert second.cached
+    assert (second.cycles, second.exit_reason) == (first.cycles, first.exit_reason)
+    assert program.with_suffix(".json").read_text() == dump
+    stats = json.loads(program.with_name("Pong_stats.json").read_text())
+    assert stats["cached"] is True
+    assert stats["cycles"] == 5000
+
+
+def test_inputs_are_part_of_the_key(cache: ResultCache, program: Path) -> None:
+    seed = program.with_name("seed.json")
+    seed.write_text('{"R0": 1}')
+    HackProgram.load_from(str(program), 5000, cache=cache, seed=str(seed)).execute()
+
+    def cached(**options) -> bool:
+        return (
+            HackProgram.load_from(str(program), cache=cache, **options).execute().cached
+        )
+
+    assert cached(cycles=5000, seed=str(seed))
+    assert not cached(cycles=5001, seed=str(seed))
+    assert not cached(cycles=5000)
+    seed.write_text('{"R0": 2}')
+    assert not cached(cycles=5000, seed=str(seed))
+
+
+def test_uncacheable_options_bypass_the_cache(
+    cache: ResultCache, program: Path
+) -> None:
+    HackProgram.load_from(str(program), 5000, cache=cache, profile=True).execute()
+
+    assert cache.stats().entries == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    size = len(result(1000).to_bytes())
+    cache = ResultCache(tmp_path / "cache", max_size=size * 5 // 2)
+    cache.put("a", result(1000))
+    cache.put("b", result(1000))
+    os.utime(cache.entry("a"), (100, 100))
+    os.utime(cache.entry("b"), (200, 200))
+
+    assert cache.get("a") is not None
+    cache.put("c", result(1000))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats().entries == 2
+    assert cache.stats().size == 2 * size
+
+
+def test_clear_removes_every_entry(cache: ResultCache) -> None:
+    cache.put("a", result(10))
+    cache.put("b", result(10))
+    cache.clear()
+
+    assert cache.stats().entries == 0
+
+
+def test_parallel_batches_share_the_cache(cache: ResultCache, tmp_path: Path) -> None:
+    for name in ("max/Max.asm", "pong/Pong.asm", "rect/Rect.asm", "add/Add.asm"):
+        shutil.copy(PROGRAMS / name, tmp_path)
+
+    first = HackBatch.load_from(str(tmp_path), 10000, jobs=4, cache=cache).execute()
+    second = HackBatch.load_from(str(tmp_path), 10000, jobs=4, cache=cache).execute()
+
+    assert not any(summary.cached for summary in first)
+    assert all(summary.cached for summary in second)
+    assert [summary.cycles for summary in second] == [
+        summary.cycles for summary in first
+    ]
+    assert cache.stats().entries == 4
+
+
+def test_programs_with_the_same_code_share_an_entry(
+    cache: ResultCache, tmp_path: Path
+) -> None:
+    shutil.copy(PROGRAMS / "max" / "Max.asm", tmp_path)
+    shutil.copy(PROGRAMS / "max" / "MaxL.asm", tmp_path)
+
+    HackProgram.load_from(str(tmp_path / "Max.asm"), 100, cache=cache).execute()
+    labelled = HackProgram.load_from(str(tmp_path / "MaxL.asm"), 100, cache=cache)
+
+    assert labelled.execute().cached
+    assert (tmp_path / "MaxL.json").read_text() == (tmp_path / "Max.json").read_text()
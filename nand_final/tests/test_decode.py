@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    C_INSTRUCTION,
+    COMP_READS_M,
+    DEST_A,
+    DEST_M,
+    Program,
+)
+from n2t.infra.io import File
+
+FIXTURES = Path(__file__).parent / "e2e" / "json"
+
+GOLDEN = [
+    "06/add/Add.asm",
+    "06/max/Max.asm",
+    "06/max/MaxL.asm",
+    "06/rect/Rect.asm",
+    "06/pong/Pong.asm",
+    "06/pong/PongL.asm",
+    "FibonacciElement.hack",
+]
+
+
+def load(name: str) -> List[str]:
+    lines = File(FIXTURES / name).load()
+    if name.endswith(".hack"):
+        return list(lines)
+    return list(Assembler.create().assemble(lines))
+
+
+@pytest.mark.parametrize("name", GOLDEN)
+def test_decoded_program_reproduces_golden_dump(name: str) -> None:
+    expected = (FIXTURES / name).with_suffix(".json").read_text()
+    dump = HackSimulator.create(load(name), 10000).execute()
+
+    assert "".join(f"{line}\n" for line in dump) == expected
+
+
+def test_decode_splits_instructions_into_fields() -> None:
+    program = Program.decode(Assembler.create().assemble(["@21", "AM=M+1;JGE"]))
+
+    assert list(program.kinds) == [A_INSTRUCTION, C_INSTRUCTION]
+    assert program.constants[0] == 21
+    assert program.comps[1] == COMP_READS_M | 0b110111
+    assert program.dests[1] == DEST_A | DEST_M
+    assert program.jumps[1] == 0b011
+    assert len(program) == 2
+
+
+def test_words_decode_like_text() -> None:
+    instructions = load("06/pong/Pong.asm")
+    text = Program.decode(instructions)
+    words = Program.from_words([int(instruction, 2) for instruction in instructions])
+
+    for table in ("kinds", "comps", "dests", "jumps", "constants"):
+        assert getattr(words, table) == getattr(text, table)
+    assert words.digest() == text.digest()
+
+
+def test_invalid_instruction_is_rejected() -> None:
+    with pytest.raises(Exception, match="InvalidInstructionException"):
+        Program.decode(["2000000000000000"])
@@ -0,0 +1,96 @@
+import json
+import shutil
+from pathlib import Path
+from typing import List
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator.entities import RamSeed, parse_ranges
+from n2t.infra import DumpFormat, HackProgram
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+def run_pong() -> HackSimulator:
+    simulator = HackSimulator.create(assemble("pong/Pong.asm"), 10000)
+    simulator.execute()
+    return simulator
+
+
+def test_ranges_select_written_addresses() -> None:
+    simulator = run_pong()
+    full = dict(simulator.dump())
+    ranges = parse_ranges("0-15,256-300")
+
+    assert ranges == [(0, 15), (256, 300)]
+    assert dict(simulator.dump(ranges)) == {
+        address: value
+        for address, value in full.items()
+        if address <= 15 or 256 <= address <= 300
+    }
+
+
+def test_overlapping_and_reversed_ranges_are_merged() -> None:
+    simulator = run_pong()
+
+    assert list(simulator.dump([(10, 20), (0, 12), (30, 25)])) == list(
+        simulator.dump([(0, 20)])
+    )
+
+
+def test_changed_only_skips_values_equal_to_the_initial_state() -> None:
+    seed = RamSeed.from_dict({"0": 2, "1": 3, "5": 9})
+    instructions = assemble("add/Add.asm")
+    simulator = HackSimulator.create(instructions, 10000, seed=seed)
+    simulator.execute()
+
+    assert dict(simulator.dump()) == {0: 65528, 1: 3, 5: 9}
+    assert dict(simulator.dump(changed_only=True)) == {0: 65528}
+
+
+def test_json_dump_is_streamed() -> None:
+    simulator = run_pong()
+    lines = simulator.to_json(simulator.dump())
+
+    assert iter(lines) is lines
+    assert json.loads("\n".join(lines))["RAM"] == {
+        str(address): value for address, value in simulator.dump()
+    }
+
+
+def test_binary_dump_round_trips_through_a_seed() -> None:
+    simulator = run_pong()
+    seed = RamSeed.from_binary(simulator.to_binary(simulator.dump()))
+    restored = {
+        start + offset: word
+        for start, words in seed.blocks
+        for offset, word in enumerate(words)
+    }
+
+    assert restored == dict(simulator.dump())
+
+
+def test_execute_writes_ranged_changed_and_binary_dumps(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "pong" / "Pong.asm", tmp_path)
+    path = str(tmp_path / "Pong.asm")
+    expected = dict(run_pong().dump([(0, 15)]))
+
+    HackProgram.load_from(path, 10000, ranges="0-15", changed_only=True).execute()
+    dump = json.loads((tmp_path / "Pong.json").read_text())["RAM"]
+    assert dump == {
+        str(address): value for address, value in expected.items() if value != 0
+    }
+
+    HackProgram.load_from(
+        path, 10000, ranges="0-15", dump_format=DumpFormat.binary
+    ).execute()
+    seed = RamSeed.from_binary((tmp_path / "Pong.ram").read_bytes())
+    assert {
+        start + offset: word
+        for start, words in seed.blocks
+        for offset, word in enumerate(words)
+    } == expected
@@ -0,0 +1,48 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+CASES = [
+    "add/Add.asm",
+    "max/Max.asm",
+    "max/MaxL.asm",
+    "rect/Rect.asm",
+    "rect/RectL.asm",
+    "pong/Pong.asm",
+    "pong/PongL.asm",
+]
+
+BUDGETS = [1, 2, 3, 5, 7, 13, 100, 1009, 12345, 100003]
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+def run(instructions: List[str], cycles: int, engine: Engine) -> HackSimulator:
+    simulator = HackSimulator.create(instructions, cycles, engine)
+    simulator.execute()
+    return simulator
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("cycles", BUDGETS)
+def test_blocks_match_interpreter(name: str, cycles: int) -> None:
+    instructions = assemble(name)
+    expected = run(instructions, cycles, Engine.interpreter)
+    actual = run(instructions, cycles, Engine.blocks)
+
+    assert actual.executed == expected.executed
+    assert actual.exit_reason == expected.exit_reason
+    assert actual.pc == expected.pc
+    assert actual.a_register == expected.a_register
+    assert actual.d_register == expected.d_register
+    assert actual.ram_states.registers == expected.ram_states.registers
+    assert actual.ram_states.written == expected.ram_states.written
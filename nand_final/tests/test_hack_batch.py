@@ -0,0 +1,23 @@
+import shutil
+from pathlib import Path
+
+from n2t.infra import HackBatch
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+def test_batch_reports_errors_per_file(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "max" / "MaxL.asm", tmp_path)
+    shutil.copy(PROGRAMS / "add" / "Add.asm", tmp_path)
+    (tmp_path / "Broken.hack").write_text("1111\n")
+
+    summaries = HackBatch.load_from(str(tmp_path), 100, jobs=2).execute()
+
+    by_name = {summary.path.name: summary for summary in summaries}
+    assert sorted(by_name) == ["Add.asm", "Broken.hack", "MaxL.asm"]
+    assert by_name["Broken.hack"].exit_reason == "error"
+    assert by_name["Broken.hack"].error
+    assert by_name["MaxL.asm"].exit_reason == "halt"
+    assert not by_name["MaxL.asm"].error
+    assert (tmp_path / "MaxL.json").exists()
+    assert (tmp_path / "Add.json").exists()
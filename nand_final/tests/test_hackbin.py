@@ -0,0 +1,93 @@
+import shutil
+from array import array
+from pathlib import Path
+from typing import List
+
+import pytest
+from typer.testing import CliRunner
+
+from n2t.core import Assembler
+from n2t.core.hack_simulator import HackObject
+from n2t.core.hack_simulator.entities import Program
+from n2t.infra import AsmProgram, HackBinary, HackProgram
+from n2t.infra.io import File
+from n2t.runner.cli import cli
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+SOURCES = ["add/Add.asm", "max/Max.asm", "rect/Rect.asm", "pong/Pong.asm"]
+
+
+def assemble(path: Path) -> List[str]:
+    return list(Assembler.create().assemble(File(path).load()))
+
+
+@pytest.fixture(params=SOURCES)
+def source(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    shutil.copy(PROGRAMS / request.param, tmp_path)
+    return tmp_path / Path(request.param).name
+
+
+def test_object_round_trip() -> None:
+    hack_object = HackObject(array("H", [1, 0xFFFF, 60432]), {"LOOP": 2}, b"map")
+
+    assert HackObject.from_bytes(hack_object.to_bytes()) == hack_object
+    assert list(hack_object.to_text())[1] == "1" * 16
+
+
+@pytest.mark.parametrize(
+    "corrupt", [lambda data: data[:-1], lambda data: b"HOBX" + data[4:]]
+)
+def test_corrupt_objects_are_rejected(corrupt) -> None:
+    data = HackObject(array("H", [1, 2]), {"LOOP": 2}).to_bytes()
+
+    with pytest.raises(Exception, match="InvalidHackObjectException"):
+        HackObject.from_bytes(corrupt(data))
+
+
+def test_binary_output_matches_the_text_output(source: Path) -> None:
+    AsmProgram.load_from(str(source), binary=True).assemble()
+    hack_object = HackBinary(source.with_suffix(".hackbin")).load()
+
+    expected = assemble(source)
+    assert list(hack_object.to_text()) == expected
+    assert hack_object.program().digest() == Program.decode(expected).digest()
+
+
+def test_binary_keeps_the_symbols(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "max" / "Max.asm", tmp_path)
+    program = AsmProgram.load_from(str(tmp_path / "Max.asm"), binary=True)
+    program.assemble()
+
+    symbols = HackBinary(tmp_path / "Max.hackbin").load().symbols
+    assert symbols == program.symbols()
+    assert {"OUTPUT_FIRST", "OUTPUT_D", "INFINITE_LOOP"} <= set(symbols)
+
+
+def test_binary_runs_like_text(source: Path) -> None:
+    AsmProgram.load_from(str(source)).assemble()
+    AsmProgram.load_from(str(source), binary=True).assemble()
+    dump = source.with_suffix(".json")
+
+    text = HackProgram.load_from(str(source.with_suffix(".hack")), 10000).execute()
+    expected = dump.read_text()
+    dump.unlink()
+    binary = HackProgram.load_from(str(source.with_suffix(".hackbin")), 10000)
+
+    assert binary.execute().cycles == text.cycles
+    assert dump.read_text() == expected
+
+
+def test_convert_round_trips_through_the_cli(source: Path) -> None:
+    AsmProgram.load_from(str(source)).assemble()
+    hack = source.with_suffix(".hack")
+    expected = hack.read_bytes()
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["convert", str(hack)]).exit_code == 0
+    hack.unlink()
+    assert (
+        runner.invoke(cli, ["convert", str(hack.with_suffix(".hackbin"))]).exit_code
+        == 0
+    )
+    assert hack.read_bytes() == expected
@@ -0,0 +1,51 @@
+from typing import List
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import ExitReason
+
+PROGRAM = [
+    "@7",
+    "D=A",
+    "@R0",
+    "M=D",
+    "(END)",
+    "@END",
+    "0;JMP",
+]
+
+
+def assemble(assembly: List[str]) -> List[str]:
+    return list(Assembler.create().assemble(assembly))
+
+
+def test_end_loop_halts() -> None:
+    simulator = HackSimulator.create(assemble(PROGRAM), 1000)
+    simulator.execute()
+
+    assert simulator.exit_reason == ExitReason.halt
+    assert simulator.executed == 4
+    assert simulator.pc == 4
+    assert simulator.halted_at == 4
+    assert simulator.a_register == 4
+
+
+def test_self_jump_without_end_shape_runs_out_of_budget() -> None:
+    program = assemble(["@0", "D=A", "@1", "0;JMP"])
+    simulator = HackSimulator.create(program, 100)
+    simulator.execute()
+
+    assert simulator.exit_reason == ExitReason.budget
+    assert simulator.halted_at is None
+
+
+def test_other_stops_are_not_reported_as_halt() -> None:
+    simulator = HackSimulator.create(assemble(PROGRAM), 1000)
+    simulator.start()
+    simulator.stops[2] = 1
+    simulator.run_engine()
+    simulator.finish(1000)
+
+    assert simulator.exit_reason == ExitReason.stopped
+    assert simulator.pc == 2
+    assert simulator.halted_at is None
+    assert simulator.a_register == 7
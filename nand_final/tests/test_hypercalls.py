@@ -0,0 +1,137 @@
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Ram
+from n2t.core.hack_simulator.entities import Program
+from n2t.core.hack_simulator.hypercalls import (
+    ARG,
+    LCL,
+    SP,
+    THAT,
+    THIS,
+    Hypercall,
+    Intercepts,
+    divide,
+    multiply,
+)
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+RETURN_ADDRESS = 5
+
+OPERANDS = [(3, 4), (-7, 6), (181, -181), (-32767, -1), (12345, 0), (-32768, 2)]
+
+
+def pong() -> Tuple[Program, Assembler]:
+    assembler = Assembler.create()
+    instructions = File(PROGRAMS / "pong" / "Pong.asm").load()
+    return Program.decode(assembler.assemble(instructions)), assembler
+
+
+def word(value: int) -> int:
+    return value & 0xFFFF
+
+
+def call_routine(simulator: HackSimulator, entry: int, args: List[int]) -> int:
+    ram = simulator.ram_states
+    arguments = ram.get(SP)
+    frame = [RETURN_ADDRESS, *(ram.get(pointer) for pointer in (LCL, ARG, THIS, THAT))]
+    for offset, value in enumerate([*args, *frame]):
+        ram.assign(arguments + offset, value)
+    ram.assign(ARG, arguments)
+    ram.assign(LCL, arguments + len(args) + len(frame))
+    ram.assign(SP, arguments + len(args) + len(frame))
+    simulator.pc = entry
+    simulator.stops[RETURN_ADDRESS] = 1
+    simulator.cycles = 10**6
+    simulator.run_engine()
+
+    assert simulator.pc == RETURN_ADDRESS
+    assert ram.get(SP) == arguments + 1
+    return ram.get(arguments)
+
+
+def test_from_symbols_finds_the_os_routines() -> None:
+    _, assembler = pong()
+    symbols = assembler.symb_table.symbols_map
+    intercepts = Intercepts.from_symbols(symbols)
+
+    assert {pc: hypercall.name for pc, hypercall in intercepts.entries.items()} == {
+        symbols[name]: name
+        for name in ("math.multiply", "math.divide", "memory.alloc", "screen.drawline")
+    }
+    assert set(intercepts.statics) == {"memory.0", "screen.1", "screen.2"}
+    assert Intercepts.from_symbols({"LOOP": 4}).entries == {}
+
+
+@pytest.mark.parametrize("x, y", OPERANDS)
+def test_native_results_match_the_jack_routines(x: int, y: int) -> None:
+    program, assembler = pong()
+    symbols = assembler.symb_table.symbols_map
+    simulator = HackSimulator.create(program, 1000000)
+    simulator.execute()
+    args = [word(x), word(y)]
+
+    for name, native in (("math.multiply", multiply), ("math.divide", divide)):
+        expected = native(simulator.ram_states.copy(), args, {})
+        if expected is None:
+            continue
+        assert call_routine(simulator, symbols[name], args) == expected
+
+
+@pytest.mark.parametrize("x, y", OPERANDS)
+def test_native_arithmetic_declines_what_it_cannot_mirror(x: int, y: int) -> None:
+    ram = Ram()
+    args = [word(x), word(y)]
+
+    if -32768 in (x, y):
+        assert multiply(ram, args, {}) is None
+    else:
+        assert multiply(ram, args, {}) == word(x * y)
+    if y == 0 or -32768 in (x, y):
+        assert divide(ram, args, {}) is None
+    else:
+        assert divide(ram, args, {}) == word(int(x / y))
+
+
+def test_accounting_runs_the_original_code() -> None:
+    program, assembler = pong()
+    intercepts = Intercepts.from_symbols(assembler.symb_table.symbols_map, True)
+    accounted = HackSimulator.create(program, 1000000, intercepts=intercepts)
+    accounted.execute()
+    plain = HackSimulator.create(program, 1000000)
+    plain.execute()
+
+    assert list(accounted.dump()) == list(plain.dump())
+    stats = intercepts.stats["math.multiply"]
+    assert stats.calls > 0
+    assert stats.mismatches == 0
+    assert 0 < stats.saved < stats.cycles
+    assert intercepts.stats["memory.alloc"].mismatches == 0
+
+
+def test_wrong_native_results_are_counted_as_mismatches() -> None:
+    program, assembler = pong()
+    entry = assembler.symb_table.symbols_map["math.multiply"]
+    wrong = Hypercall("math.multiply", 2, lambda ram, args, statics: 12345)
+    intercepts = Intercepts({entry: wrong}, {}, accounting=True)
+    HackSimulator.create(program, 1000000, intercepts=intercepts).execute()
+
+    stats = intercepts.stats["math.multiply"]
+    assert stats.calls > 0
+    assert stats.mismatches == stats.calls - len(intercepts.pending)
+
+
+def test_native_mode_skips_the_routines() -> None:
+    program, assembler = pong()
+    intercepts = Intercepts.from_symbols(assembler.symb_table.symbols_map)
+    HackSimulator.create(program, 1000000, intercepts=intercepts).execute()
+
+    stats = intercepts.stats["math.multiply"]
+    assert stats.calls > 0
+    assert stats.cycles == stats.saved == stats.mismatches == 0
+    assert "Hypercalls (native)" in list(intercepts.report())
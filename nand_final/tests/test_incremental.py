@@ -0,0 +1,120 @@
+import shutil
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from n2t.core import Assembler
+from n2t.core.assembler import IncrementalAssembler
+from n2t.core.assembler.entities import AssemblyCache
+from n2t.infra import AsmProgram
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+Edit = Callable[[List[str]], List[str]]
+
+LAST_MATH_0 = 8560
+
+
+def pong() -> List[str]:
+    return list(File(PROGRAMS / "pong" / "Pong.asm").load())
+
+
+def two_pass(lines: List[str]) -> List[int]:
+    return [int(word, 2) for word in Assembler.create().assemble(lines)]
+
+
+def replace(index: int, line: str) -> Edit:
+    return lambda lines: lines[:index] + [line] + lines[index:][1:]
+
+
+def insert(index: int, *new: str) -> Edit:
+    return lambda lines: lines[:index] + list(new) + lines[index:]
+
+
+@pytest.mark.parametrize(
+    "edit, encoded",
+    [
+        (replace(11, "D=M"), 1),
+        (replace(22, "M=D+1"), 1),
+        (insert(12, "// comment", ""), 0),
+        (replace(14, "@12"), 1),
+        (replace(24, "@END_LT"), 1),
+    ],
+)
+def test_changed_lines_are_re_encoded(edit: Edit, encoded: int) -> None:
+    assembler = IncrementalAssembler.create()
+    lines = pong()
+    assert list(assembler.assemble_words(lines)) == two_pass(lines)
+    assert assembler.full_pass
+
+    edited = edit(lines)
+    words = list(assembler.assemble_words(edited))
+
+    assert not assembler.full_pass
+    assert assembler.encoded == encoded
+    assert words == two_pass(edited)
+
+
+@pytest.mark.parametrize(
+    "edit, layout_changed",
+    [
+        (replace(LAST_MATH_0, "@math.1"), False),
+        (insert(12, "@SP", "M=M+1"), True),
+        (insert(12, "(EXTRA)", "@EXTRA"), True),
+        (insert(12, "@fresh", "M=0"), True),
+    ],
+)
+def test_layout_changes_take_a_full_pass(edit: Edit, layout_changed: bool) -> None:
+    assembler = IncrementalAssembler.create()
+    lines = pong()
+    list(assembler.assemble_words(lines))
+    assert lines[LAST_MATH_0] == "@math.0"
+    edited = edit(lines)
+    words = list(assembler.assemble_words(edited))
+
+    assert assembler.full_pass
+    assert assembler.layout_changed == layout_changed
+    assert words == two_pass(edited)
+
+
+def test_cache_round_trip() -> None:
+    assembler = IncrementalAssembler.create()
+    list(assembler.assemble_words(pong()))
+    restored = AssemblyCache.from_bytes(assembler.cache.to_bytes())
+
+    assert restored.to_bytes() == assembler.cache.to_bytes()
+    assert list(restored.words()) == two_pass(pong())
+
+
+def test_persisted_cache_survives_between_runs(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "pong" / "Pong.asm", tmp_path)
+    source = tmp_path / "Pong.asm"
+    hack = source.with_suffix(".hack")
+    AsmProgram.load_from(str(source), incremental=True).assemble()
+    assert hack.read_text() == "".join(f"{word:016b}\n" for word in two_pass(pong()))
+
+    edited = replace(11, "D=M")(pong())
+    source.write_text("\n".join(edited) + "\n")
+    program = AsmProgram.load_from(str(source), incremental=True)
+    program.assemble()
+
+    assert not program.assembler.full_pass
+    assert hack.read_text() == "".join(f"{word:016b}\n" for word in two_pass(edited))
+
+
+def test_corrupt_cache_falls_back_to_a_full_pass(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "pong" / "Pong.asm", tmp_path)
+    source = tmp_path / "Pong.asm"
+    AsmProgram.load_from(str(source), incremental=True).assemble()
+    expected = source.with_suffix(".hack").read_text()
+    for cache in tmp_path.iterdir():
+        if cache not in (source, source.with_suffix(".hack")):
+            cache.write_bytes(b"garbage")
+
+    program = AsmProgram.load_from(str(source), incremental=True)
+    program.assemble()
+
+    assert program.assembler.full_pass
+    assert source.with_suffix(".hack").read_text() == expected
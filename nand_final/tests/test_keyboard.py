@@ -0,0 +1,123 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine, Ram
+from n2t.core.hack_simulator.entities import (
+    A_INSTRUCTION,
+    COMP_READS_M,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    Program,
+)
+from n2t.core.hack_simulator.keyboard import (
+    KBD,
+    KeyboardSchedule,
+    KeyEvent,
+    PollingLoops,
+)
+
+ECHO = [
+    "(WAIT)",
+    "@KBD",
+    "D=M",
+    "@WAIT",
+    "D;JEQ",
+    "@R0",
+    "M=D",
+    "(RELEASE)",
+    "@KBD",
+    "D=M",
+    "@RELEASE",
+    "D;JNE",
+    "@R1",
+    "M=M+1",
+    "@WAIT",
+    "0;JMP",
+]
+
+EVENTS = [
+    {"cycle": 1001, "key": 65},
+    {"cycle": 5003, "key": 0},
+    {"pc": 12, "key": "B"},
+    {"cycle": 9000, "key": 0},
+    {"cycle": 20000, "key": 67},
+    {"cycle": 20017, "key": 0},
+]
+
+BUDGETS = [0, 1, 5, 59, 1000, 1001, 1002, 5003, 5010, 9001, 20017, 20030, 100003]
+
+
+def instructions() -> List[str]:
+    return list(Assembler.create().assemble(ECHO))
+
+
+def reference(cycles: int) -> Tuple[Dict[int, int], Tuple[int, int, int]]:
+    program = Program.decode(instructions())
+    events = [KeyEvent.from_dict(event) for event in EVENTS]
+    ram = Ram()
+    a_register = d_register = pc = clock = 0
+    while cycles > 0 and pc < len(program):
+        while events and (
+            events[0].pc == pc
+            or (events[0].cycle is not None and events[0].cycle <= clock)
+        ):
+            ram.registers[KBD] = events.pop(0).key
+        if program.kinds[pc] == A_INSTRUCTION:
+            a_register = program.constants[pc]
+            pc += 1
+        else:
+            comp = program.comps[pc]
+            operand = ram.get(a_register) if comp & COMP_READS_M else a_register
+            value = Program.compare_table[comp](d_register, operand)
+            dest = program.dests[pc]
+            if dest & DEST_M:
+                ram.assign(a_register, value)
+            if dest & DEST_A:
+                a_register = value
+            if dest & DEST_D:
+                d_register = value
+            jumped = Program.jump_table[program.jumps[pc]](value)
+            pc = a_register if jumped else pc + 1
+        cycles -= 1
+        clock += 1
+    return dict(ram.items()), (a_register, d_register, pc)
+
+
+def test_polling_loops_are_detected() -> None:
+    assert PollingLoops(Program.decode(instructions())).loops == {0: 4, 6: 4}
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+@pytest.mark.parametrize("cycles", BUDGETS)
+def test_fast_forward_matches_a_per_cycle_run(engine: Engine, cycles: int) -> None:
+    simulator = HackSimulator.create(
+        instructions(), cycles, engine, keyboard=KeyboardSchedule.from_list(EVENTS)
+    )
+    simulator.execute()
+
+    registers, (a_register, d_register, pc) = reference(cycles)
+    assert dict(simulator.dump()) == registers
+    assert (simulator.a_register, simulator.d_register, simulator.pc) == (
+        a_register,
+        d_register,
+        pc,
+    )
+    assert simulator.clock == cycles
+
+
+def test_keystrokes_reach_the_program() -> None:
+    simulator = HackSimulator.create(
+        instructions(), 100003, keyboard=KeyboardSchedule.from_list(EVENTS)
+    )
+    simulator.execute()
+
+    assert dict(simulator.dump()) == {0: 67, 1: 3}
+
+
+@pytest.mark.parametrize("event", [{"key": 65}, {"key": 65, "cycle": 1, "pc": 2}])
+def test_events_need_exactly_one_trigger(event: dict) -> None:
+    with pytest.raises(Exception, match="InvalidKeyEventException"):
+        KeyEvent.from_dict(event)
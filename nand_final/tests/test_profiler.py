@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine
+from n2t.core.hack_simulator.trace import Trace
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+def test_profile_counts_every_executed_instruction() -> None:
+    simulator = HackSimulator.create(assemble("rect/RectL.asm"), 5000, profile=True)
+    simulator.execute()
+
+    assert simulator.profiler.total == simulator.executed
+    assert simulator.profiler.hotspots(1)
+
+
+def test_profile_with_trace_is_rejected() -> None:
+    simulator = HackSimulator.create(
+        assemble("max/MaxL.asm"), 100, profile=True, trace=Trace(64)
+    )
+    with pytest.raises(Exception, match="ProfileWithTraceException"):
+        simulator.execute()
+
+
+@pytest.mark.parametrize("profile, trace", [(True, None), (False, Trace(64))])
+def test_interpreter_only_options_reject_blocks(profile, trace) -> None:
+    simulator = HackSimulator.create(
+        assemble("max/MaxL.asm"), 100, Engine.blocks, profile=profile, trace=trace
+    )
+    with pytest.raises(Exception, match="InterpreterOnlyOptionException"):
+        simulator.execute()
@@ -0,0 +1,85 @@
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine, Ram
+from n2t.core.hack_simulator.entities import RAM_SIZE
+
+
+def run(assembly: List[str], engine: Engine = Engine.interpreter) -> HackSimulator:
+    instructions = list(Assembler.create().assemble(assembly))
+    simulator = HackSimulator.create(instructions, 1000, engine)
+    simulator.execute()
+    return simulator
+
+
+def test_ram_covers_the_address_space() -> None:
+    ram = Ram()
+
+    assert len(ram.registers) == RAM_SIZE
+    assert ram.registers.itemsize == 2
+    assert not any(ram.registers)
+    assert list(ram.items()) == []
+
+
+def test_assign_masks_address_and_value() -> None:
+    ram = Ram()
+    ram.assign(RAM_SIZE + 3, -1)
+    ram.assign(4, 0x12345)
+
+    assert ram.get(3) == 0xFFFF
+    assert ram.get(RAM_SIZE + 4) == 0x2345
+    assert list(ram.items()) == [(3, 0xFFFF), (4, 0x2345)]
+    assert list(ram.items([(4, 10)])) == [(4, 0x2345)]
+
+
+def test_bytes_round_trip() -> None:
+    ram = Ram()
+    ram.assign(0, 7)
+    ram.assign(16384, 0x8001)
+    restored = Ram.from_bytes(ram.to_bytes())
+
+    assert restored.registers == ram.registers
+    assert restored.written == ram.written
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_alu_results_wrap_to_sixteen_bits(engine: Engine) -> None:
+    simulator = run(
+        [
+            "@R0",
+            "M=-1",
+            "@R1",
+            "M=0",
+            "M=M-1",
+            "@32767",
+            "D=A",
+            "@R2",
+            "M=D+1",
+            "@R0",
+            "D=M",
+            "@R3",
+            "M=D+1",
+            "@R4",
+            "M=!M",
+            "(END)",
+            "@END",
+            "0;JMP",
+        ],
+        engine,
+    )
+
+    assert dict(simulator.dump()) == {0: 0xFFFF, 1: 0xFFFF, 2: 0x8000, 3: 0, 4: 0xFFFF}
+
+
+def test_json_dump_reports_unsigned_words() -> None:
+    simulator = run(["@R0", "M=-1", "(END)", "@END", "0;JMP"])
+
+    assert list(simulator.to_json(simulator.dump())) == [
+        "{",
+        '   "RAM": {',
+        '      "0": 65535',
+        "   }",
+        "}",
+    ]
@@ -0,0 +1,115 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from n2t.core.hack_simulator.script import TestScript as ParsedScript
+from n2t.infra import HackScript, ScriptBatch
+from n2t.infra.script import ScriptStatus
+from n2t.runner.cli import cli
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+SCRIPT = """// Max test
+load Max.asm,
+output-file Max.out,
+compare-to Max.cmp,
+output-list RAM[0]%D2.6.2 RAM[1]%D2.6.2 RAM[2]%D2.6.2;
+
+set RAM[0] 3,
+set RAM[1] 5;
+repeat 20 {
+  ticktock;
+}
+output;
+
+set PC 0,
+set RAM[0] -7,
+set RAM[1] -9;
+repeat 20 {
+  ticktock;
+}
+output;
+"""
+
+EXPECTED = """|  RAM[0]  |  RAM[1]  |  RAM[2]  |
+|       3  |       5  |       5  |
+|      -7  |      -9  |      -7  |
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    shutil.copy(PROGRAMS / "max" / "Max.asm", tmp_path)
+    (tmp_path / "Max.tst").write_text(SCRIPT)
+    (tmp_path / "Max.cmp").write_text(EXPECTED)
+    return tmp_path
+
+
+def test_parse_splits_commands_and_repeat_blocks() -> None:
+    script = ParsedScript.parse(SCRIPT.splitlines())
+
+    assert script.setting("load") == "Max.asm"
+    assert script.setting("compare-to") == "Max.cmp"
+    repeat = next(command for command in script.commands if command.body)
+    assert (repeat.name, repeat.args) == ("repeat", ["20"])
+    assert [command.name for command in repeat.body] == ["ticktock"]
+
+
+def test_matching_output_passes(project: Path) -> None:
+    result = HackScript(project / "Max.tst").execute()
+
+    assert result.status == ScriptStatus.passed
+    assert (project / "Max.out").read_text() == EXPECTED
+
+
+def test_wildcards_in_the_comparison_match_anything(project: Path) -> None:
+    (project / "Max.cmp").write_text(EXPECTED.replace("-7  |\n", "**  |\n"))
+
+    assert HackScript(project / "Max.tst").execute().status == ScriptStatus.passed
+
+
+def test_mismatch_fails_at_the_first_differing_line(project: Path) -> None:
+    (project / "Max.cmp").write_text(EXPECTED.replace("5  |\n", "6  |\n"))
+    result = HackScript(project / "Max.tst").execute()
+
+    assert result.status == ScriptStatus.failed
+    assert result.message == "comparison failure at line 2"
+
+
+def test_missing_program_is_an_error(project: Path) -> None:
+    (project / "Max.asm").unlink()
+    result = HackScript(project / "Max.tst").execute()
+
+    assert result.status == ScriptStatus.error
+    assert result.message
+
+
+def test_hardware_scripts_are_unsupported(project: Path) -> None:
+    (project / "Max.tst").write_text("load CPU.hdl, output-file CPU.out;\n")
+
+    assert HackScript(project / "Max.tst").execute().status == (
+        ScriptStatus.unsupported
+    )
+
+
+def test_batch_runs_every_script_in_the_tree(project: Path) -> None:
+    nested = project / "nested"
+    shutil.copytree(project, nested)
+    (nested / "Max.asm").unlink()
+
+    results = ScriptBatch.load_from(str(project), jobs=2).execute()
+
+    assert [result.status for result in results] == [
+        ScriptStatus.passed,
+        ScriptStatus.error,
+    ]
+
+
+def test_cli_exits_non_zero_when_a_script_errors(project: Path) -> None:
+    runner = CliRunner()
+    assert runner.invoke(cli, ["test", str(project)]).exit_code == 0
+
+    (project / "Max.asm").unlink()
+    assert runner.invoke(cli, ["test", str(project)]).exit_code == 1
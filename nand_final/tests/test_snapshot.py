@@ -0,0 +1,99 @@
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator import Engine, Snapshot
+from n2t.core.hack_simulator.entities import Program
+from n2t.infra import HackProgram
+from n2t.infra.io import File, FileFormat
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+def test_snapshot_bytes_round_trip() -> None:
+    simulator = HackSimulator.create(assemble("pong/Pong.asm"), 5000)
+    simulator.execute()
+    snapshot = simulator.snapshot()
+    restored = Snapshot.from_bytes(snapshot.to_bytes())
+
+    assert restored.pc == snapshot.pc
+    assert restored.a_register == snapshot.a_register
+    assert restored.d_register == snapshot.d_register
+    assert restored.clock == snapshot.clock == 5000
+    assert restored.program_digest == snapshot.program_digest
+    assert restored.ram.registers == snapshot.ram.registers
+    assert restored.ram.written == snapshot.ram.written
+
+
+def test_truncated_snapshot_is_rejected() -> None:
+    simulator = HackSimulator.create(assemble("max/MaxL.asm"), 5)
+    simulator.execute()
+
+    with pytest.raises(Exception, match="InvalidSnapshotException"):
+        Snapshot.from_bytes(simulator.snapshot().to_bytes()[:-1])
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_resumed_run_matches_uninterrupted_run(engine: Engine) -> None:
+    program = Program.decode(assemble("pong/Pong.asm"))
+    expected = HackSimulator.create(program, 30000, engine)
+    expected.execute()
+
+    first = HackSimulator.create(program, 12345, engine)
+    first.execute()
+    snapshot = Snapshot.from_bytes(first.snapshot().to_bytes())
+    second = HackSimulator.create(program, 30000 - 12345, engine, snapshot)
+    second.execute()
+
+    assert second.clock == expected.clock
+    assert second.pc == expected.pc
+    assert second.a_register == expected.a_register
+    assert second.d_register == expected.d_register
+    assert second.ram_states.registers == expected.ram_states.registers
+    assert second.ram_states.written == expected.ram_states.written
+
+
+def test_snapshot_of_another_program_is_rejected() -> None:
+    simulator = HackSimulator.create(assemble("max/MaxL.asm"), 5)
+    simulator.execute()
+    other = HackSimulator.create(
+        assemble("add/Add.asm"), 5, resume=simulator.snapshot()
+    )
+
+    with pytest.raises(Exception, match="SnapshotProgramMismatchException"):
+        other.execute()
+
+
+def test_checkpoints_fire_every_n_cycles() -> None:
+    clocks: List[int] = []
+    simulator = HackSimulator.create(
+        assemble("pong/Pong.asm"),
+        1000,
+        checkpoint_every=300,
+        on_checkpoint=lambda snapshot: clocks.append(snapshot.clock),
+    )
+    simulator.execute()
+
+    assert clocks == [300, 600, 900]
+
+
+def test_checkpoint_file_resumes_from_the_command_line_layer(tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / "pong" / "Pong.asm", tmp_path)
+    path = tmp_path / "Pong.asm"
+
+    HackProgram.load_from(str(path), 4000, checkpoint_every=1000).execute()
+    snapshot_path = FileFormat.snapshot.convert(path)
+    assert Snapshot.from_bytes(snapshot_path.read_bytes()).clock == 4000
+
+    HackProgram.load_from(str(path), 6000, resume=str(snapshot_path)).execute()
+    resumed = path.with_suffix(".json").read_text()
+    HackProgram.load_from(str(path), 10000).execute()
+
+    assert path.with_suffix(".json").read_text() == resumed
@@ -0,0 +1,62 @@
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler
+from n2t.core.assembler import StreamingAssembler
+from n2t.infra import AsmProgram
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+SOURCES = [
+    "add/Add.asm",
+    "max/Max.asm",
+    "max/MaxL.asm",
+    "rect/Rect.asm",
+    "rect/RectL.asm",
+    "pong/Pong.asm",
+    "pong/PongL.asm",
+]
+
+FORWARD = ["@END", "0;JMP", "@counter", "M=1", "(END)", "@sum", "M=0", "@END", "0;JMP"]
+
+
+def two_pass(lines: List[str]) -> List[int]:
+    return [int(word, 2) for word in Assembler.create().assemble(lines)]
+
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_words_match_the_two_pass_assembler(name: str) -> None:
+    lines = list(File(PROGRAMS / name).load())
+
+    assert list(StreamingAssembler.create().assemble_words(lines)) == two_pass(lines)
+
+
+def test_forward_references_are_backpatched() -> None:
+    assembler = StreamingAssembler.create()
+    words = list(assembler.assemble(FORWARD))
+
+    assert words[0] == "0" * 16
+    assert set(assembler.fixups) == {"END", "counter", "sum"}
+    patched = [int(word, 2) for word in words]
+    for address, word in assembler.resolve():
+        patched[address] = int(word, 2)
+    assert patched == two_pass(FORWARD)
+    assert assembler.fixups == {}
+
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_streamed_hack_file_is_byte_identical(name: str, tmp_path: Path) -> None:
+    shutil.copy(PROGRAMS / name, tmp_path)
+    source = tmp_path / Path(name).name
+    hack = source.with_suffix(".hack")
+
+    AsmProgram.load_from(str(source)).assemble()
+    expected = hack.read_bytes()
+    hack.unlink()
+    AsmProgram.load_from(str(source), streaming=True).assemble()
+
+    assert hack.read_bytes() == expected
@@ -0,0 +1,117 @@
+import json
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+from typer.testing import CliRunner
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator.entities import Program, RamSeed
+from n2t.core.hack_simulator.sweep import Sweep
+from n2t.infra import HackProgram
+from n2t.infra.io import File
+from n2t.runner.cli import cli
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+VECTORS = [{"R0": 3, "R1": 9}, {"0": 12, "1": 4}, {"R0": -5, "R1": 7}]
+
+
+def assemble(name: str) -> List[str]:
+    return list(Assembler.create().assemble(File(PROGRAMS / name).load()))
+
+
+@pytest.fixture
+def program(tmp_path: Path) -> Path:
+    shutil.copy(PROGRAMS / "max" / "MaxL.asm", tmp_path)
+    return tmp_path / "MaxL.asm"
+
+
+def test_seed_formats_agree() -> None:
+    from_dict = RamSeed.from_dict({"R1": 4, "16": [1, 2, -1]})
+    from_items = RamSeed.from_items([(1, 4), (16, 1), (17, 2), (18, 0xFFFF)])
+
+    assert [(start, list(words)) for start, words in from_dict.blocks] == [
+        (1, [4]),
+        (16, [1, 2, 0xFFFF]),
+    ]
+    assert from_items.blocks == from_dict.blocks
+
+
+def test_seed_outside_ram_is_rejected() -> None:
+    with pytest.raises(Exception, match="InvalidRamSeedException"):
+        RamSeed.from_dict({"32767": [1, 2]})
+
+
+def test_sweep_matches_separately_seeded_runs() -> None:
+    program = Program.decode(assemble("max/MaxL.asm"))
+    seeds = [RamSeed.from_dict(vector) for vector in VECTORS]
+    base = RamSeed.from_dict({"R5": 8})
+    results = list(Sweep(HackSimulator.create(program, 100, seed=base)).run(seeds))
+
+    for result, seed in zip(results, seeds):
+        expected = HackSimulator.create(program, 100, seed=base)
+        expected.start()
+        seed.apply(expected.ram_states)
+        expected.run_engine()
+        expected.finish(100)
+        assert result.cycles == expected.executed
+        assert result.exit_reason == expected.exit_reason
+        assert result.entries == list(expected.dump())
+    assert [dict(result.entries)[2] for result in results] == [9, 12, 7]
+
+
+def test_json_and_csv_vectors_give_the_same_report(program: Path) -> None:
+    vectors = program.with_name("vectors.json")
+    vectors.write_text(json.dumps(VECTORS))
+    HackProgram.load_from(str(program), 100, sweep=str(vectors)).execute()
+    report = json.loads(program.with_name("MaxL_sweep.json").read_text())
+
+    table = program.with_name("vectors.csv")
+    table.write_text("R0,R1\n3,9\n12,4\n-5,7\n")
+    HackProgram.load_from(str(program), 100, sweep=str(table)).execute()
+
+    assert json.loads(program.with_name("MaxL_sweep.json").read_text()) == report
+    assert [entry["RAM"]["2"] for entry in report] == [9, 12, 7]
+
+
+def test_seed_file_initialises_ram(program: Path) -> None:
+    seed = program.with_name("seed.json")
+    seed.write_text(json.dumps({"RAM": {"R0": 21, "R1": 4}}))
+    HackProgram.load_from(str(program), 100, seed=str(seed)).execute()
+
+    dump = json.loads(program.with_suffix(".json").read_text())["RAM"]
+    assert dump == {"0": 21, "1": 4, "2": 21}
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"profile": True},
+        {"trace": 64},
+        {"intercept": True},
+        {"intercept_accounting": True},
+        {"deadline": 1.0},
+    ],
+)
+def test_sweep_rejects_options_it_would_ignore(program: Path, option: dict) -> None:
+    vectors = program.with_name("vectors.json")
+    vectors.write_text(json.dumps(VECTORS))
+    sweep = HackProgram.load_from(str(program), 100, sweep=str(vectors), **option)
+
+    assert sweep.sweep_conflicts() == list(option)
+    with pytest.raises(Exception, match="SweepOptionUnsupportedException"):
+        sweep.execute()
+
+
+def test_cli_reports_sweep_conflicts(program: Path) -> None:
+    vectors = program.with_name("vectors.json")
+    vectors.write_text(json.dumps(VECTORS))
+    arguments = ["execute", str(program), "--sweep", str(vectors)]
+    runner = CliRunner()
+
+    assert runner.invoke(cli, arguments).exit_code == 0
+    failed = runner.invoke(cli, arguments + ["--deadline", "1"])
+    assert failed.exit_code == 2
+    assert "--deadline cannot be combined with --sweep" in failed.output
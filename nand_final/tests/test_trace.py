@@ -0,0 +1,97 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import Assembler, HackSimulator
+from n2t.core.hack_simulator.entities import Program
+from n2t.core.hack_simulator.keyboard import KeyboardSchedule
+from n2t.core.hack_simulator.trace import Trace, TraceReplay
+from n2t.infra.io import File
+
+PROGRAMS = Path(__file__).parent / "e2e" / "json" / "06"
+
+CYCLES = 40000
+
+
+def pong() -> Program:
+    instructions = File(PROGRAMS / "pong" / "Pong.asm").load()
+    return Program.decode(Assembler.create().assemble(instructions))
+
+
+def keyboard() -> KeyboardSchedule:
+    return KeyboardSchedule.from_list(
+        [{"key": 130, "cycle": 38000}, {"key": 0, "cycle": 39000}]
+    )
+
+
+def record(program: Program, trace: Trace, keys: bool = False) -> None:
+    HackSimulator.create(
+        program, CYCLES, keyboard=keyboard() if keys else None, trace=trace
+    ).execute()
+
+
+def assert_replays(
+    program: Program, replay: TraceReplay, cycles: List[int], keys: bool = False
+) -> None:
+    for cycle in cycles:
+        state = replay.state_at(cycle)
+        expected = HackSimulator.create(
+            program, cycle, keyboard=keyboard() if keys else None
+        )
+        expected.execute()
+
+        assert state.clock == cycle
+        assert state.pc == expected.pc
+        assert state.a_register == expected.a_register
+        assert state.d_register == expected.d_register
+        assert state.ram.registers == expected.ram_states.registers
+
+
+@pytest.mark.parametrize("keys", [False, True])
+def test_ring_buffer_replays_the_recent_window(keys: bool) -> None:
+    program = pong()
+    trace = Trace(4096)
+    record(program, trace, keys)
+    replay = TraceReplay(trace.to_bytes())
+
+    assert CYCLES - 4096 <= replay.first_cycle < CYCLES
+    assert replay.last_cycle == CYCLES
+    cycles = list(range(replay.first_cycle, CYCLES + 1, 257)) + [CYCLES]
+    assert_replays(program, replay, cycles, keys)
+
+
+def test_spilled_trace_replays_from_the_start() -> None:
+    program = pong()
+    spilled: List[bytes] = []
+    trace = Trace(4096, spilled.append)
+    record(program, trace)
+    trace.flush()
+    replay = TraceReplay(Trace.file_header() + b"".join(spilled))
+
+    assert replay.first_cycle == 0
+    assert replay.last_cycle == CYCLES
+    assert_replays(program, replay, [1, 2047, 2048, 2049, 17000, 39999, CYCLES])
+
+
+@pytest.mark.parametrize("cycle", [0, CYCLES + 1])
+def test_cycles_outside_the_trace_are_rejected(cycle: int) -> None:
+    trace = Trace(4096)
+    record(pong(), trace)
+
+    with pytest.raises(Exception, match="TraceCycleOutOfRangeException"):
+        TraceReplay(trace.to_bytes()).state_at(cycle)
+
+
+def test_overwritten_records_are_not_read() -> None:
+    trace = Trace(64)
+    record(pong(), trace)
+
+    with pytest.raises(Exception, match="TraceOverwrittenException"):
+        list(trace.records(0))
+
+
+@pytest.mark.parametrize("capacity", [1, 7])
+def test_capacity_must_be_even(capacity: int) -> None:
+    with pytest.raises(Exception, match="InvalidTraceCapacityException"):
+        Trace(capacity)
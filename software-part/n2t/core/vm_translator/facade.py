@@ -17,17 +17,21 @@ class VMTranslator:
         self.cnt = 0
         self.cnt_funcs = 0
 
-    def translate(self, vm_code: Iterable[str]) -> Iterable[str]:
+    def translate(self, vm_code: Iterable[str], source: str = "") -> Iterable[str]:
         self.my_init()
         asm = []
-        for command in vm_code:
+        for line, command in enumerate(vm_code, start=1):
             if command[0:2] != "//" and command.strip() != "":
-                asm.append(self.translate_one(command))
+                location = source + ":" + str(line) if source else ""
+                asm.append(self.translate_one(command, location))
         self.file_cnt += 1
         return asm
 
-    def translate_one(self, word: str) -> str:
-        out = "// " + word + "\n"
+    def translate_one(self, word: str, location: str = "") -> str:
+        out = "// " + word
+        if location:
+            out += " [" + location + "]"  # origin for the assembler's source map
+        out += "\n"
         statement = word.split()
         type_command = statement[0]
         if type_command == "push":
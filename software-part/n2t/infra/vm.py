@@ -31,7 +31,7 @@ class VmProgram:  # TODO: your work for Projects 7 and 8 starts here
             asm_file = File(FileFormat.asm.convert(Path(saved_name)))
             for vm_path in file_paths:
                 self.path = vm_path
-                asm_code.extend(self.vm_translator.translate(self))
+                asm_code.extend(self.vm_translator.translate(self, vm_path.name))
             if self.vm_translator.sys_enc and not self.vm_translator.bootstrap_added:
                 boot = self.vm_translator.add_bootstrap()
                 asm_code[0:0] = [boot]
@@ -39,7 +39,7 @@ class VmProgram:  # TODO: your work for Projects 7 and 8 starts here
             asm_file.save(asm_code)
         else:
             asm_file = File(FileFormat.asm.convert(self.path))
-            asm_file.save(self.vm_translator.translate(self))
+            asm_file.save(self.vm_translator.translate(self, self.path.name))
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()